@@ -1 +1,64 @@
-BASE_NAME: str = ".assistant"
\ No newline at end of file
+BASE_NAME: str = ".assistant"
+
+# Reference graph Mermaid output
+# "flat" draws every node in one graph; "by_directory" groups nodes into one subgraph per directory.
+MERMAID_LAYOUT: str = "flat"
+# Above this many nodes, reference_graph.md becomes an index of smaller per-component diagrams
+# (components that are still too large are split per document type). 0 disables splitting.
+MERMAID_MAX_NODES: int = 300
+
+# Maximum number of threads reading and scanning documents for references. 1 scans sequentially,
+# which is fastest on local disks. Raise it (e.g. to 8) for workspaces on network mounts, where
+# scans are dominated by I/O latency that threads overlap.
+REFERENCE_SCAN_WORKERS: int = 1
+
+# Only the first this-many bytes of a document are scanned for references. Larger text files
+# are memory-mapped and scanned in chunks; binary files are detected from their first block and skipped.
+REFERENCE_SCAN_MAX_BYTES: int = 64 * 1024 * 1024
+
+# How references are detected. "substring" records every mention of a known filename anywhere in a
+# document. "links" only records Markdown link targets ([text](path), [id]: path) and dl_N / op_N / art_N
+# name tokens outside code blocks, found in one regex pass and resolved against the document set.
+REFERENCE_EXTRACTION_MODE: str = "substring"
+
+# Where update_reference_graph persists the graph
+# "csv" rewrites reference_graph.csv and reference_graph.md on every update; "sqlite" applies only the
+# changed edges to .assistant/reference_graph.db, and CSV/Mermaid are produced by export_reference_graph.
+# With "sqlite", lookups and traversals on a cold cache are answered from the store.
+REFERENCE_GRAPH_BACKEND: str = "csv"
+
+# Start a background watcher that keeps the reference graph fresh for every project
+# whose reference graph is updated or queried.
+REFERENCE_WATCHER_AUTOSTART: bool = False
+
+# Archive policy applied by start_auto_archive_job() when the server starts, to each project listed
+# in AUTO_ARCHIVE_PROJECTS (absolute paths). Keys: "completed_operations" (bool), "artifacts_unused_days"
+# and "design_logs_below" (int); see auto_archive_documents. An empty list disables the job.
+AUTO_ARCHIVE_POLICY: dict = {"completed_operations": True}
+AUTO_ARCHIVE_PROJECTS: list[str] = []
+
+# How archived documents are stored. "loose" keeps each one as a file in <type>/archived/; "packed"
+# appends them to a compressed <type>/archived/_archive.zip with an index for direct extraction.
+ARCHIVE_STORAGE: str = "loose"
+
+# Whether reference scans read documents stored in archive packs. When False, packed documents
+# and the references they make are left out of the reference graph.
+REFERENCE_SCAN_INCLUDE_PACKED: bool = False
+
+# Checksum computed while persisting artifacts (a hashlib algorithm name), reported in the response.
+# None skips it, which lets large files be copied inside the kernel (copy_file_range/sendfile).
+ARTIFACT_CHECKSUM: str | None = "sha256"
+
+# How persisted artifacts are stored. "copy" makes each art_N file a full copy; "objects" stores each
+# distinct content once in .assistant/objects/ and makes art_N files read-only hardlinks to it, so
+# re-persisting identical content writes nothing (always checksummed with sha256). Reclaim objects
+# no artifact uses any more with collect_artifact_garbage.
+ARTIFACT_STORAGE: str = "copy"
+
+# Maximum number of files persist_artifacts copies at the same time. Numbering, summary entries
+# and reference fixing stay sequential; 1 copies one file at a time.
+ARTIFACT_COPY_WORKERS: int = 4
+
+# Seconds a tool waits for another Glyph session working on the same project to release the
+# project lock before giving up with an error. Sessions only hold it while changing documents.
+PROJECT_LOCK_TIMEOUT: float = 60.0
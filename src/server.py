@@ -27,14 +27,27 @@ if __name__ == "__main__":
         from tools.init_assistant_dir import init_assistant_dir
         from tools.add_design_log import add_design_log
         from tools.add_operation import add_operation
+        from tools.add_documents import add_documents
         from tools.create_code_review import add_code_review
-        from tools.persist_artifact import persist_artifacts
-        from tools.archive_doc import archive_document, unarchive_document
-        from tools.reference_graph import update_reference_graph, get_references_from, find_references_to
+        from tools.persist_artifact import persist_artifacts_tool, collect_artifact_garbage, verify_artifacts
+        from tools.archive_doc import archive_document, archive_documents, unarchive_document
+        from tools.auto_archive import auto_archive_documents, start_auto_archive_job
+        from tools.reference_graph import (
+            update_reference_graph,
+            get_references_from,
+            find_references_to,
+            export_reference_graph,
+            start_reference_watcher,
+            stop_reference_watcher,
+            get_reference_watcher_status,
+        )
+        from tools.reference_analysis import get_reference_impact, find_reference_path, analyze_reference_graph
         from tools.static_code_analysis import static_code_analysis
 
         print("Starting MCP server...")
 
+        start_auto_archive_job()
+
         mcp.run()
     except KeyboardInterrupt:
         print("MCP server stopped by user.")
@@ -0,0 +1,281 @@
+"""
+Packed storage for archived documents.
+
+An alternative to keeping every archived document as a loose file in `archived/`: documents
+are appended to one deflate-compressed zip per document type (`archived/_archive.zip`), and a
+small JSON index (`archived/_archive_index.json`) maps each document number to the location
+of its member. Extracting a document reads only its own bytes, located through the index,
+without parsing the zip's central directory.
+
+Members are never rewritten in place. Extracting a document drops it from the index; the
+dead member is reclaimed when the pack is compacted, which happens automatically once dead
+members outnumber live ones.
+"""
+import os
+import re
+import json
+import zlib
+import struct
+import zipfile
+import warnings
+from typing import TypedDict
+from ._project_lock import private_tmp_path
+
+
+PACK_FILENAME = "_archive.zip"
+PACK_INDEX_FILENAME = "_archive_index.json"
+PACK_INDEX_VERSION = 1
+
+# Compact once this many members are dead and they outnumber the live ones
+COMPACT_MIN_DEAD = 32
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_NUMBERED_NAME = re.compile(r'^[a-z]+_(\d+)_')
+
+
+class PackedMember(TypedDict):
+    filename: str
+    offset: int
+    compressed_size: int
+    size: int
+    crc: int
+    compress_type: int
+
+
+class PackIndex(TypedDict):
+    version: int
+    dead: int
+    documents: dict[str, PackedMember]
+
+
+def is_pack_file(filename: str) -> bool:
+    """Whether a filename is one of the files backing a pack (not a document), or a temporary file of one."""
+    if filename in (PACK_FILENAME, PACK_INDEX_FILENAME):
+        return True
+    # Written next to them while saving, and left behind if a writer crashed (see private_tmp_path)
+    return filename.startswith((f"{PACK_FILENAME}.", f"{PACK_INDEX_FILENAME}.")) and filename.endswith(".tmp")
+
+
+def _empty_pack_index() -> PackIndex:
+    return {"version": PACK_INDEX_VERSION, "dead": 0, "documents": {}}
+
+
+def load_pack_index(archive_dir: str) -> PackIndex:
+    """
+    Load the index of an archived directory's pack, or an empty one if there is no pack.
+
+    Args:
+        archive_dir: Path to the 'archived' directory.
+
+    Returns:
+        The pack index.
+    """
+    try:
+        with open(os.path.join(archive_dir, PACK_INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return _empty_pack_index()
+
+    if not isinstance(index, dict) or index.get("version") != PACK_INDEX_VERSION:
+        return _empty_pack_index()
+
+    return index
+
+
+def _save_pack_index(archive_dir: str, index: PackIndex) -> None:
+    index_path = os.path.join(archive_dir, PACK_INDEX_FILENAME)
+    tmp_path = private_tmp_path(index_path)
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+
+    os.replace(tmp_path, index_path)
+
+
+def _document_number(filename: str) -> int | None:
+    match = _NUMBERED_NAME.match(filename)
+    return int(match.group(1)) if match else None
+
+
+def pack_documents(archive_dir: str, file_paths: list[str]) -> list[str]:
+    """
+    Append loose archived documents to the pack and remove the loose files.
+
+    Args:
+        archive_dir: Path to the 'archived' directory.
+        file_paths: Paths of documents in archive_dir.
+
+    Returns:
+        Filenames of the documents packed. Files without a document number are left loose.
+    """
+    index = load_pack_index(archive_dir)
+    packed = []
+
+    with warnings.catch_warnings():
+        # A document archived again after being extracted gets a second member with the same name
+        warnings.simplefilter("ignore", UserWarning)
+
+        with zipfile.ZipFile(os.path.join(archive_dir, PACK_FILENAME), 'a', compression=zipfile.ZIP_DEFLATED) as pack:
+            for file_path in file_paths:
+                filename = os.path.basename(file_path)
+                number = _document_number(filename)
+                if number is None:
+                    continue
+
+                pack.write(file_path, filename)
+                info = pack.infolist()[-1]
+
+                if str(number) in index["documents"]:
+                    index["dead"] += 1
+                index["documents"][str(number)] = {
+                    "filename": filename,
+                    "offset": info.header_offset,
+                    "compressed_size": info.compress_size,
+                    "size": info.file_size,
+                    "crc": info.CRC,
+                    "compress_type": info.compress_type,
+                }
+                packed.append(filename)
+
+    _save_pack_index(archive_dir, index)
+
+    for file_path in file_paths:
+        if os.path.basename(file_path) in packed:
+            os.remove(file_path)
+
+    return packed
+
+
+def read_packed_member(pack_path: str, member: PackedMember) -> bytes:
+    """
+    Read one member's content by seeking straight to it.
+
+    Args:
+        pack_path: Path to the pack file.
+        member: The member's index entry.
+
+    Returns:
+        The decompressed content.
+
+    Raises:
+        OSError: If the pack cannot be read.
+        ValueError: If the pack does not match the index.
+    """
+    with open(pack_path, 'rb') as f:
+        f.seek(member["offset"])
+        header = f.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size:
+            raise ValueError("pack is truncated")
+
+        fields = _LOCAL_HEADER.unpack(header)
+        if fields[0] != _LOCAL_HEADER_SIGNATURE:
+            raise ValueError(f"no zip member at offset {member['offset']}")
+
+        name_length, extra_length = fields[9], fields[10]
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+        data = f.read(member["compressed_size"])
+
+    if member["compress_type"] == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    elif member["compress_type"] != zipfile.ZIP_STORED:
+        raise ValueError(f"unsupported compression method {member['compress_type']}")
+
+    if zlib.crc32(data) != member["crc"]:
+        raise ValueError(f"CRC mismatch for {member['filename']}")
+
+    return data
+
+
+def find_packed_document(archive_dir: str, number: int) -> PackedMember | None:
+    """Return the index entry of a packed document, or None if it is not packed."""
+    return load_pack_index(archive_dir)["documents"].get(str(number))
+
+
+def extract_packed_document(archive_dir: str, number: int) -> tuple[str, str] | None:
+    """
+    Extract a packed document to a loose file in the archived directory and drop it from the pack.
+
+    Args:
+        archive_dir: Path to the 'archived' directory.
+        number: The document number.
+
+    Returns:
+        A tuple of (filename, filepath) of the extracted file, or None if the document is not packed.
+    """
+    index = load_pack_index(archive_dir)
+    member = index["documents"].get(str(number))
+    if member is None:
+        return None
+
+    pack_path = os.path.join(archive_dir, PACK_FILENAME)
+    content = read_packed_member(pack_path, member)
+
+    file_path = os.path.join(archive_dir, member["filename"])
+    with open(file_path, 'wb') as f:
+        f.write(content)
+
+    del index["documents"][str(number)]
+    index["dead"] += 1
+
+    if index["dead"] >= COMPACT_MIN_DEAD and index["dead"] > len(index["documents"]):
+        compact_pack(archive_dir, index)
+    else:
+        _save_pack_index(archive_dir, index)
+
+    return member["filename"], file_path
+
+
+def compact_pack(archive_dir: str, index: PackIndex | None = None) -> None:
+    """
+    Rewrite the pack with only the documents in its index, reclaiming dead members.
+
+    Args:
+        archive_dir: Path to the 'archived' directory.
+        index: The current pack index. Default: loaded from disk.
+    """
+    index = load_pack_index(archive_dir) if index is None else index
+    pack_path = os.path.join(archive_dir, PACK_FILENAME)
+    tmp_path = private_tmp_path(pack_path)
+    compacted = _empty_pack_index()
+
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as pack:
+        for number, member in sorted(index["documents"].items(), key=lambda item: item[1]["offset"]):
+            pack.writestr(member["filename"], read_packed_member(pack_path, member))
+            info = pack.infolist()[-1]
+            compacted["documents"][number] = {
+                "filename": member["filename"],
+                "offset": info.header_offset,
+                "compressed_size": info.compress_size,
+                "size": info.file_size,
+                "crc": info.CRC,
+                "compress_type": info.compress_type,
+            }
+
+    os.replace(tmp_path, pack_path)
+    _save_pack_index(archive_dir, compacted)
+
+
+def list_packed_documents(assistant_dir: str, dir_name: str) -> list[tuple[str, str, PackedMember]]:
+    """
+    List the documents packed in one document directory's archive.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        dir_name: The document directory ('design_logs', 'operations' or 'artifacts').
+
+    Returns:
+        List of (relative_path, pack_path, member) tuples ordered by document number, where
+        relative_path is the path the document would have as a loose archived file.
+    """
+    archive_dir = os.path.join(assistant_dir, dir_name, "archived")
+    pack_path = os.path.join(archive_dir, PACK_FILENAME)
+
+    if not os.path.exists(pack_path):
+        return []
+
+    documents = load_pack_index(archive_dir)["documents"]
+    return [
+        (f"{dir_name}/archived/{member['filename']}", pack_path, member)
+        for _, member in sorted(documents.items(), key=lambda item: int(item[0]))
+    ]
@@ -0,0 +1,247 @@
+"""
+Manifest of persisted artifacts, for cheap integrity checks.
+
+`.assistant/artifact_manifest.json` records the size, mtime and SHA-256 of every artifact when
+it is persisted, and again whenever a Glyph tool rewrites it (see write_document). Verification
+compares stat data first and re-hashes only the files whose size or mtime changed, so checking a
+large artifact store reads almost nothing when nothing changed.
+
+Entries are keyed by filename: art_N names are unique, and an artifact keeps its entry when it is
+moved to or from archived/. Artifacts packed into an archive pack are checked by the pack's CRC
+instead, when they are extracted.
+
+Verifications run alongside each other, so changes are merged into the manifest on disk under the
+outputs lock rather than saving a manifest loaded earlier.
+"""
+import os
+import json
+import time
+from typing import TypedDict
+from config import BASE_NAME
+from ._fast_copy import hash_file
+from ._reference_index import map_ordered
+from ._project_lock import outputs_lock, private_tmp_path
+from ._archive_pack import is_pack_file, list_packed_documents
+
+
+MANIFEST_FILENAME = "artifact_manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_HASH = "sha256"
+
+
+class ManifestEntry(TypedDict):
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class ArtifactManifest(TypedDict):
+    version: int
+    artifacts: dict[str, ManifestEntry]
+
+
+class VerificationResult(TypedDict):
+    checked: int
+    rehashed: int
+    bytes_hashed: int
+    seconds: float
+    modified: list[str]
+    missing: list[str]
+    untracked: list[str]
+
+
+def _empty_manifest() -> ArtifactManifest:
+    return {"version": MANIFEST_VERSION, "artifacts": {}}
+
+
+def load_manifest(assistant_dir: str) -> ArtifactManifest:
+    """
+    Load the artifact manifest, or an empty one if missing or unreadable.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        The artifact manifest.
+    """
+    try:
+        with open(os.path.join(assistant_dir, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return _empty_manifest()
+
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return _empty_manifest()
+
+    return manifest
+
+
+def save_manifest(assistant_dir: str, manifest: ArtifactManifest) -> None:
+    """Persist the artifact manifest, replacing the previous one in a single rename."""
+    manifest_path = os.path.join(assistant_dir, MANIFEST_FILENAME)
+    tmp_path = private_tmp_path(manifest_path)
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    os.replace(tmp_path, manifest_path)
+
+
+def update_manifest(assistant_dir: str, changes: dict[str, ManifestEntry | None]) -> None:
+    """
+    Apply entry changes to the manifest on disk, keeping changes other sessions saved meanwhile.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        changes: The new entry of each changed artifact, by filename; None removes the entry.
+    """
+    with outputs_lock(assistant_dir):
+        manifest = load_manifest(assistant_dir)
+
+        for filename, entry in changes.items():
+            if entry is None:
+                manifest["artifacts"].pop(filename, None)
+            else:
+                manifest["artifacts"][filename] = entry
+
+        save_manifest(assistant_dir, manifest)
+
+
+def _entry(file_path: str, digest: str | None = None) -> ManifestEntry:
+    st = os.stat(file_path)
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest if digest is not None else hash_file(file_path, MANIFEST_HASH),
+    }
+
+
+def record_artifacts(assistant_dir: str, file_paths: list[str], digests: list[str | None] | None = None) -> None:
+    """
+    Record the current state of artifacts in the manifest.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        file_paths: Paths of the artifacts.
+        digests: SHA-256 of each artifact's content when already known (e.g. computed while
+            copying it), or None to hash the file.
+    """
+    digests = digests if digests is not None else [None] * len(file_paths)
+    update_manifest(assistant_dir, {
+        os.path.basename(file_path): _entry(file_path, digest)
+        for file_path, digest in zip(file_paths, digests)
+    })
+
+
+def record_rewritten_artifact(file_path: str) -> None:
+    """
+    Update the manifest entry of a file just rewritten by a tool, if it is an artifact of a
+    project that has a manifest.
+
+    Args:
+        file_path: Path of the rewritten file.
+    """
+    if not os.path.basename(file_path).startswith("art_"):
+        return
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    if os.path.basename(directory) == "archived":
+        directory = os.path.dirname(directory)
+    if os.path.basename(directory) != "artifacts":
+        return
+
+    assistant_dir = os.path.dirname(directory)
+    if os.path.basename(assistant_dir) != BASE_NAME or not os.path.exists(os.path.join(assistant_dir, MANIFEST_FILENAME)):
+        return
+
+    record_artifacts(assistant_dir, [file_path])
+
+
+def _artifact_files(assistant_dir: str) -> dict[str, str]:
+    """Map the filename of every loose artifact, active or archived, to its path."""
+    artifacts_dir = os.path.join(assistant_dir, "artifacts")
+    files = {}
+
+    for directory in (artifacts_dir, os.path.join(artifacts_dir, "archived")):
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.startswith("art_") and not is_pack_file(entry.name):
+                files[entry.name] = entry.path
+
+    return files
+
+
+def verify_manifest(
+    assistant_dir: str,
+    full: bool = False,
+    accept_changes: bool = False,
+    workers: int | None = None
+) -> VerificationResult:
+    """
+    Check every artifact against the manifest, re-hashing only those whose stat data changed.
+
+    Artifacts missing from the manifest (persisted before it existed) are hashed and recorded.
+    A file whose stat data changed but whose content did not gets its new stat data recorded,
+    so it is not re-hashed next time.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        full: Re-hash every artifact, even those whose stat data is unchanged.
+        accept_changes: Record the current content of modified artifacts and forget missing ones,
+            instead of reporting them again at the next verification.
+        workers: Number of hashing threads. Default: REFERENCE_SCAN_WORKERS.
+
+    Returns:
+        How many artifacts were checked and re-hashed, the bytes read, the time taken, and the
+        filenames of the modified, missing and newly recorded (untracked) artifacts.
+    """
+    start = time.perf_counter()
+    manifest = load_manifest(assistant_dir)
+    recorded = manifest["artifacts"]
+    files = _artifact_files(assistant_dir)
+    packed = {os.path.basename(rel_path) for rel_path, _, _ in list_packed_documents(assistant_dir, "artifacts")}
+
+    to_hash = []
+    for filename, file_path in sorted(files.items()):
+        entry = recorded.get(filename)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        if full or entry is None or (st.st_size, st.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+            to_hash.append((filename, file_path))
+
+    hashed = map_ordered(lambda item: _entry(item[1]), to_hash, workers)
+
+    result: VerificationResult = {
+        "checked": len(files),
+        "rehashed": len(hashed),
+        "bytes_hashed": sum(entry["size"] for entry in hashed),
+        "seconds": 0.0,
+        "modified": [],
+        "missing": sorted(filename for filename in recorded if filename not in files and filename not in packed),
+        "untracked": [],
+    }
+
+    changes: dict[str, ManifestEntry | None] = {}
+
+    for (filename, _), entry in zip(to_hash, hashed):
+        previous = recorded.get(filename)
+        if previous is None:
+            result["untracked"].append(filename)
+        elif previous["sha256"] != entry["sha256"]:
+            result["modified"].append(filename)
+            if not accept_changes:
+                continue
+        changes[filename] = entry
+
+    if accept_changes:
+        for filename in result["missing"]:
+            changes[filename] = None
+
+    if changes:
+        update_manifest(assistant_dir, changes)
+
+    result["seconds"] = time.perf_counter() - start
+    return result
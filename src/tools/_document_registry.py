@@ -0,0 +1,355 @@
+"""
+Registry of the numbered documents of a project.
+
+`.assistant/document_registry.json` maps each (type, number) to the document's filename, title,
+archived and packed state and summary description, and records the highest number ever seen per
+type. Looking up a document or allocating the next number is then a dictionary access instead of
+listing and matching a directory.
+
+The registry is checked against the modification times of the document directories, their
+archived/ directories, summaries and archive pack indexes - a dozen stat calls, independent of
+the number of documents. When anything changed outside Glyph's tools (a document added or
+renamed by hand, a summary edited), the registry is rebuilt from disk. Tools that change
+documents record the change and the new modification times, so their own changes do not cause a
+rebuild.
+
+Every access holds the project lock (see _project_lock), so Glyph sessions sharing a project see
+each other's changes, and allocate_document_numbers() never hands the same number out twice.
+"""
+import os
+import re
+import json
+from typing import TypedDict
+from ._project_lock import private_tmp_path, project_lock
+from ._archive_pack import PACK_FILENAME, PACK_INDEX_FILENAME, is_pack_file, load_pack_index
+
+
+REGISTRY_FILENAME = "document_registry.json"
+REGISTRY_VERSION = 1
+
+# Document prefix -> (directory, required extension)
+DOCUMENT_TYPES = {
+    "dl": ("design_logs", ".md"),
+    "op": ("operations", ".md"),
+    "art": ("artifacts", ""),
+}
+
+_NUMBERED_NAME = re.compile(r'^(dl|op|art)_(\d+)_(.*)$')
+_SUMMARY_ENTRY = re.compile(r'^- `([^`]+)`: ?(.*)$', re.MULTILINE)
+
+
+class RegistryEntry(TypedDict):
+    filename: str
+    title: str
+    archived: bool
+    packed: bool
+    description: str | None
+
+
+class TypeRegistry(TypedDict):
+    max_number: int
+    documents: dict[str, RegistryEntry]
+
+
+class DocumentRegistry(TypedDict):
+    version: int
+    stamps: dict[str, int]
+    types: dict[str, TypeRegistry]
+
+
+# assistant_dir -> ((inode, mtime_ns) of the registry file, registry). Every save replaces the
+# file, so a save by another session always changes the inode.
+_cache: dict[str, tuple[tuple[int, int], DocumentRegistry]] = {}
+
+
+def _stamped_paths(dir_name: str) -> list[str]:
+    return [
+        dir_name,
+        f"{dir_name}/archived",
+        f"{dir_name}/_summary.md",
+        f"{dir_name}/archived/{PACK_INDEX_FILENAME}",
+    ]
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _file_identity(path: str) -> tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0, 0
+    return st.st_ino, st.st_mtime_ns
+
+
+def _stamps(assistant_dir: str) -> dict[str, int]:
+    return {
+        rel_path: _mtime_ns(os.path.join(assistant_dir, rel_path))
+        for dir_name, _ in DOCUMENT_TYPES.values()
+        for rel_path in _stamped_paths(dir_name)
+    }
+
+
+def document_number(filename: str) -> int | None:
+    """Number of a document from its filename, or None if it is not a numbered document."""
+    match = _NUMBERED_NAME.match(filename)
+    return int(match.group(2)) if match else None
+
+
+def document_title(filename: str) -> str:
+    """Title of a document from its filename: 'dl_3_Auth_Flow.md' -> 'Auth Flow', 'art_2_run.csv' -> 'run.csv'."""
+    match = _NUMBERED_NAME.match(filename)
+    if match is None:
+        return filename
+    title = match.group(3)
+    if match.group(1) != "art":
+        title = title.removesuffix(".md").replace('_', ' ')
+    return title
+
+
+def make_entry(filename: str, archived: bool = False, packed: bool = False, description: str | None = None) -> RegistryEntry:
+    """Build the registry entry of a document."""
+    return {
+        "filename": filename,
+        "title": document_title(filename),
+        "archived": archived,
+        "packed": packed,
+        "description": description,
+    }
+
+
+def summary_descriptions(summary_path: str) -> dict[str, str]:
+    """Map the filename of each entry of a _summary.md file to its description."""
+    try:
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            return {filename: description for filename, description in _SUMMARY_ENTRY.findall(f.read())}
+    except OSError:
+        return {}
+
+
+def _numbered_files(directory: str, prefix: str, extension: str) -> dict[int, str]:
+    files: dict[int, str] = {}
+    if not os.path.isdir(directory):
+        return files
+
+    for entry in os.scandir(directory):
+        match = _NUMBERED_NAME.match(entry.name)
+        if match and match.group(1) == prefix and entry.name.endswith(extension) and entry.is_file() and not is_pack_file(entry.name):
+            files.setdefault(int(match.group(2)), entry.name)
+
+    return files
+
+
+def _scan_type(assistant_dir: str, prefix: str) -> TypeRegistry:
+    dir_name, extension = DOCUMENT_TYPES[prefix]
+    doc_dir = os.path.join(assistant_dir, dir_name)
+    archive_dir = os.path.join(doc_dir, "archived")
+    descriptions = summary_descriptions(os.path.join(doc_dir, "_summary.md"))
+    documents: dict[str, RegistryEntry] = {}
+
+    # Active documents win over archived ones with the same number
+    if os.path.exists(os.path.join(archive_dir, PACK_FILENAME)):
+        for number, member in load_pack_index(archive_dir)["documents"].items():
+            documents[number] = make_entry(member["filename"], archived=True, packed=True)
+    for number, filename in _numbered_files(archive_dir, prefix, extension).items():
+        documents[str(number)] = make_entry(filename, archived=True, description=descriptions.get(filename))
+    for number, filename in _numbered_files(doc_dir, prefix, extension).items():
+        documents[str(number)] = make_entry(filename, description=descriptions.get(filename))
+
+    return {
+        "max_number": max((int(number) for number in documents), default=0),
+        "documents": documents,
+    }
+
+
+def _save(assistant_dir: str, registry: DocumentRegistry) -> None:
+    registry_path = os.path.join(assistant_dir, REGISTRY_FILENAME)
+    tmp_path = private_tmp_path(registry_path)
+
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(registry, f)
+
+    os.replace(tmp_path, registry_path)
+    _cache[assistant_dir] = (_file_identity(registry_path), registry)
+
+
+def _load(assistant_dir: str) -> DocumentRegistry | None:
+    registry_path = os.path.join(assistant_dir, REGISTRY_FILENAME)
+    identity = _file_identity(registry_path)
+
+    cached = _cache.get(assistant_dir)
+    if cached is not None and cached[0] == identity:
+        return cached[1]
+
+    try:
+        with open(registry_path, 'r', encoding='utf-8') as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(registry, dict) or registry.get("version") != REGISTRY_VERSION:
+        return None
+
+    _cache[assistant_dir] = (identity, registry)
+    return registry
+
+
+def rebuild_registry(assistant_dir: str) -> DocumentRegistry:
+    """
+    Rebuild the registry from the document directories, archive packs and summaries.
+
+    The highest number of each type never decreases, so numbers allocated to documents not
+    created yet (or since deleted) are not handed out again.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        The rebuilt registry.
+    """
+    with project_lock(assistant_dir):
+        previous = _load(assistant_dir)
+        stamps = _stamps(assistant_dir)
+        registry: DocumentRegistry = {
+            "version": REGISTRY_VERSION,
+            "stamps": stamps,
+            "types": {prefix: _scan_type(assistant_dir, prefix) for prefix in DOCUMENT_TYPES},
+        }
+        if previous is not None:
+            for prefix, type_registry in registry["types"].items():
+                type_registry["max_number"] = max(type_registry["max_number"], previous["types"][prefix]["max_number"])
+        _save(assistant_dir, registry)
+        return registry
+
+
+def get_registry(assistant_dir: str) -> DocumentRegistry:
+    """
+    Return the project's registry, rebuilding it if documents changed outside Glyph's tools.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        The registry.
+    """
+    with project_lock(assistant_dir):
+        registry = _load(assistant_dir)
+        if registry is None or registry["stamps"] != _stamps(assistant_dir):
+            registry = rebuild_registry(assistant_dir)
+        return registry
+
+
+def document_path(assistant_dir: str, prefix: str, entry: RegistryEntry) -> str:
+    """Path of a registered document; for a packed document, the path of its archive pack."""
+    doc_dir = os.path.join(assistant_dir, DOCUMENT_TYPES[prefix][0])
+    if entry["packed"]:
+        return os.path.join(doc_dir, "archived", PACK_FILENAME)
+    if entry["archived"]:
+        return os.path.join(doc_dir, "archived", entry["filename"])
+    return os.path.join(doc_dir, entry["filename"])
+
+
+def lookup_document(assistant_dir: str, prefix: str, number: int) -> RegistryEntry | None:
+    """
+    Find a document by type and number.
+
+    A registered document whose file is gone triggers a rebuild, so a stale registry is
+    never trusted for a path.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        prefix: The document prefix ('dl', 'op' or 'art').
+        number: The document number.
+
+    Returns:
+        The registry entry, or None if there is no such document.
+    """
+    with project_lock(assistant_dir):
+        entry = get_registry(assistant_dir)["types"][prefix]["documents"].get(str(number))
+        if entry is not None and not os.path.isfile(document_path(assistant_dir, prefix, entry)):
+            entry = rebuild_registry(assistant_dir)["types"][prefix]["documents"].get(str(number))
+        return entry
+
+
+def list_registered_documents(assistant_dir: str, prefix: str, archived: bool = False) -> dict[int, RegistryEntry]:
+    """
+    List the active (or archived) documents of one type.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        prefix: The document prefix ('dl', 'op' or 'art').
+        archived: List archived documents instead of active ones.
+
+    Returns:
+        Dictionary mapping each document number to its registry entry.
+    """
+    documents = get_registry(assistant_dir)["types"][prefix]["documents"]
+    return {int(number): entry for number, entry in documents.items() if entry["archived"] == archived}
+
+
+def next_document_number(assistant_dir: str, prefix: str) -> int:
+    """
+    The number for a new document: one more than the highest number seen, active or archived.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        prefix: The document prefix ('dl', 'op' or 'art').
+
+    Returns:
+        The next document number.
+    """
+    return get_registry(assistant_dir)["types"][prefix]["max_number"] + 1
+
+
+def allocate_document_numbers(assistant_dir: str, prefix: str, count: int = 1) -> int:
+    """
+    Reserve consecutive numbers for new documents.
+
+    The reservation is saved before the lock is released, so other sessions allocating at the
+    same time get different numbers even before these documents exist on disk.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        prefix: The document prefix ('dl', 'op' or 'art').
+        count: How many numbers to reserve.
+
+    Returns:
+        The first reserved number.
+    """
+    with project_lock(assistant_dir):
+        registry = get_registry(assistant_dir)
+        type_registry = registry["types"][prefix]
+        first_number = type_registry["max_number"] + 1
+        type_registry["max_number"] += count
+        _save(assistant_dir, registry)
+        return first_number
+
+
+def record_documents(assistant_dir: str, prefix: str, entries: dict[int, RegistryEntry]) -> None:
+    """
+    Record documents a tool has just created, moved or re-described, with the new modification times.
+
+    Call after the change is complete on disk. Without this, the next lookup rebuilds the registry.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        prefix: The document prefix ('dl', 'op' or 'art').
+        entries: The new entry of each changed document, by number.
+    """
+    with project_lock(assistant_dir):
+        registry = _load(assistant_dir)
+        if registry is None:
+            rebuild_registry(assistant_dir)
+            return
+
+        type_registry = registry["types"][prefix]
+        for number, entry in entries.items():
+            type_registry["documents"][str(number)] = entry
+            type_registry["max_number"] = max(type_registry["max_number"], number)
+
+        registry["stamps"] = _stamps(assistant_dir)
+        _save(assistant_dir, registry)
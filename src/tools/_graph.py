@@ -0,0 +1,290 @@
+"""
+Reference graph structures.
+
+ReferenceGraph holds a project's graph in memory as forward and reverse adjacency maps;
+the graph store (see _graph_store) answers the same queries from SQLite. Both share the
+traversals of GraphQueries.
+"""
+from collections import deque
+from typing import Literal
+
+
+class GraphQueries:
+    """
+    Lookups and breadth-first traversals of a reference graph.
+
+    Subclasses answer has_node, references_from and references_to; the traversals only
+    use those, so they work the same on the in-memory graph and on the graph store.
+    """
+
+    def has_node(self, file_name: str) -> bool:
+        """Whether the file is a document of the project or is referenced by one."""
+        raise NotImplementedError
+
+    def references_from(self, file_name: str) -> list[str]:
+        """Files referenced by the given file."""
+        raise NotImplementedError
+
+    def references_to(self, file_name: str) -> list[str]:
+        """Files that reference the given file."""
+        raise NotImplementedError
+
+    def traverse(
+        self,
+        file_name: str,
+        direction: Literal["upstream", "downstream"],
+        max_depth: int | None = None
+    ) -> list[tuple[str, int, str]]:
+        """
+        Breadth-first transitive closure from a file.
+
+        Upstream follows references made by the file (what it depends on); downstream
+        follows references to the file (what depends on it).
+
+        Args:
+            file_name: The file to start from.
+            direction: 'upstream' or 'downstream'.
+            max_depth: Maximum number of hops to follow. None means unlimited.
+
+        Returns:
+            List of (file, depth, via) tuples in BFS order, where via is the file
+            through which it was first reached. The start file is not included.
+        """
+        neighbours_of = self.references_from if direction == "upstream" else self.references_to
+        visited = {file_name}
+        queue = deque([(file_name, 0)])
+        reached = []
+
+        while queue:
+            current, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            for neighbour in neighbours_of(current):
+                if neighbour in visited:
+                    continue
+                visited.add(neighbour)
+                reached.append((neighbour, depth + 1, current))
+                queue.append((neighbour, depth + 1))
+
+        return reached
+
+    def shortest_path(self, source: str, target: str, undirected: bool = False) -> list[str] | None:
+        """
+        Shortest chain of references leading from source to target, found by BFS.
+
+        Args:
+            source: The file to start from.
+            target: The file to reach.
+            undirected: If True, references may be followed in either direction.
+
+        Returns:
+            The list of files from source to target (inclusive), or None if unreachable.
+        """
+        if source == target:
+            return [source]
+
+        parents = {source: source}
+        queue = deque([source])
+
+        while queue:
+            current = queue.popleft()
+            neighbours = self.references_from(current)
+            if undirected:
+                neighbours = neighbours + self.references_to(current)
+
+            for neighbour in neighbours:
+                if neighbour in parents:
+                    continue
+                parents[neighbour] = current
+
+                if neighbour == target:
+                    path = [target]
+                    while path[-1] != source:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+
+                queue.append(neighbour)
+
+        return None
+
+
+class ReferenceGraph(GraphQueries):
+    """Forward and reverse adjacency maps of a project's reference graph."""
+
+    def __init__(
+        self,
+        edges: list[tuple[str, str]],
+        file_to_dir: dict[str, str],
+        positions: dict[str, int] | None = None,
+        revision: str | None = None
+    ):
+        """
+        Build the adjacency maps.
+
+        Args:
+            edges: List of (source_file, referenced_file) tuples.
+            file_to_dir: Dict mapping filename to its directory type.
+            positions: Walk position of every filename of the project, which orders edges.
+                Default: the order of nodes().
+            revision: Revision of the reference index the graph was derived from, if any.
+        """
+        self.edges = edges
+        self.file_to_dir = file_to_dir
+        self.revision = revision
+        self.forward: dict[str, list[str]] = {}
+        self.reverse: dict[str, list[str]] = {}
+
+        for source, target in edges:
+            self.forward.setdefault(source, []).append(target)
+            self.reverse.setdefault(target, []).append(source)
+
+        self.positions = positions if positions is not None else {name: position for position, name in enumerate(self.nodes())}
+
+        # The graph is immutable once built, so component analyses are computed once
+        self._strong_components: list[list[str]] | None = None
+        self._weak_components: list[list[str]] | None = None
+
+    def has_node(self, file_name: str) -> bool:
+        """Whether the file is a document of the project or is referenced by one."""
+        return file_name in self.file_to_dir or file_name in self.forward or file_name in self.reverse
+
+    def references_from(self, file_name: str) -> list[str]:
+        """Files referenced by the given file."""
+        return list(self.forward.get(file_name, []))
+
+    def references_to(self, file_name: str) -> list[str]:
+        """Files that reference the given file."""
+        return list(self.reverse.get(file_name, []))
+
+    def nodes(self) -> list[str]:
+        """Every document and referenced file, documents first in walk order."""
+        nodes = dict.fromkeys(self.file_to_dir)
+        for source, target in self.edges:
+            nodes.setdefault(source)
+            nodes.setdefault(target)
+        return list(nodes)
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """
+        Strongly connected components, computed with an iterative version of Tarjan's algorithm.
+
+        Returns:
+            List of components (each a list of files), in the order Tarjan's algorithm
+            completes them. Files that are not on any cycle form single-file components.
+        """
+        if self._strong_components is not None:
+            return self._strong_components
+
+        index_of: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components: list[list[str]] = []
+
+        for root in self.nodes():
+            if root in index_of:
+                continue
+
+            # Each frame is (node, iterator over its successors)
+            index_of[root] = lowlink[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            frames = [(root, iter(self.forward.get(root, [])))]
+
+            while frames:
+                node, successors = frames[-1]
+                advanced = False
+
+                for successor in successors:
+                    if successor not in index_of:
+                        index_of[successor] = lowlink[successor] = len(index_of)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        frames.append((successor, iter(self.forward.get(successor, []))))
+                        advanced = True
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[successor])
+
+                if advanced:
+                    continue
+
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        self._strong_components = components
+        return components
+
+    def weakly_connected_components(self) -> list[list[str]]:
+        """
+        Connected components when references are followed in either direction.
+
+        Returns:
+            List of components, each a list of files in breadth-first order from its first file.
+        """
+        if self._weak_components is not None:
+            return self._weak_components
+
+        seen: set[str] = set()
+        components = []
+
+        for root in self.nodes():
+            if root in seen:
+                continue
+
+            seen.add(root)
+            component = [root]
+            head = 0
+            while head < len(component):
+                current = component[head]
+                head += 1
+                for neighbour in self.forward.get(current, []) + self.reverse.get(current, []):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        component.append(neighbour)
+            components.append(component)
+
+        self._weak_components = components
+        return components
+
+    def find_cycle(self, component: list[str]) -> list[str]:
+        """
+        Find a shortest reference cycle through the first file of a strongly connected component.
+
+        Args:
+            component: A strongly connected component with at least two files.
+
+        Returns:
+            The files on the cycle, starting and ending with the same file.
+        """
+        start = component[0]
+        members = set(component)
+        parents = {start: start}
+        queue = deque([start])
+
+        while queue:
+            current = queue.popleft()
+            for neighbour in self.forward.get(current, []):
+                if neighbour == start:
+                    cycle = [start, current]
+                    while cycle[-1] != start:
+                        cycle.append(parents[cycle[-1]])
+                    return cycle[::-1]
+                if neighbour in members and neighbour not in parents:
+                    parents[neighbour] = current
+                    queue.append(neighbour)
+
+        return [start]
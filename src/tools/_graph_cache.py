@@ -0,0 +1,213 @@
+"""
+In-memory reference graph cache.
+
+Keeps one ReferenceGraph (forward and reverse adjacency maps) per project, backed by
+the persistent reference index. The cached graph is refreshed from the index only
+when a document was added, removed or modified, so queries against an unchanged
+project never read or rewrite any document, CSV or Mermaid file. With the "sqlite"
+backend, a cold cache is filled from the graph store, or queried through it.
+
+Before a cached graph is served, the directories and files it was built from are stat'ed
+once each (index_is_current); the tree is only walked and the index only updated when that
+check fails. Documents are usually edited in place by agents and editors outside Glyph, which
+leaves directory mtimes unchanged, so one stat per file is the cheapest check that never
+serves a stale graph. A running background watcher vouches for the graph instead, and then
+lookups touch no file at all.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from config import REFERENCE_GRAPH_BACKEND
+from ._graph import GraphQueries, ReferenceGraph
+from ._graph_store import load_graph_store, open_stored_graph
+from ._reference_index import (
+    ReferenceIndex, update_reference_index, index_is_current, edges_from_index, build_referrer_index, walk_positions
+)
+
+
+class _CachedProject:
+    def __init__(
+        self,
+        index: ReferenceIndex,
+        documents: list[tuple[str, str, str]],
+        stamps: dict[str, tuple[int, int] | None]
+    ):
+        self.index = index
+        self.documents = documents
+        # Stat data of the walked directories and files, checked before serving the index again
+        self.stamps = stamps
+        # Built from the index (or loaded from the graph store) on first use
+        self.graph: ReferenceGraph | None = None
+        # Set by a running background watcher when no change is pending, so the
+        # graph can be served without even checking file stat data.
+        self.trusted = False
+        # Reverse index of the documents mentioning each filename, built on first use
+        self.referrers: dict[str, list[str]] | None = None
+
+
+_cache: dict[str, _CachedProject] = {}
+_cache_lock = threading.RLock()
+
+
+def _cache_key(assistant_dir: str) -> str:
+    return os.path.normcase(os.path.abspath(assistant_dir))
+
+
+def _refresh_index(assistant_dir: str, force: bool = False) -> tuple[_CachedProject, dict[str, int]]:
+    """Bring the cached index of a project up to date, without building its graph. Call under _cache_lock."""
+    key = _cache_key(assistant_dir)
+    cached = _cache.get(key)
+    if cached and ((cached.trusted and not force) or index_is_current(cached.index, cached.stamps)):
+        return cached, {"scanned": 0, "reused": len(cached.index["files"]), "removed": 0}
+
+    stamps: dict[str, tuple[int, int] | None] = {}
+    index, documents, stats, changed = update_reference_index(
+        assistant_dir, cached.index if cached else None, stamps=stamps
+    )
+
+    if cached and not changed:
+        # E.g. a file touched without being modified: only the stat data moved
+        cached.stamps = stamps
+        return cached, stats
+
+    refreshed = _CachedProject(index, documents, stamps)
+    refreshed.trusted = cached.trusted if cached else False
+    _cache[key] = refreshed
+    return refreshed, stats
+
+
+def _cached_graph(assistant_dir: str, cached: _CachedProject) -> ReferenceGraph:
+    """Return the graph of a cached index, building it on first use. Call under _cache_lock."""
+    if cached.graph is None:
+        revision = cached.index["revision"]
+        # On a cold cache the store is usually still in line with the index
+        if REFERENCE_GRAPH_BACKEND == "sqlite":
+            cached.graph = load_graph_store(assistant_dir, revision)
+        if cached.graph is None:
+            edges, file_to_dir = edges_from_index(cached.index, cached.documents)
+            cached.graph = ReferenceGraph(edges, file_to_dir, walk_positions(cached.documents), revision)
+
+    return cached.graph
+
+
+def refresh_reference_graph(assistant_dir: str, force: bool = False) -> tuple[ReferenceGraph, dict[str, int]]:
+    """
+    Return the project's reference graph, refreshing it if any document changed.
+
+    If a background watcher vouches for the cached graph, it is returned without
+    touching the disk. With the "sqlite" backend, a graph that is not cached yet is
+    loaded from the graph store when the store is in line with the index.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        force: Check the files on disk even if the cached graph is trusted.
+
+    Returns:
+        Tuple of (graph, stats) where stats holds the index refresh counts
+        ('scanned', 'reused', 'removed').
+    """
+    with _cache_lock:
+        cached, stats = _refresh_index(assistant_dir, force)
+        return _cached_graph(assistant_dir, cached), stats
+
+
+def get_reference_graph(assistant_dir: str) -> ReferenceGraph:
+    """
+    Return the project's reference graph, refreshing it if any document changed.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        The cached or refreshed reference graph.
+    """
+    graph, _ = refresh_reference_graph(assistant_dir)
+    return graph
+
+
+@contextmanager
+def query_reference_graph(assistant_dir: str) -> Iterator[GraphQueries]:
+    """
+    Provide the project's reference graph for lookups and traversals.
+
+    With the "sqlite" backend, when no graph is cached and the graph store is in line
+    with the index, the queries run on the store and the graph is never loaded.
+    Otherwise this is the graph of get_reference_graph().
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Yields:
+        The graph to query, valid until the block exits.
+    """
+    with _cache_lock:
+        cached, _ = _refresh_index(assistant_dir)
+        stored = None
+        if cached.graph is None and REFERENCE_GRAPH_BACKEND == "sqlite":
+            stored = open_stored_graph(assistant_dir, cached.index["revision"])
+        graph = stored or _cached_graph(assistant_dir, cached)
+
+    try:
+        yield graph
+    finally:
+        if stored is not None:
+            stored.close()
+
+
+def set_reference_graph_trusted(assistant_dir: str, trusted: bool) -> None:
+    """
+    Mark whether the cached graph of a project is known to be up to date.
+
+    Only a background watcher should set this to True, right after refreshing.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        trusted: True to serve the cached graph without checking the disk.
+    """
+    with _cache_lock:
+        cached = _cache.get(_cache_key(assistant_dir))
+        if cached:
+            cached.trusted = trusted
+
+
+def find_referrers(assistant_dir: str, filenames: list[str]) -> tuple[set[str], set[str]] | None:
+    """
+    Look up which documents mention any of the given filenames, using the reference index.
+
+    The index is brought up to date first (reading only changed files), so the answer
+    reflects the files on disk.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        filenames: Filenames of documents of the project.
+
+    Returns:
+        Tuple of (referrers, indexed) holding relative paths: the documents mentioning any of
+        the filenames, and every document the index covers. Documents outside the index
+        (summaries, unreadable files) or scanned only partially must be checked directly.
+        None if the index records link targets rather than mentions ("links" mode).
+    """
+    with _cache_lock:
+        cached, _ = _refresh_index(assistant_dir, force=True)
+
+        if cached.index.get("mode", "substring") != "substring":
+            return None
+
+        if cached.referrers is None:
+            cached.referrers = build_referrer_index(cached.index)
+
+        referrers = {rel_path for name in filenames for rel_path in cached.referrers.get(name, [])}
+        indexed = {rel_path for rel_path, entry in cached.index["files"].items() if not entry["truncated"]}
+        return referrers, indexed
+
+
+def invalidate_reference_graph(assistant_dir: str) -> None:
+    """
+    Drop the cached graph of a project, forcing the next lookup to reload the index.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+    """
+    with _cache_lock:
+        _cache.pop(_cache_key(assistant_dir), None)
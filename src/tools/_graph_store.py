@@ -0,0 +1,280 @@
+"""
+SQLite store for the reference graph.
+
+An alternative to rewriting reference_graph.csv on every update: nodes and edges live
+in .assistant/reference_graph.db, indexed on both edge endpoints, and each update
+applies only the edges that were added or removed, in a single transaction.
+
+The store records the revision of the reference index it was synced from. While it
+matches the index, the graph is loaded from the store instead of being derived from the
+index again, and lookups and traversals run as indexed queries without loading it at all.
+"""
+import os
+import sqlite3
+import threading
+from ._graph import GraphQueries, ReferenceGraph
+
+
+STORE_FILENAME = "reference_graph.db"
+# Stored in PRAGMA user_version; a store with another version is rebuilt by the next sync
+STORE_VERSION = 1
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS nodes (
+        name TEXT PRIMARY KEY,
+        dir TEXT,
+        position INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS edges (
+        source TEXT NOT NULL,
+        target TEXT NOT NULL,
+        PRIMARY KEY (source, target)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS edges_by_target ON edges (target, source)",
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)",
+    "INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', '')",
+]
+
+
+class _StoreSnapshot:
+    """Store contents as of a given generation, so syncs need not read every stored edge back."""
+
+    def __init__(self, generation: int, edges: set[tuple[str, str]], nodes: dict[str, tuple[str | None, int]]):
+        self.generation = generation
+        self.edges = edges
+        self.nodes = nodes
+
+
+_snapshots: dict[str, _StoreSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _store_path(assistant_dir: str) -> str:
+    return os.path.normcase(os.path.abspath(os.path.join(assistant_dir, STORE_FILENAME)))
+
+
+def _meta(connection: sqlite3.Connection, key: str) -> int | str:
+    return connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()[0]
+
+
+def open_graph_store(assistant_dir: str) -> sqlite3.Connection:
+    """
+    Open the project's graph store, creating the database and schema if needed.
+
+    A store written with another schema version is emptied and created again.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        An open connection. The caller is responsible for closing it.
+    """
+    connection = sqlite3.connect(os.path.join(assistant_dir, STORE_FILENAME))
+    connection.execute("PRAGMA journal_mode=WAL")
+
+    if connection.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+        with connection:
+            # Checked again inside the transaction, so a store another session has just
+            # created is not emptied
+            connection.execute("BEGIN IMMEDIATE")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+                for table in ("edges", "nodes", "meta"):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    return connection
+
+
+def _node_rows(graph: ReferenceGraph) -> dict[str, tuple[str | None, int]]:
+    """The stored (dir, position) of every filename: documents have a dir, other walked names do not."""
+    return {name: (graph.file_to_dir.get(name), position) for name, position in graph.positions.items()}
+
+
+def sync_graph_store(
+    assistant_dir: str,
+    graph: ReferenceGraph
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """
+    Bring the graph store in line with a reference graph, writing only the differences.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        graph: The current reference graph.
+
+    Returns:
+        Tuple of (added, removed) edges. Added edges follow the graph's edge order,
+        removed edges are sorted.
+    """
+    store_path = _store_path(assistant_dir)
+
+    with _snapshots_lock:
+        connection = open_graph_store(assistant_dir)
+        try:
+            with connection:
+                # The generation is bumped by every sync that changes the graph; if it still matches
+                # the snapshot taken by the last sync of this process, nobody else wrote in between.
+                connection.execute("BEGIN IMMEDIATE")
+                generation = _meta(connection, "generation")
+                snapshot = _snapshots.get(store_path)
+
+                if snapshot is None or snapshot.generation != generation:
+                    snapshot = _StoreSnapshot(
+                        generation,
+                        set(connection.execute("SELECT source, target FROM edges")),
+                        {name: (dir_name, position) for name, dir_name, position in connection.execute("SELECT name, dir, position FROM nodes")}
+                    )
+
+                edges = set(graph.edges)
+                added = edges - snapshot.edges
+                removed = snapshot.edges - edges
+
+                nodes = _node_rows(graph)
+                changed_nodes = [(name, *row) for name, row in nodes.items() if snapshot.nodes.get(name) != row]
+                removed_nodes = [(name,) for name in snapshot.nodes.keys() - nodes.keys()]
+
+                if added or removed or changed_nodes or removed_nodes:
+                    connection.executemany("DELETE FROM edges WHERE source = ? AND target = ?", removed)
+                    connection.executemany("INSERT INTO edges (source, target) VALUES (?, ?)", added)
+                    connection.executemany("DELETE FROM nodes WHERE name = ?", removed_nodes)
+                    connection.executemany("INSERT OR REPLACE INTO nodes (name, dir, position) VALUES (?, ?, ?)", changed_nodes)
+                    generation += 1
+                    connection.execute("UPDATE meta SET value = ? WHERE key = 'generation'", (generation,))
+
+                connection.execute("UPDATE meta SET value = ? WHERE key = 'revision'", (graph.revision or "",))
+
+                _snapshots[store_path] = _StoreSnapshot(generation, edges, nodes)
+        except BaseException:
+            _snapshots.pop(store_path, None)
+            raise
+        finally:
+            connection.close()
+
+    return [edge for edge in graph.edges if edge in added], sorted(removed)
+
+
+def load_graph_store(assistant_dir: str, revision: str) -> ReferenceGraph | None:
+    """
+    Load the reference graph from the store, if it was synced from the given index revision.
+
+    Edges come back in the order of a graph derived from the index: by the walk position
+    of their source, then of their target.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        revision: Revision of the current reference index.
+
+    Returns:
+        The stored graph, or None if there is no store or it is out of date.
+    """
+    if not os.path.exists(os.path.join(assistant_dir, STORE_FILENAME)):
+        return None
+
+    store_path = _store_path(assistant_dir)
+
+    with _snapshots_lock:
+        connection = open_graph_store(assistant_dir)
+        try:
+            with connection:
+                # One read transaction, so every table is read as of the same sync
+                connection.execute("BEGIN")
+                if _meta(connection, "revision") != revision:
+                    return None
+
+                generation = _meta(connection, "generation")
+                nodes = list(connection.execute("SELECT name, dir, position FROM nodes ORDER BY position"))
+                edges = list(connection.execute(
+                    "SELECT source, target FROM edges "
+                    "JOIN nodes AS s ON s.name = source JOIN nodes AS t ON t.name = target "
+                    "ORDER BY s.position, t.position"
+                ))
+        finally:
+            connection.close()
+
+        graph = ReferenceGraph(
+            edges,
+            {name: dir_name for name, dir_name, _ in nodes if dir_name is not None},
+            {name: position for name, _, position in nodes},
+            revision
+        )
+        # The next sync of this process can diff against what was just read
+        _snapshots[store_path] = _StoreSnapshot(generation, set(edges), _node_rows(graph))
+
+    return graph
+
+
+class StoredReferenceGraph(GraphQueries):
+    """
+    A reference graph answered from the store, one indexed query per lookup.
+
+    Every query reads the store as of the same sync. Close the graph when done.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, revision: str):
+        self.connection = connection
+        self.revision = revision
+
+    def has_node(self, file_name: str) -> bool:
+        """Whether the file is a document of the project or is referenced by one."""
+        return bool(self.connection.execute(
+            "SELECT EXISTS (SELECT 1 FROM nodes WHERE name = ? AND dir IS NOT NULL) "
+            "OR EXISTS (SELECT 1 FROM edges WHERE source = ?) "
+            "OR EXISTS (SELECT 1 FROM edges WHERE target = ?)",
+            (file_name, file_name, file_name)
+        ).fetchone()[0])
+
+    def references_from(self, file_name: str) -> list[str]:
+        """Files referenced by the given file."""
+        return [target for target, in self.connection.execute(
+            "SELECT target FROM edges JOIN nodes ON nodes.name = target WHERE source = ? ORDER BY position",
+            (file_name,)
+        )]
+
+    def references_to(self, file_name: str) -> list[str]:
+        """Files that reference the given file."""
+        return [source for source, in self.connection.execute(
+            "SELECT source FROM edges JOIN nodes ON nodes.name = source WHERE target = ? ORDER BY position",
+            (file_name,)
+        )]
+
+    def close(self) -> None:
+        """Close the connection to the store."""
+        self.connection.close()
+
+
+def open_stored_graph(assistant_dir: str, revision: str) -> StoredReferenceGraph | None:
+    """
+    Open the store for queries, if it was synced from the given index revision.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        revision: Revision of the current reference index.
+
+    Returns:
+        The stored graph, or None if there is no store or it is out of date.
+    """
+    if not os.path.exists(os.path.join(assistant_dir, STORE_FILENAME)):
+        return None
+
+    connection = open_graph_store(assistant_dir)
+    try:
+        connection.execute("BEGIN")
+        if _meta(connection, "revision") != revision:
+            connection.close()
+            return None
+    except BaseException:
+        connection.close()
+        raise
+
+    return StoredReferenceGraph(connection, revision)
@@ -0,0 +1,100 @@
+"""
+Markdown-link-aware reference extraction.
+
+An alternative to matching every known filename as a raw substring: a single compiled
+regex pass collects the targets of inline and reference-style Markdown links and the
+dl_N / op_N / art_N name tokens of a document, ignoring fenced and inline code. The
+extracted keys do not depend on which documents exist; they are resolved against the
+document set when the graph is built.
+"""
+import re
+from urllib.parse import unquote
+from typing import Iterable
+
+
+_LINK_PATTERN = re.compile(
+    rb"""
+    (?P<fence>^[ ]{0,3}(?P<marker>`{3,}|~{3,})[^\n]*\n(?s:.*?)(?:^[ ]{0,3}(?P=marker)[ \t]*$|\Z))
+    | (?P<code>`[^`\n]*`)
+    | \[[^\]\n]*\]\([ \t]*<?(?P<inline>[^)\s>]+)
+    | ^[ ]{0,3}\[[^\]\n]+\]:[ \t]*<?(?P<definition>[^\s>]+)
+    | (?<![\w.-])(?P<token>(?:dl|op|art)_\d+(?:_[\w.-]*\w)?)
+    """,
+    re.MULTILINE | re.VERBOSE
+)
+
+_NUMBERED_NAME = re.compile(r"(dl|op|art)_(\d+)(?:_|$)")
+
+
+def extract_link_keys(content: bytes | memoryview) -> list[str]:
+    """
+    Extract link targets and document name tokens from Markdown content.
+
+    Link targets are reduced to their file name (without directory, query or fragment).
+
+    Args:
+        content: UTF-8 encoded document content.
+
+    Returns:
+        Unique keys in order of first appearance.
+    """
+    keys: dict[str, None] = {}
+
+    for match in _LINK_PATTERN.finditer(content):
+        if match.lastgroup in ("fence", "code"):
+            continue
+
+        value = match.group(match.lastgroup).decode('utf-8', errors='replace')
+        if match.lastgroup != "token":
+            value = unquote(value.split('#', 1)[0].split('?', 1)[0]).replace('\\', '/').rsplit('/', 1)[-1]
+
+        if value:
+            keys[value] = None
+
+    return list(keys)
+
+
+class LinkResolver:
+    """Resolves extracted link keys to the documents of a project."""
+
+    def __init__(self, filenames: Iterable[str]):
+        """
+        Index the project's document names.
+
+        Args:
+            filenames: Names of every document in the project.
+        """
+        self.filenames = set(filenames)
+        self._by_number: dict[str, list[str]] = {}
+
+        for filename in sorted(self.filenames):
+            match = _NUMBERED_NAME.match(filename)
+            if match:
+                self._by_number.setdefault(f"{match.group(1)}_{match.group(2)}", []).append(filename)
+
+    def resolve(self, keys: Iterable[str]) -> list[str]:
+        """
+        Map link keys to document names.
+
+        A key naming an existing document (with or without its .md extension) resolves to it;
+        a bare name token such as 'dl_3' resolves to the document(s) numbered 3 of that type.
+        Other keys are dropped.
+
+        Args:
+            keys: Keys from extract_link_keys().
+
+        Returns:
+            Unique document names, in key order.
+        """
+        resolved: dict[str, None] = {}
+
+        for key in keys:
+            if key in self.filenames:
+                resolved[key] = None
+            elif f"{key}.md" in self.filenames:
+                resolved[f"{key}.md"] = None
+            else:
+                for filename in self._by_number.get(key, []):
+                    resolved[filename] = None
+
+        return list(resolved)
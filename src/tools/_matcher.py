@@ -0,0 +1,174 @@
+"""
+Multi-pattern filename matcher used by the reference graph scanner.
+
+The matcher is an Aho-Corasick automaton over the UTF-8 bytes of every known
+filename. It is built once per scan and finds all filenames mentioned in a
+document in a single linear pass, instead of one substring search per filename.
+"""
+import threading
+from typing import Iterable
+
+
+class FilenameMatcher:
+    """Finds every known filename occurring in a text in one pass."""
+
+    # Below this many filenames, one C-level substring search per filename is
+    # faster than walking the automaton byte by byte in Python.
+    SUBSTRING_SEARCH_MAX_PATTERNS = 256
+
+    def __init__(self, filenames: Iterable[str]):
+        """
+        Prepare the matcher.
+
+        Args:
+            filenames: The filenames to search for. Duplicates and empty names are ignored.
+        """
+        self.filenames: list[str] = [name for name in dict.fromkeys(filenames) if name]
+        self._encoded: list[bytes] = [name.encode('utf-8') for name in self.filenames]
+
+        # State 0 is the root. _goto[state] maps a byte to the next state,
+        # _out[state] holds the ids of all filenames ending at that state.
+        # The automaton is only built once a scan actually needs it.
+        self._goto: list[dict[int, int]] = []
+        self._fail: list[int] = []
+        self._out: list[tuple[int, ...]] = []
+        self._build_lock = threading.Lock()
+
+    def _uses_substring_search(self) -> bool:
+        return len(self.filenames) <= self.SUBSTRING_SEARCH_MAX_PATTERNS
+
+    def _build_automaton(self) -> None:
+        """Build the trie of encoded filenames and its failure links, once, even when scans run in threads."""
+        with self._build_lock:
+            if self._goto:
+                return
+
+            goto: list[dict[int, int]] = [{}]
+            fail = [0]
+            out: list[tuple[int, ...]] = [()]
+
+            for pattern_id, encoded in enumerate(self._encoded):
+                state = 0
+                for byte in encoded:
+                    next_state = goto[state].get(byte)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][byte] = next_state
+                        goto.append({})
+                        fail.append(0)
+                        out.append(())
+                    state = next_state
+                out[state] = out[state] + (pattern_id,)
+
+            self._build_failure_links(goto, fail, out)
+
+            # Publish the finished automaton; scans only start once _goto is non-empty
+            self._fail = fail
+            self._out = out
+            self._goto = goto
+
+    @staticmethod
+    def _build_failure_links(goto: list[dict[int, int]], fail: list[int], out: list[tuple[int, ...]]) -> None:
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = list(goto[0].values())
+        head = 0
+
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+
+            for byte, child in goto[state].items():
+                queue.append(child)
+
+                fallback = fail[state]
+                while fallback and byte not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(byte, 0)
+                fail[child] = target if target != child else 0
+
+                if out[fail[child]]:
+                    out[child] = out[child] + out[fail[child]]
+
+    def _scan(self, data: bytes, state: int, found: set[int]) -> int:
+        """Feed bytes through the automaton, collecting matched filename ids. Returns the final state."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+
+        for byte in data:
+            next_state = goto[state].get(byte)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(byte)
+            state = next_state or 0
+            if out[state]:
+                found.update(out[state])
+
+        return state
+
+    def find_in_bytes(self, data: bytes) -> list[str]:
+        """
+        Find which filenames occur in UTF-8 encoded content.
+
+        Args:
+            data: The raw content to scan.
+
+        Returns:
+            The matched filenames, in the order they were given to the matcher.
+        """
+        if self._uses_substring_search():
+            return [name for name, encoded in zip(self.filenames, self._encoded) if encoded in data]
+
+        if not self._goto:
+            self._build_automaton()
+
+        found: set[int] = set()
+        self._scan(data, 0, found)
+        return [self.filenames[pattern_id] for pattern_id in sorted(found)]
+
+    def find_in_chunks(self, chunks: Iterable[bytes]) -> list[str]:
+        """
+        Find which filenames occur in content delivered as consecutive chunks.
+
+        Matches spanning chunk boundaries are found, so large files can be scanned
+        a block at a time without holding them in memory.
+
+        Args:
+            chunks: Consecutive pieces of UTF-8 encoded content. All chunks are consumed.
+
+        Returns:
+            The matched filenames, in the order they were given to the matcher.
+        """
+        found: set[int] = set()
+
+        if self._uses_substring_search():
+            overlap = max((len(encoded) for encoded in self._encoded), default=1) - 1
+            tail = b""
+            for chunk in chunks:
+                window = tail + chunk
+                for pattern_id, encoded in enumerate(self._encoded):
+                    if pattern_id not in found and encoded in window:
+                        found.add(pattern_id)
+                tail = window[-overlap:] if overlap else b""
+        else:
+            if not self._goto:
+                self._build_automaton()
+            state = 0
+            for chunk in chunks:
+                state = self._scan(chunk, state, found)
+
+        return [self.filenames[pattern_id] for pattern_id in sorted(found)]
+
+    def find_in_text(self, content: str) -> list[str]:
+        """
+        Find which filenames occur in a string.
+
+        Args:
+            content: The text to scan.
+
+        Returns:
+            The matched filenames, in the order they were given to the matcher.
+        """
+        if self._uses_substring_search():
+            return [name for name in self.filenames if name in content]
+        return self.find_in_bytes(content.encode('utf-8'))
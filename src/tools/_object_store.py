@@ -0,0 +1,165 @@
+"""
+Content-addressed storage for artifacts.
+
+With ARTIFACT_STORAGE = "objects", the content of persisted artifacts is stored once under
+`.assistant/objects/<first two hex digits>/<sha256>`, and every `art_N_*` file is a hardlink
+to its object. Persisting content that is already stored only adds a link: the source is
+read once to hash it and nothing is written.
+
+Objects are read-only, because every link shares one inode. Tools that rewrite documents
+replace a linked file instead of writing through it (see write_document), so an edit never
+reaches the other artifacts. An object whose only remaining link is its own entry in the
+store is not referenced by any artifact any more - its artifacts were deleted, rewritten or
+packed into an archive - and collect_garbage() removes it.
+"""
+import os
+import stat
+import time
+import tempfile
+from typing import Literal, TypedDict
+from ._fast_copy import copy_file, hash_file
+
+
+OBJECTS_DIRNAME = "objects"
+OBJECT_HASH = "sha256"
+
+# Temporary files are written here and renamed into place once complete
+_TMP_DIRNAME = "tmp"
+
+# Temporary files older than this were left behind by an interrupted store
+_STALE_TMP_SECONDS = 3600
+
+
+class StoreStats(TypedDict):
+    digest: str
+    bytes: int
+    seconds: float
+    method: Literal["deduplicated", "reflink", "copy_file_range", "sendfile", "stream"]
+    linked: bool
+
+
+class GarbageCollectionResult(TypedDict):
+    objects_removed: int
+    bytes_reclaimed: int
+    objects_kept: int
+
+
+def object_path(assistant_dir: str, digest: str) -> str:
+    """Path of the object storing content with this digest."""
+    return os.path.join(assistant_dir, OBJECTS_DIRNAME, digest[:2], digest)
+
+
+def store_file(assistant_dir: str, source_path: str, destination_path: str) -> StoreStats:
+    """
+    Store a file's content as an object, unless already stored, and link destination_path to it.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        source_path: Path of the file to store.
+        destination_path: Path of the artifact to create.
+
+    Returns:
+        The content digest, the bytes written to the store (0 if the content was already
+        stored), how long it took, how the content was stored, and whether destination_path
+        is a hardlink (False if the filesystem does not support them and it is a copy).
+    """
+    start = time.perf_counter()
+    digest = hash_file(source_path, OBJECT_HASH)
+    path = object_path(assistant_dir, digest)
+    copied = 0
+    method = "deduplicated"
+
+    if not os.path.exists(path):
+        tmp_dir = os.path.join(assistant_dir, OBJECTS_DIRNAME, _TMP_DIRNAME)
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        os.close(fd)
+
+        try:
+            copy_stats = copy_file(source_path, tmp_path, checksum=OBJECT_HASH)
+            # The source may have changed since it was hashed: name the object after what was copied
+            digest = copy_stats["checksum"]
+            path = object_path(assistant_dir, digest)
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(tmp_path).st_mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        copied, method = copy_stats["bytes"], copy_stats["method"]
+
+    try:
+        os.link(path, destination_path)
+        linked = True
+    except FileNotFoundError:
+        if os.path.exists(path):
+            raise
+        # Collected by another session's garbage collection before it could be linked
+        return store_file(assistant_dir, source_path, destination_path)
+    except OSError:
+        copy_file(path, destination_path)
+        os.chmod(destination_path, stat.S_IMODE(os.stat(source_path).st_mode))
+        linked = False
+
+    return {
+        "digest": digest,
+        "bytes": copied,
+        "seconds": time.perf_counter() - start,
+        "method": method,
+        "linked": linked,
+    }
+
+
+def collect_garbage(assistant_dir: str, dry_run: bool = False, now: float | None = None) -> GarbageCollectionResult:
+    """
+    Remove the objects no artifact links to, and temporary files left by interrupted stores.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        dry_run: If True, only count what would be removed.
+        now: Current time as a Unix timestamp. Default: time.time().
+
+    Returns:
+        How many objects were removed, the bytes reclaimed and how many objects are still linked.
+    """
+    now = time.time() if now is None else now
+    result: GarbageCollectionResult = {"objects_removed": 0, "bytes_reclaimed": 0, "objects_kept": 0}
+    objects_dir = os.path.join(assistant_dir, OBJECTS_DIRNAME)
+
+    if not os.path.isdir(objects_dir):
+        return result
+
+    for shard in sorted(os.listdir(objects_dir)):
+        shard_dir = os.path.join(objects_dir, shard)
+        if not os.path.isdir(shard_dir):
+            continue
+
+        for name in os.listdir(shard_dir):
+            path = os.path.join(shard_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            if shard == _TMP_DIRNAME:
+                # ctime, since copies take the source's mtime
+                if now - st.st_ctime < _STALE_TMP_SECONDS:
+                    continue
+            elif st.st_nlink > 1:
+                result["objects_kept"] += 1
+                continue
+            else:
+                result["objects_removed"] += 1
+
+            result["bytes_reclaimed"] += st.st_size
+            if not dry_run:
+                # Read-only files cannot be removed on Windows
+                os.chmod(path, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+                os.remove(path)
+
+        if not dry_run and shard != _TMP_DIRNAME and not os.listdir(shard_dir):
+            os.rmdir(shard_dir)
+
+    return result
@@ -0,0 +1,181 @@
+"""
+Cross-process lock on a project's documents.
+
+Several Glyph servers (one per agent or editor window) may work on the same project. Every
+change to the document directories - numbering and creating documents, summary updates,
+reference rewriting, archiving - is made while holding the project lock in "write" mode;
+reference scans hold it in "read" mode, so they never see a document half rewritten but run
+alongside each other.
+
+The lock is an flock(2) on `.assistant/.glyph.lock`. Each thread opens its own descriptor, so
+threads of one server exclude each other the same way separate processes do. Acquisition is
+reentrant per thread: a thread holding the lock may take it again in the same mode, or in
+"read" mode under "write". Upgrading a read lock to a write lock is refused, because two
+readers upgrading at once would wait for each other forever.
+
+Files derived from the documents - the reference index, the graph outputs and store, the
+artifact manifest - are written by readers too. Each write holds the outputs lock, a second,
+exclusive lock on `.assistant/.glyph-outputs.lock`. It may be taken while holding the project
+lock in either mode, but never the other way round, so the two cannot deadlock.
+
+Where fcntl is not available (Windows), both locks fall back to per-project locks inside
+the process, which only protect concurrent tool calls of one server.
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Literal
+from config import PROJECT_LOCK_TIMEOUT
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+
+LOCK_FILENAME = ".glyph.lock"
+OUTPUTS_LOCK_FILENAME = ".glyph-outputs.lock"
+
+# Bounds of the wait between two attempts to take a busy lock
+_POLL_MIN_SECONDS = 0.005
+_POLL_MAX_SECONDS = 0.1
+
+
+class ProjectLockTimeout(TimeoutError):
+    """The project lock could not be acquired in time."""
+
+
+class _HeldLock:
+    def __init__(self, mode: str, fd: int | None):
+        self.mode = mode
+        self.fd = fd
+
+
+_held = threading.local()
+_process_locks: dict[str, threading.RLock] = {}
+_process_locks_lock = threading.Lock()
+
+
+def _lock_path(assistant_dir: str, filename: str = LOCK_FILENAME) -> str:
+    return os.path.normcase(os.path.abspath(os.path.join(assistant_dir, filename)))
+
+
+def _held_locks() -> dict[str, _HeldLock]:
+    if not hasattr(_held, "locks"):
+        _held.locks = {}
+    return _held.locks
+
+
+def _acquire_flock(lock_path: str, mode: str, timeout: float) -> int:
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    operation = (fcntl.LOCK_SH if mode == "read" else fcntl.LOCK_EX) | fcntl.LOCK_NB
+    deadline = time.monotonic() + timeout
+    delay = _POLL_MIN_SECONDS
+
+    while True:
+        try:
+            fcntl.flock(fd, operation)
+            return fd
+        except BlockingIOError:
+            pass
+        except BaseException:
+            os.close(fd)
+            raise
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            os.close(fd)
+            raise ProjectLockTimeout(
+                f"Timed out after {timeout:g}s waiting for the project lock ({lock_path}); "
+                "another Glyph session is changing this project's documents"
+            )
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _POLL_MAX_SECONDS)
+
+
+def _acquire_process_lock(lock_path: str, timeout: float) -> None:
+    with _process_locks_lock:
+        lock = _process_locks.setdefault(lock_path, threading.RLock())
+    if not lock.acquire(timeout=timeout):
+        raise ProjectLockTimeout(f"Timed out after {timeout:g}s waiting for the project lock ({lock_path})")
+
+
+def private_tmp_path(path: str) -> str:
+    """
+    Temporary path next to path for writing its new content, unique to this process and thread.
+
+    A writer that crashes, or runs where the lock only covers one process, never leaves behind
+    or overwrites a temporary file another writer is using.
+    """
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+@contextmanager
+def _hold(lock_path: str, mode: str, timeout: float | None) -> Iterator[None]:
+    held = _held_locks()
+    current = held.get(lock_path)
+
+    if current is not None:
+        if mode == "write" and current.mode == "read":
+            raise RuntimeError("Cannot take the project lock for writing while holding it for reading")
+        yield
+        return
+
+    timeout = PROJECT_LOCK_TIMEOUT if timeout is None else timeout
+    if fcntl is not None:
+        current = _HeldLock(mode, _acquire_flock(lock_path, mode, timeout))
+    else:
+        _acquire_process_lock(lock_path, timeout)
+        current = _HeldLock(mode, None)
+
+    held[lock_path] = current
+    try:
+        yield
+    finally:
+        del held[lock_path]
+        if current.fd is not None:
+            # Closing the descriptor releases the flock
+            os.close(current.fd)
+        else:
+            _process_locks[lock_path].release()
+
+
+@contextmanager
+def project_lock(
+    assistant_dir: str,
+    mode: Literal["read", "write"] = "write",
+    timeout: float | None = None
+) -> Iterator[None]:
+    """
+    Hold the project lock for the duration of a with block.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        mode: "write" to change documents (exclusive), "read" to scan them (shared).
+        timeout: Seconds to wait for the lock. Default: PROJECT_LOCK_TIMEOUT.
+
+    Raises:
+        ProjectLockTimeout: If the lock is still held by another session after the timeout.
+        RuntimeError: If the thread already holds the lock in "read" mode and asks for "write".
+    """
+    with _hold(_lock_path(assistant_dir), mode, timeout):
+        yield
+
+
+@contextmanager
+def outputs_lock(assistant_dir: str, timeout: float | None = None) -> Iterator[None]:
+    """
+    Hold the outputs lock, to write files derived from the documents, for the duration of a with block.
+
+    Do not take the project lock while holding it.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        timeout: Seconds to wait for the lock. Default: PROJECT_LOCK_TIMEOUT.
+
+    Raises:
+        ProjectLockTimeout: If the lock is still held by another session after the timeout.
+    """
+    with _hold(_lock_path(assistant_dir, OUTPUTS_LOCK_FILENAME), "write", timeout):
+        yield
@@ -0,0 +1,715 @@
+"""
+Persistent, incremental index backing the reference graph.
+
+The index is stored in `.assistant/reference_index.json` and remembers, for every
+scanned document, its size, mtime, content hash, the filenames it mentions and the
+filename-like tokens it contains. Refreshing the index only reads files whose stat
+data changed, and new filenames are looked up in the stored tokens, so an update
+costs time proportional to what changed rather than to the whole tree.
+"""
+import os
+import re
+import json
+import mmap
+import codecs
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NotRequired, TypeVar, TypedDict
+from config import REFERENCE_EXTRACTION_MODE, REFERENCE_SCAN_INCLUDE_PACKED, REFERENCE_SCAN_MAX_BYTES, REFERENCE_SCAN_WORKERS
+from ._matcher import FilenameMatcher
+from ._link_extractor import LinkResolver, extract_link_keys
+from ._project_lock import outputs_lock, private_tmp_path
+from ._archive_pack import PackedMember, is_pack_file, list_packed_documents, read_packed_member
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+INDEX_FILENAME = "reference_index.json"
+INDEX_VERSION = 3
+SCANNED_DIRS = ["design_logs", "operations", "artifacts"]
+
+# Content is sniffed from the first block; files with a NUL byte or invalid UTF-8 there are binary
+SNIFF_BYTES = 8192
+# Larger files are memory-mapped and scanned one chunk at a time instead of read into memory
+MMAP_MIN_BYTES = 1024 * 1024
+SCAN_CHUNK_BYTES = 1024 * 1024
+
+# A filename made only of these characters occurs in a text exactly when it occurs inside
+# one maximal run of them, so new filenames can be looked up in a document's runs instead
+# of its content. Only runs with a letter and a '_' or '.' are kept, like every document name.
+_NAME_TOKEN = re.compile(rb'[\w.+\-]+')
+_TOKEN_NAME = re.compile(r'[\w.+\-]*[A-Za-z][\w.+\-]*', re.ASCII)
+_NAME_TOKEN_MARKS = re.compile(rb'[_.]')
+_NAME_TOKEN_LETTER = re.compile(rb'[A-Za-z]')
+# Documents with more distinct tokens (datasets, logs) are read again when filenames are added
+MAX_NAME_TOKENS = 10000
+
+
+class IndexEntry(TypedDict):
+    dir: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    references: list[str]
+    truncated: bool
+    names: list[str] | None
+
+
+class ReferenceIndex(TypedDict):
+    version: int
+    mode: str
+    filenames: list[str]
+    files: dict[str, IndexEntry]
+    revision: NotRequired[str]
+
+
+def map_ordered(func: Callable[[T], R], items: Iterable[T], workers: int | None = None) -> list[R]:
+    """
+    Apply func to every item on a bounded thread pool, returning results in input order.
+
+    Scanning is dominated by file I/O latency (network mounts, cold page cache), which
+    threads overlap; keeping the input order keeps every derived output deterministic.
+
+    Args:
+        func: Function to apply.
+        items: Items to process.
+        workers: Maximum number of threads. Default: REFERENCE_SCAN_WORKERS. 1 runs inline.
+
+    Returns:
+        List of results, in the order of items.
+    """
+    items = list(items)
+    workers = REFERENCE_SCAN_WORKERS if workers is None else workers
+
+    if workers <= 1 or len(items) < 2:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="glyph-scan") as executor:
+        return list(executor.map(func, items))
+
+
+def _empty_index(mode: str = "substring") -> ReferenceIndex:
+    return {"version": INDEX_VERSION, "mode": mode, "filenames": [], "files": {}}
+
+
+def index_revision(index: ReferenceIndex) -> str:
+    """
+    Identify the content of an index, so derived stores can tell whether they are up to date.
+
+    Sessions that index the same files compute the same revision.
+
+    Args:
+        index: The reference index.
+
+    Returns:
+        The SHA-256 of the index's mode, filenames and entries.
+    """
+    content = json.dumps([index["mode"], index["filenames"], index["files"]], sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    """The size and mtime of a file or directory, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def walk_document_files(
+    assistant_dir: str,
+    include_packed: bool | None = None,
+    stamps: dict[str, tuple[int, int] | None] | None = None
+) -> list[tuple[str, str, str]]:
+    """
+    List every file under the design_logs, operations and artifacts directories.
+
+    Archive pack files are not listed. With include_packed, the documents stored in each
+    directory's archive pack are listed after its files, with the pack's path as file path.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        include_packed: Whether to list packed documents. Default: REFERENCE_SCAN_INCLUDE_PACKED.
+        stamps: If given, receives the size and mtime of every walked directory (None if
+            missing), taken before the directory is listed.
+
+    Returns:
+        List of (relative_path, file_path, dir_name) tuples in os.walk order.
+        Relative paths are relative to the .assistant directory and use '/' separators.
+    """
+    include_packed = REFERENCE_SCAN_INCLUDE_PACKED if include_packed is None else include_packed
+    documents = []
+
+    for dir_name in SCANNED_DIRS:
+        directory = os.path.join(assistant_dir, dir_name)
+        if stamps is not None:
+            stamps[directory] = _stamp(directory)
+        if not os.path.exists(directory):
+            continue
+
+        for root, dirs, files in os.walk(directory):
+            if stamps is not None:
+                # Subdirectories are listed after this step, so their stamps are never newer than their listing
+                for subdirectory in dirs:
+                    stamps[os.path.join(root, subdirectory)] = _stamp(os.path.join(root, subdirectory))
+            for filename in files:
+                if is_pack_file(filename):
+                    continue
+                file_path = os.path.join(root, filename)
+                rel_path = os.path.relpath(file_path, assistant_dir).replace(os.sep, '/')
+                documents.append((rel_path, file_path, dir_name))
+
+        if include_packed:
+            documents.extend((rel_path, pack_path, dir_name) for rel_path, pack_path, _ in list_packed_documents(assistant_dir, dir_name))
+
+    return documents
+
+
+def load_reference_index(assistant_dir: str) -> ReferenceIndex:
+    """
+    Load the persisted reference index, or an empty one if missing or unreadable.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        The reference index.
+    """
+    index_path = os.path.join(assistant_dir, INDEX_FILENAME)
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return _empty_index()
+
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return _empty_index()
+
+    return index
+
+
+def save_reference_index(assistant_dir: str, index: ReferenceIndex) -> None:
+    """
+    Persist the reference index, replacing the previous one in a single rename under the outputs lock.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        index: The index to save.
+    """
+    index_path = os.path.join(assistant_dir, INDEX_FILENAME)
+    tmp_path = private_tmp_path(index_path)
+
+    with outputs_lock(assistant_dir):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+        os.replace(tmp_path, index_path)
+
+
+def find_references_in_content(content: str, target_filenames: list[str] | FilenameMatcher) -> list[str]:
+    """
+    Find which target filenames are mentioned in a piece of text.
+
+    Args:
+        content: The text to scan.
+        target_filenames: List of filenames to search for, or a prebuilt FilenameMatcher.
+                          Pass a matcher when scanning many texts for the same filenames.
+
+    Returns:
+        List of filenames that were found mentioned in the text.
+    """
+    if not isinstance(target_filenames, FilenameMatcher):
+        target_filenames = FilenameMatcher(target_filenames)
+    return target_filenames.find_in_text(content)
+
+
+def _is_binary(block: bytes) -> bool:
+    """Whether a file's first block looks like binary content rather than UTF-8 text."""
+    if b"\0" in block:
+        return True
+    try:
+        # Not final: a multi-byte character may be cut at the end of the block
+        codecs.getincrementaldecoder("utf-8")().decode(block, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+@contextmanager
+def open_document(file_path: str, max_bytes: int | None = None) -> Iterator[tuple[bytes | memoryview | None, str, bool]]:
+    """
+    Open a document for reference scanning.
+
+    Binary files are detected from their first block and not read further. Text files
+    up to MMAP_MIN_BYTES are read into memory; larger ones are memory-mapped, so memory
+    use stays flat regardless of their size. Only the first max_bytes are considered.
+
+    Args:
+        file_path: Path to the document.
+        max_bytes: Scan size cap. Default: REFERENCE_SCAN_MAX_BYTES.
+
+    Yields:
+        Tuple of (content, digest, truncated) where content is None for binary files,
+        digest is the SHA-256 of the bytes examined, and truncated tells whether the
+        file is larger than the cap.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    max_bytes = REFERENCE_SCAN_MAX_BYTES if max_bytes is None else max_bytes
+
+    with open(file_path, 'rb') as f:
+        head = f.read(min(SNIFF_BYTES, max_bytes))
+
+        if _is_binary(head):
+            yield None, hashlib.sha256(head).hexdigest(), False
+            return
+
+        size = os.fstat(f.fileno()).st_size
+
+        if min(size, max_bytes) < MMAP_MIN_BYTES:
+            data = head + f.read(max(0, max_bytes - len(head)))
+            truncated = len(data) == max_bytes and f.read(1) != b""
+            yield data, hashlib.sha256(data).hexdigest(), truncated
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)[:max_bytes]
+            try:
+                yield view, hashlib.sha256(view).hexdigest(), len(mapped) > max_bytes
+            finally:
+                view.release()
+
+
+@contextmanager
+def open_packed_document(
+    pack_path: str,
+    member: PackedMember,
+    max_bytes: int | None = None
+) -> Iterator[tuple[bytes | None, str, bool]]:
+    """
+    Open a document stored in an archive pack for reference scanning, like open_document().
+
+    Args:
+        pack_path: Path to the pack file.
+        member: The document's pack index entry.
+        max_bytes: Scan size cap. Default: REFERENCE_SCAN_MAX_BYTES.
+
+    Yields:
+        Tuple of (content, digest, truncated), as open_document().
+
+    Raises:
+        OSError: If the pack cannot be read.
+        ValueError: If the pack does not match its index.
+    """
+    max_bytes = REFERENCE_SCAN_MAX_BYTES if max_bytes is None else max_bytes
+    data = read_packed_member(pack_path, member)
+
+    if _is_binary(data[:min(SNIFF_BYTES, max_bytes)]):
+        yield None, hashlib.sha256(data[:SNIFF_BYTES]).hexdigest(), False
+        return
+
+    content = data[:max_bytes]
+    yield content, hashlib.sha256(content).hexdigest(), len(data) > max_bytes
+
+
+def scan_document(content: bytes | memoryview | None, matcher: FilenameMatcher, truncated: bool = False) -> list[str]:
+    """
+    Scan document content from open_document() for the matcher's filenames.
+
+    Content is fed to the matcher in SCAN_CHUNK_BYTES chunks. Binary content and content
+    that is not valid UTF-8 yields no references.
+
+    Args:
+        content: The content, or None for binary files.
+        matcher: The filenames to look for.
+        truncated: Whether the content was cut at the size cap (and may end mid-character).
+
+    Returns:
+        List of the matcher's filenames found in the content.
+    """
+    if content is None or not matcher.filenames:
+        return []
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def validated_chunks() -> Iterator[bytes]:
+        if isinstance(content, bytes) and len(content) <= SCAN_CHUNK_BYTES:
+            chunks = [content]
+        else:
+            chunks = (bytes(content[start:start + SCAN_CHUNK_BYTES]) for start in range(0, len(content), SCAN_CHUNK_BYTES))
+
+        for chunk in chunks:
+            decoder.decode(chunk)
+            yield chunk
+        decoder.decode(b"", final=not truncated)
+
+    try:
+        return matcher.find_in_chunks(validated_chunks())
+    except UnicodeDecodeError:
+        return []
+
+
+def _is_utf8(content: bytes | memoryview, truncated: bool) -> bool:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for start in range(0, len(content), SCAN_CHUNK_BYTES):
+            decoder.decode(content[start:start + SCAN_CHUNK_BYTES])
+        decoder.decode(b"", final=not truncated)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def extract_document_links(content: bytes | memoryview | None, truncated: bool = False) -> list[str]:
+    """
+    Extract Markdown link targets and name tokens from document content from open_document().
+
+    Binary content and content that is not valid UTF-8 yields no keys.
+
+    Args:
+        content: The content, or None for binary files.
+        truncated: Whether the content was cut at the size cap (and may end mid-character).
+
+    Returns:
+        Link keys, to be resolved with LinkResolver.
+    """
+    if content is None or not _is_utf8(content, truncated):
+        return []
+
+    return extract_link_keys(content)
+
+
+def is_token_name(filename: str) -> bool:
+    """Whether a filename can be looked up in the tokens from extract_name_tokens()."""
+    return _TOKEN_NAME.fullmatch(filename) is not None and ('_' in filename or '.' in filename)
+
+
+def extract_name_tokens(content: bytes | memoryview | None, truncated: bool = False) -> list[str] | None:
+    """
+    Collect the distinct filename-like tokens of document content from open_document().
+
+    A filename accepted by is_token_name() occurs in the content exactly when it occurs in
+    one of the tokens, so filenames added to the project later can be looked up without
+    reading the document again. Binary content and content that is not valid UTF-8 has no
+    tokens, as it yields no references.
+
+    Args:
+        content: The content, or None for binary files.
+        truncated: Whether the content was cut at the size cap (and may end mid-character).
+
+    Returns:
+        Sorted list of tokens, or None if the document has more than MAX_NAME_TOKENS of them
+        or a token longer than SCAN_CHUNK_BYTES, in which case it must be scanned again.
+    """
+    if content is None or not _is_utf8(content, truncated):
+        return []
+
+    tokens: set[bytes] = set()
+    tail = b""
+
+    for start in range(0, len(content), SCAN_CHUNK_BYTES):
+        data = tail + bytes(content[start:start + SCAN_CHUNK_BYTES])
+        tail = b""
+        for match in _NAME_TOKEN.finditer(data):
+            if match.end() == len(data) and start + SCAN_CHUNK_BYTES < len(content):
+                # The token may continue in the next chunk
+                tail = match.group()
+                if len(tail) > SCAN_CHUNK_BYTES:
+                    return None
+                break
+            token = match.group()
+            if _NAME_TOKEN_MARKS.search(token) and _NAME_TOKEN_LETTER.search(token):
+                tokens.add(token)
+        if len(tokens) > MAX_NAME_TOKENS:
+            return None
+
+    return sorted(token.decode('ascii') for token in tokens)
+
+
+def update_reference_index(
+    assistant_dir: str,
+    index: ReferenceIndex | None = None,
+    workers: int | None = None,
+    stamps: dict[str, tuple[int, int] | None] | None = None
+) -> tuple[ReferenceIndex, list[tuple[str, str, str]], dict[str, int], bool]:
+    """
+    Bring the reference index up to date with the files on disk.
+
+    Files whose size and mtime are unchanged are not read. Files whose stat data changed
+    but whose content hash did not are not rescanned. When new filenames appear in the
+    project, they are looked up in the name tokens recorded for each unchanged file; only
+    files without recorded tokens, or new names that are not token names, need the files
+    to be read again. The index file is only rewritten when something changed.
+
+    With REFERENCE_EXTRACTION_MODE set to "links", entries hold the Markdown link keys of
+    each document instead of matched filenames; they are resolved by edges_from_index(),
+    so unchanged files never need to be read again. Switching modes rebuilds the index.
+
+    Files are stat'ed, read and scanned on a bounded thread pool; the result does not
+    depend on the number of workers.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        index: An index already held in memory. If None, the persisted index is loaded.
+        workers: Number of scanning threads. Default: REFERENCE_SCAN_WORKERS.
+        stamps: If given, receives the size and mtime of every walked directory and file the
+            index was brought in line with, for index_is_current().
+
+    Returns:
+        Tuple of (index, documents, stats, changed) where:
+        - index: The updated index
+        - documents: The walked document list from walk_document_files()
+        - stats: Counts of 'scanned', 'reused' and 'removed' index entries
+        - changed: Whether the index differs from the one passed in or loaded
+    """
+    if index is None:
+        index = load_reference_index(assistant_dir)
+    mode = REFERENCE_EXTRACTION_MODE
+    if index.get("mode", "substring") != mode:
+        index = _empty_index(mode)
+    link_mode = mode == "links"
+    old_entries = index["files"]
+    documents = walk_document_files(assistant_dir, stamps=stamps)
+
+    all_filenames = [os.path.basename(rel_path) for rel_path, _, _ in documents]
+    known_filenames = set(all_filenames)
+    previous_filenames = set(index["filenames"])
+
+    # Matchers are built once per refresh: one for every known filename (used on
+    # modified files) and, for filenames that did not exist at the last refresh, one
+    # for those found through name tokens and one for those only found in content.
+    full_matcher = FilenameMatcher(all_filenames)
+    added_filenames = [name for name in all_filenames if name not in previous_filenames]
+    added_matcher = FilenameMatcher(added_filenames)
+    token_matcher = FilenameMatcher(name for name in added_filenames if is_token_name(name))
+    content_matcher = FilenameMatcher(name for name in added_filenames if not is_token_name(name))
+
+    # Packed documents are immutable members identified by size and CRC, which stand in
+    # for the size and mtime of loose files
+    packed_members = {
+        rel_path: member
+        for dir_name in {dir_name for _, file_path, dir_name in documents if is_pack_file(os.path.basename(file_path))}
+        for rel_path, _, member in list_packed_documents(assistant_dir, dir_name)
+    }
+
+    def index_document(document: tuple[str, str, str]) -> tuple[IndexEntry | None, bool]:
+        """Return the document's up-to-date entry (None if unreadable) and whether it was fully rescanned."""
+        rel_path, file_path, dir_name = document
+        member = packed_members.get(rel_path) if is_pack_file(os.path.basename(file_path)) else None
+
+        if member is not None:
+            size, mtime_ns = member["size"], member["crc"]
+            opener = lambda: open_packed_document(file_path, member)
+        else:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return None, False
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            opener = lambda: open_document(file_path)
+
+        entry = old_entries.get(rel_path)
+
+        if entry and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+            if link_mode:
+                return {**entry, "dir": dir_name}, False
+            references = [name for name in entry["references"] if name in known_filenames]
+            if entry["names"] is None:
+                rescan_matcher = added_matcher
+            else:
+                references.extend(token_matcher.find_in_text("\n".join(entry["names"])))
+                rescan_matcher = content_matcher
+            if rescan_matcher.filenames:
+                try:
+                    with opener() as (content, _, truncated):
+                        references.extend(scan_document(content, rescan_matcher, truncated))
+                except (OSError, ValueError):
+                    pass
+            return {**entry, "dir": dir_name, "references": references}, False
+
+        try:
+            with opener() as (content, digest, truncated):
+                if entry and entry["sha256"] == digest:
+                    # Touched but not modified - keep the known references
+                    if link_mode:
+                        references = entry["references"]
+                    else:
+                        references = [name for name in entry["references"] if name in known_filenames]
+                        references.extend(scan_document(content, added_matcher, truncated))
+                    names = entry["names"]
+                    rescanned = False
+                elif link_mode:
+                    references = extract_document_links(content, truncated)
+                    names = None
+                    rescanned = True
+                else:
+                    references = scan_document(content, full_matcher, truncated)
+                    names = extract_name_tokens(content, truncated)
+                    rescanned = True
+        except (OSError, ValueError):
+            return None, False
+
+        return {
+            "dir": dir_name,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha256": digest,
+            "references": references,
+            "truncated": truncated,
+            "names": names,
+        }, rescanned
+
+    # Skip _summary.md files as they trivially contain many filenames
+    sources = [document for document in documents if os.path.basename(document[0]) != "_summary.md"]
+    results = map_ordered(index_document, sources, workers)
+
+    new_entries: dict[str, IndexEntry] = {}
+    stats = {"scanned": 0, "reused": 0, "removed": 0}
+
+    for (rel_path, _, _), (entry, rescanned) in zip(sources, results):
+        if entry is None:
+            continue
+        new_entries[rel_path] = entry
+        stats["scanned" if rescanned else "reused"] += 1
+
+    stats["removed"] = len(set(old_entries) - set(new_entries))
+
+    new_filenames = sorted(known_filenames)
+    changed = new_entries != old_entries or new_filenames != index["filenames"]
+
+    revision = index.get("revision") if not changed else None
+    index = {"version": INDEX_VERSION, "mode": mode, "filenames": new_filenames, "files": new_entries}
+    index["revision"] = revision or index_revision(index)
+    if changed:
+        save_reference_index(assistant_dir, index)
+
+    if stamps is not None:
+        for rel_path, file_path, _ in documents:
+            entry = new_entries.get(rel_path)
+            if entry is not None and not is_pack_file(os.path.basename(file_path)):
+                # The stat data the entry was checked against, so a change made since is noticed
+                stamps[file_path] = (entry["size"], entry["mtime_ns"])
+            elif file_path not in stamps:
+                stamps[file_path] = _stamp(file_path)
+
+    return index, documents, stats, changed
+
+
+def index_is_current(index: ReferenceIndex, stamps: dict[str, tuple[int, int] | None]) -> bool:
+    """
+    Check whether an index is still in line with the files on disk, without walking or reading them.
+
+    Each directory and file recorded by update_reference_index() is stat'ed once: a document
+    added, removed or renamed changes the mtime of its directory, and a document modified in
+    place changes its own size or mtime.
+
+    Args:
+        index: The reference index.
+        stamps: The stamps recorded by update_reference_index() when it returned the index.
+
+    Returns:
+        True if nothing changed, so update_reference_index() would return the same index.
+    """
+    if index.get("mode", "substring") != REFERENCE_EXTRACTION_MODE:
+        return False
+
+    return all(_stamp(path) == stamp for path, stamp in stamps.items())
+
+
+def refresh_reference_index(assistant_dir: str) -> tuple[list[tuple[str, str]], dict[str, str], dict[str, int]]:
+    """
+    Bring the persisted reference index up to date and derive the reference edges from it.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        Tuple of (edges, file_to_dir_mapping, stats) where:
+        - edges: List of tuples representing edges (source_file, referenced_file)
+        - file_to_dir_mapping: Dict mapping filename to its directory type
+        - stats: Counts of 'scanned', 'reused' and 'removed' index entries
+    """
+    index, documents, stats, _ = update_reference_index(assistant_dir)
+    edges, file_to_dir = edges_from_index(index, documents)
+    return edges, file_to_dir, stats
+
+
+def walk_positions(documents: list[tuple[str, str, str]]) -> dict[str, int]:
+    """
+    Map each filename to the position of its first document in the walk.
+
+    Args:
+        documents: The walked document list from walk_document_files().
+
+    Returns:
+        Dict mapping filename to position.
+    """
+    order: dict[str, int] = {}
+    for position, (rel_path, _, _) in enumerate(documents):
+        order.setdefault(os.path.basename(rel_path), position)
+    return order
+
+
+def edges_from_index(index: ReferenceIndex, documents: list[tuple[str, str, str]]) -> tuple[list[tuple[str, str]], dict[str, str]]:
+    """
+    Derive reference edges from the index in a deterministic order.
+
+    Sources follow os.walk order and each source's targets follow the order in which
+    the target files appear in the walk, matching a full rescan of the tree. Link keys
+    of a "links" mode index are resolved against the walked documents.
+
+    Args:
+        index: The reference index.
+        documents: The walked document list from walk_document_files().
+
+    Returns:
+        Tuple of (edges, file_to_dir_mapping).
+    """
+    order = walk_positions(documents)
+
+    resolver = LinkResolver(order) if index.get("mode") == "links" else None
+
+    edges = []
+    file_to_dir = {}
+
+    for rel_path, _, dir_name in documents:
+        entry = index["files"].get(rel_path)
+        if entry is None:
+            continue
+
+        filename = os.path.basename(rel_path)
+        file_to_dir[filename] = dir_name
+
+        references = resolver.resolve(entry["references"]) if resolver else entry["references"]
+
+        for referenced_file in sorted(set(references), key=lambda name: order.get(name, len(order))):
+            if referenced_file != filename:
+                edges.append((filename, referenced_file))
+
+    return edges, file_to_dir
+
+
+def build_referrer_index(index: ReferenceIndex) -> dict[str, list[str]]:
+    """
+    Invert a "substring" mode index: map each mentioned filename to the documents mentioning it.
+
+    Args:
+        index: The reference index.
+
+    Returns:
+        Dict mapping filename to the relative paths of the documents whose content
+        mentions it, in index order. A document mentioning itself is included.
+    """
+    referrers: dict[str, list[str]] = {}
+
+    for rel_path, entry in index["files"].items():
+        for name in entry["references"]:
+            referrers.setdefault(name, []).append(rel_path)
+
+    return referrers
@@ -6,6 +6,9 @@ import re
 from config import BASE_NAME
 from response import GlyphMCPResponse
 from read_an_asset import read_asset
+from ._artifact_manifest import record_rewritten_artifact
+from ._document_registry import allocate_document_numbers, make_entry, record_documents
+from ._project_lock import project_lock, private_tmp_path
 
 
 def validate_absolute_path(abs_path: str, response: GlyphMCPResponse) -> bool:
@@ -101,16 +104,94 @@ def append_to_summary(summary_path: str, filename: str, short_desc: str) -> tupl
     else:
         return False, f"Warning: summary.md not found at {summary_path}"
 
+
+def append_entries_to_summary(summary_path: str, entries: list[tuple[str, str]]) -> tuple[bool, str]:
+    """
+    Append several entries to a _summary.md file in a single write.
+    
+    Args:
+        summary_path: Path to the _summary.md file.
+        entries: List of (filename, short_desc) tuples.
+    
+    Returns:
+        A tuple of (success: bool, message: str).
+    """
+    if os.path.exists(summary_path):
+        with open(summary_path, 'a', encoding='utf-8') as f:
+            f.write("".join(f"- `{filename}`: {short_desc}\n" for filename, short_desc in entries))
+        return True, f"Added {len(entries)} entr{'y' if len(entries) == 1 else 'ies'} to summary.md"
+    else:
+        return False, f"Warning: summary.md not found at {summary_path}"
+
+
+def write_file_if_changed(file_path: str, content: str) -> bool:
+    """
+    Replace a text file atomically, unless it already has exactly this content.
+    
+    Unchanged files are left untouched, so their mtime does not move and editors
+    and version control do not see a change.
+    
+    Args:
+        file_path: Path to the file to create/update.
+        content: The full new content.
+    
+    Returns:
+        True if the file was written, False if it was already up to date.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == content:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    
+    tmp_path = private_tmp_path(file_path)
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    os.replace(tmp_path, file_path)
+    return True
+
+
+def write_document(file_path: str, content: str) -> None:
+    """
+    Write the new content of an existing document.
+    
+    A document with other hardlinks (an artifact sharing a stored object, see
+    _object_store) is replaced by a new file rather than written through, so the
+    other links keep the original content. Rewritten artifacts are recorded in the
+    artifact manifest, so verification does not report them as modified.
+    
+    Args:
+        file_path: Path to the document.
+        content: The full new content.
+    """
+    if os.stat(file_path).st_nlink > 1:
+        tmp_path = private_tmp_path(file_path)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    else:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
+    record_rewritten_artifact(file_path)
+
+
 def add_document(
     abs_path: str,
     title: str,
     subdirectory: str,
     prefix: str,
     template_asset: str,
-    doc_type: str
+    doc_type: str,
+    short_desc: str
 ) -> GlyphMCPResponse[None]:
     """
-    Generic function to add a new document file.
+    Generic function to add a new document file and its summary entry.
+    
+    The number is reserved, the file written, the summary entry appended and the document
+    recorded in one hold of the project lock, so other sessions never see the document
+    half written or without its summary entry.
     
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located.
@@ -119,6 +200,7 @@ def add_document(
         prefix: The file prefix (e.g., 'op', 'dl').
         template_asset: The name of the template asset file.
         doc_type: The document type for messages (e.g., 'operation document', 'design log').
+        short_desc: A short description for the document, added to the directory's _summary.md.
     
     Returns:
         GlyphMCPResponse indicating success or failure.
@@ -137,25 +219,35 @@ def add_document(
             )
             return response
         
-        # Get the next document number
-        next_number = get_next_number(doc_dir, prefix)
+        assistant_dir = os.path.dirname(doc_dir)
         
         # Sanitize the title for use in filename
         sanitized_title = sanitize_title(title)
         
-        # Create the new filename
-        new_filename = f"{prefix}_{next_number}_{sanitized_title}.md"
-        new_filepath = os.path.join(doc_dir, new_filename)
-        
         # Read the template
         template_content = read_asset(template_asset)
         
-        # Write the new document file
-        with open(new_filepath, 'w', encoding='utf-8') as f:
-            f.write(template_content)
+        with project_lock(assistant_dir):
+            # Reserve the next document number; concurrent sessions get different ones
+            next_number = allocate_document_numbers(assistant_dir, prefix)
+            
+            # Create the new filename
+            new_filename = f"{prefix}_{next_number}_{sanitized_title}.md"
+            new_filepath = os.path.join(doc_dir, new_filename)
+            
+            # Write the new document file, never over an existing one
+            with open(new_filepath, 'x', encoding='utf-8') as f:
+                f.write(template_content)
+            
+            success, message = append_to_summary(os.path.join(doc_dir, "_summary.md"), new_filename, short_desc)
+            
+            record_documents(assistant_dir, prefix, {
+                next_number: make_entry(new_filename, description=short_desc if success else None)
+            })
         
         response.add_context(f"Created new {doc_type}: {new_filename}")
         response.add_context(f"It's advised to edit other documents you might want to reference this new doc, and vice versa, to ensure proper linking and context.")
+        response.add_context(message)
         response.success = True
         
     except Exception as e:
@@ -0,0 +1,363 @@
+"""
+Background file watcher that keeps a project's reference graph fresh.
+
+One daemon thread per project listens for changes under design_logs, operations and
+artifacts - through inotify on Linux, or by polling file stat data elsewhere - and
+refreshes the cached reference graph shortly after files change. While a watcher is
+running and has no unprocessed events, reference queries are served straight from
+memory and mutating tools do not rebuild the graph on the request path.
+"""
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from typing import Callable, Literal, TypedDict
+from ._reference_index import SCANNED_DIRS, walk_document_files
+from ._graph_cache import ReferenceGraph, refresh_reference_graph, set_reference_graph_trusted
+from ._project_lock import project_lock
+
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class WatcherStatus(TypedDict):
+    running: bool
+    backend: str
+    events_seen: int
+    refreshes: int
+    pending_events: int
+    last_event_age_seconds: float | None
+    last_refresh_age_seconds: float | None
+    last_lag_seconds: float | None
+    max_lag_seconds: float
+    last_error: str | None
+
+
+class _InotifyBackend:
+    """Waits for filesystem events using inotify watches on every scanned directory."""
+
+    name = "inotify"
+
+    def __init__(self, assistant_dir: str):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._watches: dict[int, str] = {}
+        for dir_name in SCANNED_DIRS:
+            directory = os.path.join(assistant_dir, dir_name)
+            for root, dirs, files in os.walk(directory):
+                self._add_watch(root)
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+
+    def wait(self, timeout: float) -> int:
+        """Block up to timeout seconds and return the number of relevant events received."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return 0
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return 0
+
+        events = 0
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + name_length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + name_length
+
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            # Start watching directories created after the watcher started (e.g. 'archived')
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO) and wd in self._watches:
+                self._add_watch(os.path.join(self._watches[wd], os.fsdecode(name)))
+
+            events += 1
+
+        return events
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Detects changes by comparing the size and mtime of every scanned file at a fixed interval."""
+
+    name = "polling"
+
+    def __init__(self, assistant_dir: str, poll_interval: float):
+        self._assistant_dir = assistant_dir
+        self._poll_interval = poll_interval
+        self._snapshot = self._take_snapshot()
+        self._next_poll_at = time.monotonic() + poll_interval
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for rel_path, file_path, _ in walk_document_files(self._assistant_dir):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[rel_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: float) -> int:
+        """Sleep up to timeout seconds; when a poll is due, return the number of files added, removed or modified."""
+        remaining = self._next_poll_at - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+            if time.monotonic() < self._next_poll_at:
+                return 0
+
+        self._next_poll_at = time.monotonic() + self._poll_interval
+        snapshot = self._take_snapshot()
+        previous = self._snapshot
+        self._snapshot = snapshot
+
+        return sum(1 for key in snapshot.keys() | previous.keys() if snapshot.get(key) != previous.get(key))
+
+    def close(self) -> None:
+        pass
+
+
+class ReferenceGraphWatcher(threading.Thread):
+    """Daemon thread that refreshes one project's reference graph when its documents change."""
+
+    def __init__(
+        self,
+        assistant_dir: str,
+        on_refresh: Callable[[ReferenceGraph], None],
+        backend: Literal["auto", "inotify", "polling"] = "auto",
+        poll_interval: float = 2.0,
+        debounce: float = 0.2,
+        max_delay: float = 2.0
+    ):
+        """
+        Create the watcher and its event backend. Call start() to begin watching.
+
+        Args:
+            assistant_dir: Path to the .assistant directory.
+            on_refresh: Called with the refreshed graph after every refresh (e.g. to rewrite the CSV).
+            backend: "inotify", "polling", or "auto" (inotify when available, polling otherwise).
+            poll_interval: Seconds between scans for the polling backend.
+            debounce: Seconds without new events to wait before refreshing, so bursts of writes
+                      cause a single refresh.
+            max_delay: Refresh at least this often while events keep arriving.
+        """
+        super().__init__(name=f"glyph-watcher:{assistant_dir}", daemon=True)
+        self.assistant_dir = assistant_dir
+        self._on_refresh = on_refresh
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._stop_event = threading.Event()
+        self._refresh_requested = threading.Event()
+        self._lock = threading.Lock()
+
+        if backend in ("auto", "inotify"):
+            try:
+                self._backend = _InotifyBackend(assistant_dir)
+            except (OSError, AttributeError):
+                if backend == "inotify":
+                    raise
+                self._backend = _PollingBackend(assistant_dir, poll_interval)
+        else:
+            self._backend = _PollingBackend(assistant_dir, poll_interval)
+
+        self._events_seen = 0
+        self._refreshes = 0
+        self._pending_events = 0
+        self._first_pending_at: float | None = None
+        self._last_event_at: float | None = None
+        self._last_refresh_at: float | None = None
+        self._last_lag: float | None = None
+        self._max_lag = 0.0
+        self._last_error: str | None = None
+
+    def request_refresh(self) -> None:
+        """Ask the watcher to refresh as soon as possible, e.g. after a tool changed documents."""
+        set_reference_graph_trusted(self.assistant_dir, False)
+        with self._lock:
+            self._pending_events += 1
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+        self._refresh_requested.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the watcher thread and release its backend."""
+        self._stop_event.set()
+        self._refresh_requested.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def status(self) -> WatcherStatus:
+        """Current counters and lag, as reported by the watcher status tool."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "running": self.is_alive() and not self._stop_event.is_set(),
+                "backend": self._backend.name,
+                "events_seen": self._events_seen,
+                "refreshes": self._refreshes,
+                "pending_events": self._pending_events,
+                "last_event_age_seconds": None if self._last_event_at is None else round(now - self._last_event_at, 3),
+                "last_refresh_age_seconds": None if self._last_refresh_at is None else round(now - self._last_refresh_at, 3),
+                "last_lag_seconds": None if self._last_lag is None else round(self._last_lag, 3),
+                "max_lag_seconds": round(self._max_lag, 3),
+                "last_error": self._last_error,
+            }
+
+    def _refresh(self) -> None:
+        try:
+            # Scan under the shared lock; the callback publishes under the outputs lock
+            with project_lock(self.assistant_dir, "read"):
+                graph, _ = refresh_reference_graph(self.assistant_dir, force=True)
+                self._on_refresh(graph)
+            error = None
+        except Exception as e:
+            error = str(e)
+
+        now = time.monotonic()
+        with self._lock:
+            if self._first_pending_at is not None:
+                self._last_lag = now - self._first_pending_at
+                self._max_lag = max(self._max_lag, self._last_lag)
+            self._first_pending_at = None
+            self._pending_events = 0
+            self._last_refresh_at = now
+            self._refreshes += 1
+            self._last_error = error
+
+        set_reference_graph_trusted(self.assistant_dir, error is None)
+
+    def run(self) -> None:
+        try:
+            self._refresh()
+
+            while not self._stop_event.is_set():
+                events = self._backend.wait(self._debounce)
+
+                if events:
+                    set_reference_graph_trusted(self.assistant_dir, False)
+                    now = time.monotonic()
+                    with self._lock:
+                        self._events_seen += events
+                        self._pending_events += events
+                        self._last_event_at = now
+                        if self._first_pending_at is None:
+                            self._first_pending_at = now
+                        overdue = now - self._first_pending_at >= self._max_delay
+                    if not overdue:
+                        continue
+
+                # Quiet for a debounce period (or asked explicitly): apply pending changes
+                if self._pending_events or self._refresh_requested.is_set():
+                    self._refresh_requested.clear()
+                    if not self._stop_event.is_set():
+                        self._refresh()
+        finally:
+            self._backend.close()
+            set_reference_graph_trusted(self.assistant_dir, False)
+
+
+_watchers: dict[str, ReferenceGraphWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def _watcher_key(assistant_dir: str) -> str:
+    return os.path.normcase(os.path.abspath(assistant_dir))
+
+
+def start_watcher(
+    assistant_dir: str,
+    on_refresh: Callable[[ReferenceGraph], None],
+    backend: Literal["auto", "inotify", "polling"] = "auto",
+    poll_interval: float = 2.0
+) -> tuple[ReferenceGraphWatcher, bool]:
+    """
+    Start watching a project, unless a watcher is already running for it.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        on_refresh: Called with the refreshed graph after every refresh.
+        backend: "inotify", "polling", or "auto".
+        poll_interval: Seconds between scans for the polling backend.
+
+    Returns:
+        Tuple of (watcher, started) where started is False if a watcher was already running.
+    """
+    key = _watcher_key(assistant_dir)
+
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher and watcher.is_alive():
+            return watcher, False
+
+        watcher = ReferenceGraphWatcher(assistant_dir, on_refresh, backend, poll_interval)
+        _watchers[key] = watcher
+        watcher.start()
+        return watcher, True
+
+
+def get_watcher(assistant_dir: str) -> ReferenceGraphWatcher | None:
+    """Return the running watcher of a project, if any."""
+    watcher = _watchers.get(_watcher_key(assistant_dir))
+    if watcher and watcher.is_alive():
+        return watcher
+    return None
+
+
+def stop_watcher(assistant_dir: str) -> bool:
+    """
+    Stop the watcher of a project.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+
+    Returns:
+        True if a running watcher was stopped, False if none was running.
+    """
+    with _watchers_lock:
+        watcher = _watchers.pop(_watcher_key(assistant_dir), None)
+
+    if watcher is None or not watcher.is_alive():
+        return False
+
+    watcher.stop()
+    return True
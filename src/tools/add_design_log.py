@@ -1,33 +1,6 @@
-import os
 from mcp_object import mcp
-from config import BASE_NAME
 from response import GlyphMCPResponse
-from ._utils import add_document, validate_absolute_path, append_to_summary
-
-
-def update_design_log_summary(response: GlyphMCPResponse[None], abs_path: str, title: str, short_desc: str) -> None:
-    """
-    Update the _summary.md file with the newly created design log entry.
-    
-    Args:
-        response: The response object from add_document.
-        abs_path: The absolute path of the project's root where the .assistant folder is located.
-        title: The title of the design log.
-        short_desc: A short description for the design log.
-    """
-    if not response.success:
-        return
-    
-    design_logs_dir = os.path.join(abs_path, BASE_NAME, "design_logs")
-    summary_path = os.path.join(design_logs_dir, "_summary.md")
-    
-    # Extract filename from the context message
-    for context in response.context:
-        if "Created new design log:" in context:
-            filename = context.split(": ")[1]
-            success, message = append_to_summary(summary_path, filename, short_desc)
-            response.add_context(message)
-            break
+from ._utils import add_document, validate_absolute_path
 
 
 @mcp.tool()
@@ -55,9 +28,8 @@ def add_design_log(abs_path: str, title: str, short_desc: str) -> GlyphMCPRespon
         subdirectory="design_logs",
         prefix="dl",
         template_asset="dl_template.md",
-        doc_type="design log"
+        doc_type="design log",
+        short_desc=short_desc
     )
     
-    update_design_log_summary(response, abs_path, title, short_desc)
-    
     return response
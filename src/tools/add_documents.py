@@ -0,0 +1,134 @@
+"""
+Batch creation of design logs and operations.
+
+Scaffolding a plan takes many documents. add_documents creates them in one call: numbers are
+reserved once per document type, each template is read once, and each summary gets a single
+append, all under one hold of the project lock.
+"""
+import os
+from mcp_object import mcp
+from config import BASE_NAME
+from response import GlyphMCPResponse
+from read_an_asset import read_asset
+from ._utils import validate_absolute_path, sanitize_title, append_entries_to_summary
+from ._project_lock import project_lock
+from ._document_registry import allocate_document_numbers, make_entry, record_documents
+from typing import List, Literal, TypedDict
+
+
+class NewDocument(TypedDict):
+    doc_type: Literal["design_log", "operation"]
+    title: str
+    short_desc: str
+
+
+# doc_type -> (directory, prefix, template asset, name used in messages)
+DOCUMENT_KINDS = {
+    "design_log": ("design_logs", "dl", "dl_template.md", "design log"),
+    "operation": ("operations", "op", "operation_doc_template.md", "operation document"),
+}
+
+
+@mcp.tool()
+def add_documents(abs_path: str, documents: List[NewDocument]) -> GlyphMCPResponse[List[str]]:
+    """
+    Add many design log and operation documents at once, e.g. to scaffold a multi-step plan.
+
+    Produces the same files and summary entries as calling add_design_log and add_operation
+    for each document in order, but numbers are allocated once per document type, each template
+    is read once, and each _summary.md is appended to in a single write.
+
+    Prerequisite: Read the design log and operation rules.
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        documents: List of objects with `doc_type` ("design_log" or "operation"), `title` and `short_desc`.
+                   Each file is named dl_{number}_{title}.md or op_{number}_{title}.md, numbered in list order,
+                   and its short_desc is added to the summary.
+
+    Returns:
+        GlyphMCPResponse indicating success or failure, with the created filenames in the order of documents.
+    """
+    response = GlyphMCPResponse[List[str]]()
+
+    if not validate_absolute_path(abs_path, response):
+        return response
+
+    if not documents:
+        response.add_context("No documents specified to add.")
+        return response
+
+    # Validate every entry before creating anything
+    for index, document in enumerate(documents, start=1):
+        if document.get("doc_type") not in DOCUMENT_KINDS:
+            response.add_context(f"Invalid doc_type at index {index}: {document.get('doc_type')}. Must be 'design_log' or 'operation'.")
+            return response
+        if not document.get("title", "").strip():
+            response.add_context(f"Missing title at index {index}.")
+            return response
+        if not document.get("short_desc", "").strip():
+            response.add_context(f"Missing short_desc at index {index}.")
+            return response
+
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+        doc_types = list(dict.fromkeys(document["doc_type"] for document in documents))
+
+        for doc_type in doc_types:
+            doc_dir = os.path.join(assistant_dir, DOCUMENT_KINDS[doc_type][0])
+            if not os.path.exists(doc_dir):
+                response.add_context(
+                    f"{DOCUMENT_KINDS[doc_type][0].replace('_', ' ').title()} directory not found at {doc_dir}. "
+                    "Please initialize the assistant directory first."
+                )
+                return response
+
+        templates = {doc_type: read_asset(DOCUMENT_KINDS[doc_type][2]) for doc_type in doc_types}
+        created: list[str] = []
+
+        with project_lock(assistant_dir):
+            # One contiguous block of numbers per document type, assigned in list order
+            next_numbers = {
+                doc_type: allocate_document_numbers(
+                    assistant_dir,
+                    DOCUMENT_KINDS[doc_type][1],
+                    sum(1 for document in documents if document["doc_type"] == doc_type)
+                )
+                for doc_type in doc_types
+            }
+            entries: dict[str, dict[int, tuple[str, str]]] = {doc_type: {} for doc_type in doc_types}
+
+            for document in documents:
+                doc_type = document["doc_type"]
+                dir_name, prefix, _, kind = DOCUMENT_KINDS[doc_type]
+                number = next_numbers[doc_type]
+                next_numbers[doc_type] += 1
+
+                filename = f"{prefix}_{number}_{sanitize_title(document['title'])}.md"
+                with open(os.path.join(assistant_dir, dir_name, filename), 'x', encoding='utf-8') as f:
+                    f.write(templates[doc_type])
+
+                entries[doc_type][number] = (filename, document["short_desc"])
+                created.append(filename)
+                response.add_context(f"Created new {kind}: {filename}")
+
+            # One summary append per directory
+            for doc_type in doc_types:
+                dir_name, prefix, _, _ = DOCUMENT_KINDS[doc_type]
+                summary_path = os.path.join(assistant_dir, dir_name, "_summary.md")
+                success, message = append_entries_to_summary(summary_path, list(entries[doc_type].values()))
+                response.add_context(f"{dir_name}: {message}")
+
+                record_documents(assistant_dir, prefix, {
+                    number: make_entry(filename, description=short_desc if success else None)
+                    for number, (filename, short_desc) in entries[doc_type].items()
+                })
+
+        response.result = created
+        response.add_context("It's advised to edit other documents you might want to reference these new docs, and vice versa, to ensure proper linking and context.")
+        response.success = True
+
+    except Exception as e:
+        response.add_context(f"Failed to add documents: {str(e)}")
+
+    return response
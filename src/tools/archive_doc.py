@@ -2,11 +2,37 @@ import os
 import shutil
 import re
 from mcp_object import mcp
-from config import BASE_NAME
+from config import BASE_NAME, ARCHIVE_STORAGE
 from response import GlyphMCPResponse
-from ._utils import validate_absolute_path, append_to_summary
-from .reference_graph import update_reference_graph
-from typing import Literal, Optional
+from ._utils import validate_absolute_path, append_to_summary, write_document
+from .reference_graph import request_reference_graph_update
+from ._reference_index import walk_document_files
+from ._graph_cache import find_referrers
+from ._archive_pack import PACK_FILENAME, pack_documents, extract_packed_document
+from ._project_lock import project_lock
+from ._document_registry import (
+    DOCUMENT_TYPES, document_number, document_path, list_registered_documents, lookup_document,
+    make_entry, record_documents, summary_descriptions
+)
+from typing import List, Literal, Optional, NotRequired, TypedDict
+
+
+# A reference ends at whitespace or at punctuation that separates references in a text, so
+# references joined without whitespace ("dl_1_a.md,op_2_b.md") are matched one by one
+_REFERENCE_CHAR = r'[^\s\)\],;|"\'<>]'
+
+# References to sibling documents: design logs and operations by .md filename, artifacts by any name
+_DOCUMENT_REFERENCE = rf'(?:dl|op)_\d+_{_REFERENCE_CHAR}+\.md'
+_ARTIFACT_REFERENCE = rf'art_\d+_{_REFERENCE_CHAR}+'
+
+# Sibling references not yet pointing one directory up (artifacts already under archived/ are left alone).
+# The leading lookahead rejects most positions before the lookbehinds are evaluated.
+_ARCHIVED_SIBLING_PATTERN = re.compile(
+    rf'(?=[doa])(?<!\.\./)(?:{_DOCUMENT_REFERENCE}|(?<!archived/){_ARTIFACT_REFERENCE})'
+)
+
+# Sibling references pointing one directory up
+_UNARCHIVED_SIBLING_PATTERN = re.compile(rf'\.\./({_DOCUMENT_REFERENCE}|{_ARTIFACT_REFERENCE})')
 
 
 def find_document_by_number(directory: str, prefix: str, number: int) -> tuple[str, str] | None:
@@ -14,7 +40,7 @@ def find_document_by_number(directory: str, prefix: str, number: int) -> tuple[s
     Find a document file by its type and number.
     
     Args:
-        directory: Path to the directory to search in.
+        directory: Path to the document type's directory in the .assistant folder.
         prefix: The file prefix (e.g., 'dl', 'op', 'art').
         number: The document number to find.
     
@@ -24,13 +50,12 @@ def find_document_by_number(directory: str, prefix: str, number: int) -> tuple[s
     if not os.path.exists(directory):
         return None
     
-    pattern = re.compile(rf'^{prefix}_{number}_.*')
-    
-    for filename in os.listdir(directory):
-        if pattern.match(filename) and os.path.isfile(os.path.join(directory, filename)):
-            return filename, os.path.join(directory, filename)
+    assistant_dir = os.path.dirname(directory)
+    entry = lookup_document(assistant_dir, prefix, number)
+    if entry is None or entry["archived"]:
+        return None
     
-    return None
+    return entry["filename"], document_path(assistant_dir, prefix, entry)
 
 
 def move_to_archive(source_path: str, archive_dir: str, filename: str) -> str:
@@ -51,16 +76,116 @@ def move_to_archive(source_path: str, archive_dir: str, filename: str) -> str:
     return destination_path
 
 
-def fix_references_to_archived_file(assistant_dir: str, filename: str) -> dict[str, int]:
+def find_reference_candidates(assistant_dir: str, filenames: list[str]) -> list[str]:
+    """
+    List the files that may mention any of the given filenames.
+    
+    Uses the reverse reference index, so only documents known to mention one of the
+    filenames are returned, together with the files the index does not cover
+    (summaries, unreadable or partially scanned files). Without a usable index
+    ("links" extraction mode), every file is returned.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        filenames: Filenames of documents of the project.
+    
+    Returns:
+        List of file paths across design_logs, operations, and artifacts, in directory walk order.
+    """
+    try:
+        lookup = find_referrers(assistant_dir, filenames)
+    except OSError:
+        lookup = None
+    
+    documents = walk_document_files(assistant_dir, include_packed=False)
+    
+    if lookup is None:
+        return [file_path for _, file_path, _ in documents]
+    
+    referrers, indexed = lookup
+    return [
+        file_path for rel_path, file_path, _ in documents
+        if rel_path in referrers or rel_path not in indexed
+    ]
+
+
+def find_missed_referrers(assistant_dir: str, texts: list[str], candidates: list[str]) -> list[str]:
+    """
+    Verify reference candidates against a full scan of the documents.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        texts: The strings whose occurrences are going to be rewritten.
+        candidates: File paths from find_reference_candidates().
+    
+    Returns:
+        Paths of the files that contain any of the texts but are not among the candidates.
+    """
+    candidate_set = set(candidates)
+    missed = []
+    
+    for _, file_path, _ in walk_document_files(assistant_dir, include_packed=False):
+        if file_path in candidate_set:
+            continue
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception:
+            continue
+        
+        if any(text in content for text in texts):
+            missed.append(file_path)
+    
+    return missed
+
+
+def gather_referencing_files(
+    assistant_dir: str,
+    filenames: list[str],
+    texts: list[str],
+    verify: bool,
+    response: GlyphMCPResponse
+) -> list[str]:
+    """
+    Find the files whose references to moved documents need rewriting, optionally verifying the index.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        filenames: Filenames of the moved documents.
+        texts: The strings whose occurrences are going to be rewritten.
+        verify: If True, also scan every file and add (and report) any the index missed.
+        response: Response object to add context messages to.
+    
+    Returns:
+        List of file paths to rewrite.
+    """
+    candidates = find_reference_candidates(assistant_dir, filenames)
+    
+    if verify:
+        missed = find_missed_referrers(assistant_dir, texts, candidates)
+        if missed:
+            response.add_context(f"Warning: Reference index missed {len(missed)} referencing file(s); they are updated as well:")
+            for file_path in missed:
+                response.add_context(f"  - {os.path.relpath(file_path, os.path.dirname(assistant_dir))}")
+            candidates.extend(missed)
+        else:
+            response.add_context("Reference index verified against a full scan: no referencing files missed")
+    
+    return candidates
+
+
+def fix_references_to_archived_file(assistant_dir: str, filename: str, file_paths: list[str] | None = None) -> dict[str, int]:
     """
     Update all references to point to the archived file location.
     
-    This updates references from 'filename' to 'archived/filename' in all files
-    across design_logs, operations, and artifacts directories.
+    This updates references from 'filename' to 'archived/filename' in the files that
+    mention it, found through the reverse reference index.
     
     Args:
         assistant_dir: Path to the .assistant directory.
         filename: The filename that was archived.
+        file_paths: Files to update. Default: find_reference_candidates() for the filename.
     
     Returns:
         Dictionary mapping file paths to number of replacements made.
@@ -68,57 +193,47 @@ def fix_references_to_archived_file(assistant_dir: str, filename: str) -> dict[s
     replacements = {}
     archived_reference = f"archived/{filename}"
     
-    for dir_name in ["design_logs", "operations", "artifacts"]:
-        dir_path = os.path.join(assistant_dir, dir_name)
-        
-        if not os.path.exists(dir_path):
+    if file_paths is None:
+        file_paths = find_reference_candidates(assistant_dir, [filename])
+    
+    for file_path in file_paths:
+        # Skip the archived file itself
+        if os.path.basename(file_path) == filename and "archived" in os.path.dirname(file_path):
             continue
         
-        for root, dirs, files in os.walk(dir_path):
-            for file in files:
-                # Skip the archived file itself
-                if file == filename and "archived" in root:
-                    continue
-                    
-                file_path = os.path.join(root, file)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            # Count and replace references
+            # We need to be careful not to replace if it's already archived/filename
+            # Use regex to match filename but not archived/filename
+            pattern = rf'(?<!archived/){re.escape(filename)}'
+            matches = re.findall(pattern, content)
+            count = len(matches)
+            
+            if count > 0:
+                new_content = re.sub(pattern, archived_reference, content)
                 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Count and replace references
-                    # We need to be careful not to replace if it's already archived/filename
-                    # Use regex to match filename but not archived/filename
-                    pattern = rf'(?<!archived/){re.escape(filename)}'
-                    matches = re.findall(pattern, content)
-                    count = len(matches)
-                    
-                    if count > 0:
-                        new_content = re.sub(pattern, archived_reference, content)
-                        
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(new_content)
-                        
-                        replacements[file_path] = count
-                        
-                except Exception:
-                    # Silently skip files that can't be read/written
-                    pass
+                write_document(file_path, new_content)
+                
+                replacements[file_path] = count
+                
+        except Exception:
+            # Silently skip files that can't be read/written
+            pass
     
     return replacements
 
 
-def fix_references_within_archived_file(file_path: str) -> int:
+def rewrite_sibling_references(file_path: str, pattern: re.Pattern, replacement: str) -> int:
     """
-    Update references within the archived file to account for its new location.
-    
-    When a file moves from 'docs/' to 'docs/archived/', we need to update
-    any references it makes to sibling files. For example:
-    - 'op_1_foo.md' -> '../op_1_foo.md'
-    - 'dl_5_bar.md' -> '../dl_5_bar.md'
+    Rewrite the sibling references within a moved file in a single pass.
     
     Args:
-        file_path: Path to the archived file.
+        file_path: Path to the moved file.
+        pattern: Precompiled pattern matching the references to rewrite.
+        replacement: Replacement template, as for re.subn().
     
     Returns:
         Number of replacements made.
@@ -127,26 +242,10 @@ def fix_references_within_archived_file(file_path: str) -> int:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Patterns for document references that need updating
-        # Match patterns like: dl_1_*, op_2_*, art_3_*
-        patterns = [
-            (r'(?<!\.\./)(dl_\d+_[^\s\)]+\.md)', r'../\1'),  # design logs
-            (r'(?<!\.\./)(op_\d+_[^\s\)]+\.md)', r'../\1'),  # operations
-            (r'(?<!\.\./)(?<!archived/)(art_\d+_[^\s\)]+)', r'../\1'),  # artifacts
-        ]
-        
-        new_content = content
-        total_replacements = 0
-        
-        for pattern, replacement in patterns:
-            matches = re.findall(pattern, new_content)
-            if matches:
-                new_content = re.sub(pattern, replacement, new_content)
-                total_replacements += len(matches)
+        new_content, total_replacements = pattern.subn(replacement, content)
         
         if total_replacements > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            write_document(file_path, new_content)
         
         return total_replacements
         
@@ -154,6 +253,24 @@ def fix_references_within_archived_file(file_path: str) -> int:
         return 0
 
 
+def fix_references_within_archived_file(file_path: str) -> int:
+    """
+    Update references within the archived file to account for its new location.
+    
+    When a file moves from 'docs/' to 'docs/archived/', we need to update
+    any references it makes to sibling files. For example:
+    - 'op_1_foo.md' -> '../op_1_foo.md'
+    - 'dl_5_bar.md' -> '../dl_5_bar.md'
+    
+    Args:
+        file_path: Path to the archived file.
+    
+    Returns:
+        Number of replacements made.
+    """
+    return rewrite_sibling_references(file_path, _ARCHIVED_SIBLING_PATTERN, r'../\g<0>')
+
+
 def remove_from_summary(summary_path: str, filename: str) -> bool:
     """
     Remove an entry from the _summary.md file.
@@ -162,6 +279,20 @@ def remove_from_summary(summary_path: str, filename: str) -> bool:
         summary_path: Path to the _summary.md file.
         filename: The filename to remove from the summary.
     
+    Returns:
+        True if successful, False otherwise.
+    """
+    return remove_entries_from_summary(summary_path, [filename])
+
+
+def remove_entries_from_summary(summary_path: str, filenames: list[str]) -> bool:
+    """
+    Remove the entries of several files from the _summary.md file in one rewrite.
+    
+    Args:
+        summary_path: Path to the _summary.md file.
+        filenames: The filenames to remove from the summary.
+    
     Returns:
         True if successful, False otherwise.
     """
@@ -172,8 +303,9 @@ def remove_from_summary(summary_path: str, filename: str) -> bool:
         with open(summary_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
         
-        # Filter out the line containing this filename
-        new_lines = [line for line in lines if f"`{filename}`" not in line]
+        # Filter out the lines containing any of these filenames
+        entries = [f"`{filename}`" for filename in filenames]
+        new_lines = [line for line in lines if not any(entry in line for entry in entries)]
         
         with open(summary_path, 'w', encoding='utf-8') as f:
             f.writelines(new_lines)
@@ -187,7 +319,8 @@ def remove_from_summary(summary_path: str, filename: str) -> bool:
 def archive_document(
     abs_path: str,
     doc_type: Literal["operation", "artifact", "design_log"],
-    number: int
+    number: int,
+    verify_references: bool = False
 ) -> GlyphMCPResponse[None]:
     """
     Archive a document by moving it to the archived subdirectory and updating all references.
@@ -197,13 +330,16 @@ def archive_document(
     2. Moves it to the 'archived' subdirectory within its document type folder
     3. Updates all references TO the archived file (from other docs)
     4. Updates references WITHIN the archived file (adjusts relative paths)
-    5. Removes the entry from the _summary.md file
-    6. Updates the reference graph
+    5. With packed archive storage, moves it into the archive pack
+    6. Removes the entry from the _summary.md file
+    7. Updates the reference graph
     
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
         doc_type: Type of document to archive - "operation", "artifact", or "design_log".
         number: The document number to archive (e.g., 1 for dl_1_*, 2 for op_2_*).
+        verify_references: If True, also scan every document to check that the reference index found all files
+                           referencing the document; any it missed are reported and updated as well.
     
     Returns:
         GlyphMCPResponse indicating success or failure with detailed context.
@@ -235,76 +371,379 @@ def archive_document(
             response.add_context(f"Directory not found: {doc_dir}. Please initialize the assistant directory first.")
             return response
         
-        # Find the document
-        result = find_document_by_number(doc_dir, prefix, number)
-        if result is None:
-            response.add_context(f"Document not found: {prefix}_{number}_* in {doc_dir}")
-            return response
+        # Other sessions do not change documents while this one is moved and its references rewritten
+        with project_lock(assistant_dir):
+            # Find the document
+            result = find_document_by_number(doc_dir, prefix, number)
+            if result is None:
+                response.add_context(f"Document not found: {prefix}_{number}_* in {doc_dir}")
+                return response
+            
+            filename, filepath = result
+            response.add_context(f"Found document: {filename}")
+            
+            # Move to archive
+            new_path = move_to_archive(filepath, archive_dir, filename)
+            response.add_context(f"Moved to archive: {new_path}")
+            
+            # Update references TO this file from other documents
+            file_paths = gather_referencing_files(assistant_dir, [filename], [filename], verify_references, response)
+            replacements = fix_references_to_archived_file(assistant_dir, filename, file_paths)
+            
+            if replacements:
+                response.add_context(f"Updated references to '{filename}' -> 'archived/{filename}':")
+                for ref_file, count in replacements.items():
+                    rel_path = os.path.relpath(ref_file, abs_path)
+                    response.add_context(f"  - {rel_path}: {count} replacement(s)")
+            else:
+                response.add_context(f"No references to '{filename}' found in other documents")
+            
+            # Update references WITHIN the archived file
+            internal_replacements = fix_references_within_archived_file(new_path)
+            if internal_replacements > 0:
+                response.add_context(f"Updated {internal_replacements} internal reference(s) within the archived file")
+            
+            # Move into the archive pack if configured
+            packed = ARCHIVE_STORAGE == "packed" and bool(pack_documents(archive_dir, [new_path]))
+            if packed:
+                response.add_context(f"Packed into {dir_name}/archived/{PACK_FILENAME}")
+            
+            # Remove from summary
+            summary_path = os.path.join(doc_dir, "_summary.md")
+            if remove_from_summary(summary_path, filename):
+                response.add_context(f"Removed entry from {dir_name}/_summary.md")
+            
+            record_documents(assistant_dir, prefix, {number: make_entry(filename, archived=True, packed=packed)})
+        
+        # Update reference graph
+        update_response = request_reference_graph_update(abs_path)
+        if not update_response.success:
+            response.add_context("Warning: Failed to update reference graph after archiving")
+            response.add_context(update_response.context)
+        else:
+            response.add_context(update_response.context[0])
+        
+        response.success = True
+        response.add_context(f"Successfully archived {doc_type} #{number}")
+        
+    except Exception as e:
+        response.add_context(f"Failed to archive document: {str(e)}")
+    
+    return response
+
+
+class ArchiveSelection(TypedDict):
+    doc_type: Literal["operation", "artifact", "design_log"]
+    numbers: NotRequired[List[int]]
+    first: NotRequired[int]
+    last: NotRequired[int]
+
+
+def list_documents_by_number(directory: str, prefix: str) -> dict[int, tuple[str, str]]:
+    """
+    List the numbered documents of a directory.
+    
+    Args:
+        directory: Path to the document type's directory in the .assistant folder.
+        prefix: The file prefix (e.g., 'dl', 'op', 'art').
+    
+    Returns:
+        Dictionary mapping each document number to its (filename, filepath).
+    """
+    if not os.path.exists(directory):
+        return {}
+    
+    assistant_dir = os.path.dirname(directory)
+    return {
+        number: (entry["filename"], document_path(assistant_dir, prefix, entry))
+        for number, entry in list_registered_documents(assistant_dir, prefix).items()
+    }
+
+
+def fix_references_to_archived_files(assistant_dir: str, filenames: list[str], file_paths: list[str] | None = None) -> dict[str, int]:
+    """
+    Update all references to several archived files in a single pass over the documents.
+    
+    Equivalent to calling fix_references_to_archived_file() once per filename, but every
+    file is read, matched against one combined pattern and written at most once.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        filenames: The filenames that were archived.
+        file_paths: Files to update. Default: find_reference_candidates() for the filenames.
+    
+    Returns:
+        Dictionary mapping file paths to number of replacements made.
+    """
+    replacements = {}
+    archived = set(filenames)
+    
+    # Longest names first, so a name that is a prefix of another never wins the alternation
+    alternatives = "|".join(re.escape(name) for name in sorted(archived, key=len, reverse=True))
+    pattern = re.compile(rf'(?<!archived/)(?:{alternatives})')
+    
+    if file_paths is None:
+        file_paths = find_reference_candidates(assistant_dir, filenames)
+    
+    for file_path in file_paths:
+        # An archived file keeps the references to itself
+        file = os.path.basename(file_path)
+        own_name = file if file in archived and "archived" in os.path.dirname(file_path) else None
+        count = 0
+        
+        def replace(match: re.Match) -> str:
+            nonlocal count
+            if match.group(0) == own_name:
+                return match.group(0)
+            count += 1
+            return f"archived/{match.group(0)}"
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            new_content = pattern.sub(replace, content)
+            
+            if count > 0:
+                write_document(file_path, new_content)
+                
+                replacements[file_path] = count
+                
+        except Exception:
+            # Silently skip files that can't be read/written
+            pass
+    
+    return replacements
+
+
+def resolve_archive_selections(
+    assistant_dir: str,
+    selections: List[ArchiveSelection],
+    response: GlyphMCPResponse
+) -> list[tuple[str, str, str, str]] | None:
+    """
+    Validate archive selections and resolve them to existing documents.
+    
+    Numbers listed explicitly but not found are reported and skipped; a first/last range
+    selects whichever documents exist within it.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        selections: The selections passed to archive_documents().
+        response: Response object to add context messages to.
+    
+    Returns:
+        List of (doc_type, dir_name, filename, filepath) in selection order, or None if
+        a selection is invalid.
+    """
+    type_mapping = {
+        "design_log": ("design_logs", "dl"),
+        "operation": ("operations", "op"),
+        "artifact": ("artifacts", "art")
+    }
+    
+    if not selections:
+        response.add_context("No documents specified to archive.")
+        return None
+    
+    listings: dict[str, dict[int, tuple[str, str]]] = {}
+    documents: dict[str, tuple[str, str, str, str]] = {}
+    
+    for index, selection in enumerate(selections, start=1):
+        doc_type = selection.get("doc_type")
+        if doc_type not in type_mapping:
+            response.add_context(f"Invalid doc_type at index {index}: {doc_type}. Must be 'operation', 'artifact', or 'design_log'.")
+            return None
         
-        filename, filepath = result
-        response.add_context(f"Found document: {filename}")
+        numbers = selection.get("numbers") or []
+        first = selection.get("first")
+        last = selection.get("last")
         
-        # Move to archive
-        new_path = move_to_archive(filepath, archive_dir, filename)
-        response.add_context(f"Moved to archive: {new_path}")
+        if (first is None) != (last is None):
+            response.add_context(f"Invalid selection at index {index}: 'first' and 'last' must be given together.")
+            return None
         
-        # Update references TO this file from other documents
-        replacements = fix_references_to_archived_file(assistant_dir, filename)
+        if first is not None and first > last:
+            response.add_context(f"Invalid selection at index {index}: 'first' ({first}) is greater than 'last' ({last}).")
+            return None
         
-        if replacements:
-            response.add_context(f"Updated references to '{filename}' -> 'archived/{filename}':")
-            for ref_file, count in replacements.items():
-                rel_path = os.path.relpath(ref_file, abs_path)
-                response.add_context(f"  - {rel_path}: {count} replacement(s)")
-        else:
-            response.add_context(f"No references to '{filename}' found in other documents")
+        if not numbers and first is None:
+            response.add_context(f"Invalid selection at index {index}: provide 'numbers' or a 'first'/'last' range.")
+            return None
+        
+        dir_name, prefix = type_mapping[doc_type]
+        doc_dir = os.path.join(assistant_dir, dir_name)
+        
+        if not os.path.exists(doc_dir):
+            response.add_context(f"Directory not found: {doc_dir}. Please initialize the assistant directory first.")
+            return None
+        
+        if dir_name not in listings:
+            listings[dir_name] = list_documents_by_number(doc_dir, prefix)
+        listing = listings[dir_name]
+        
+        selected = list(numbers)
+        if first is not None:
+            selected.extend(number for number in sorted(listing) if first <= number <= last)
+        
+        for number in selected:
+            if number not in listing:
+                response.add_context(f"Warning: Document not found: {prefix}_{number}_* in {doc_dir}. Skipping.")
+                continue
+            
+            filename, filepath = listing[number]
+            documents.setdefault(filepath, (doc_type, dir_name, filename, filepath))
+    
+    return list(documents.values())
+
+
+@mcp.tool()
+def archive_documents(
+    abs_path: str,
+    selections: List[ArchiveSelection],
+    verify_references: bool = False
+) -> GlyphMCPResponse[List[str]]:
+    """
+    Archive many documents at once, updating references, summaries and the reference graph a single time.
+    
+    Produces the same layout as calling archive_document for each document, but every
+    document in the project is rewritten at most once, each _summary.md is rewritten once
+    and the reference graph is updated once at the end.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        selections: List of objects with a `doc_type` ("operation", "artifact" or "design_log") and either
+                    `numbers` (a list of document numbers), an inclusive `first`/`last` number range, or both.
+                    Document types can be mixed freely.
+        verify_references: If True, also scan every document to check that the reference index found all files
+                           referencing the documents; any it missed are reported and updated as well.
+    
+    Returns:
+        GlyphMCPResponse indicating success or failure, with the archived filenames.
+    """
+    response = GlyphMCPResponse[List[str]]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
         
-        # Update references WITHIN the archived file
-        internal_replacements = fix_references_within_archived_file(new_path)
-        if internal_replacements > 0:
-            response.add_context(f"Updated {internal_replacements} internal reference(s) within the archived file")
+        documents = resolve_archive_selections(assistant_dir, selections, response)
+        if documents is None:
+            return response
+        
+        if not documents:
+            response.add_context("No matching documents found to archive.")
+            return response
         
-        # Remove from summary
-        summary_path = os.path.join(doc_dir, "_summary.md")
-        if remove_from_summary(summary_path, filename):
-            response.add_context(f"Removed entry from {dir_name}/_summary.md")
+        # Other sessions do not change documents while these are moved and their references rewritten
+        with project_lock(assistant_dir):
+            # Move every document and adjust the references it makes, before any reference
+            # to it is rewritten, so the result does not depend on the order of the selection
+            archived: dict[str, list[str]] = {}
+            internal_replacements = 0
+            
+            for doc_type, dir_name, filename, filepath in documents:
+                archive_dir = os.path.join(assistant_dir, dir_name, "archived")
+                try:
+                    new_path = move_to_archive(filepath, archive_dir, filename)
+                except Exception as e:
+                    response.add_context(f"Warning: Failed to move {filename} to archive: {str(e)}")
+                    continue
+                
+                response.add_context(f"Moved to archive: {os.path.relpath(new_path, abs_path)}")
+                internal_replacements += fix_references_within_archived_file(new_path)
+                archived.setdefault(dir_name, []).append(filename)
+            
+            filenames = [filename for names in archived.values() for filename in names]
+            if not filenames:
+                response.add_context("No documents were archived.")
+                return response
+            
+            if internal_replacements > 0:
+                response.add_context(f"Updated {internal_replacements} internal reference(s) within the archived files")
+            
+            # Update references TO the archived files from every document, in one pass
+            file_paths = gather_referencing_files(assistant_dir, filenames, filenames, verify_references, response)
+            replacements = fix_references_to_archived_files(assistant_dir, filenames, file_paths)
+            
+            if replacements:
+                response.add_context(f"Updated references to {len(filenames)} archived file(s):")
+                for ref_file, count in replacements.items():
+                    rel_path = os.path.relpath(ref_file, abs_path)
+                    response.add_context(f"  - {rel_path}: {count} replacement(s)")
+            else:
+                response.add_context("No references to the archived files found in other documents")
+            
+            # Move into the archive packs if configured, one append per directory
+            packed: set[str] = set()
+            if ARCHIVE_STORAGE == "packed":
+                for dir_name, names in archived.items():
+                    archive_dir = os.path.join(assistant_dir, dir_name, "archived")
+                    packed_names = pack_documents(archive_dir, [os.path.join(archive_dir, name) for name in names])
+                    if packed_names:
+                        response.add_context(f"Packed {len(packed_names)} document(s) into {dir_name}/archived/{PACK_FILENAME}")
+                    packed.update(packed_names)
+            
+            # Remove from summaries, one rewrite per directory
+            for dir_name, names in archived.items():
+                summary_path = os.path.join(assistant_dir, dir_name, "_summary.md")
+                if remove_entries_from_summary(summary_path, names):
+                    response.add_context(f"Removed {len(names)} entr{'y' if len(names) == 1 else 'ies'} from {dir_name}/_summary.md")
+            
+            prefixes = {dir_name: prefix for prefix, (dir_name, _) in DOCUMENT_TYPES.items()}
+            for dir_name, names in archived.items():
+                record_documents(assistant_dir, prefixes[dir_name], {
+                    document_number(name): make_entry(name, archived=True, packed=name in packed) for name in names
+                })
         
         # Update reference graph
-        update_response = update_reference_graph(abs_path)
+        update_response = request_reference_graph_update(abs_path)
         if not update_response.success:
             response.add_context("Warning: Failed to update reference graph after archiving")
             response.add_context(update_response.context)
         else:
-            response.add_context("Reference graph updated successfully")
+            response.add_context(update_response.context[0])
         
+        response.result = filenames
         response.success = True
-        response.add_context(f"Successfully archived {doc_type} #{number}")
+        response.add_context(f"Successfully archived {len(filenames)} document(s)")
         
     except Exception as e:
-        response.add_context(f"Failed to archive document: {str(e)}")
+        response.add_context(f"Failed to archive documents: {str(e)}")
     
     return response
 
 
 def find_archived_document_by_number(archive_dir: str, prefix: str, number: int) -> tuple[str, str] | None:
     """
-    Find an archived document file by its type and number.
+    Find a loose archived document file by its type and number.
     
     Args:
-        archive_dir: Path to the archived directory to search in.
+        archive_dir: Path to the archived directory of a document type's directory.
         prefix: The file prefix (e.g., 'dl', 'op', 'art').
         number: The document number to find.
     
     Returns:
-        A tuple of (filename, filepath) if found, None otherwise.
+        A tuple of (filename, filepath) if found, None otherwise (including when the document
+        is in the archive pack).
     """
     if not os.path.exists(archive_dir):
         return None
     
-    pattern = re.compile(rf'^{prefix}_{number}_.*')
+    assistant_dir = os.path.dirname(os.path.dirname(archive_dir))
+    entry = lookup_document(assistant_dir, prefix, number)
+    if entry is None or entry["packed"]:
+        return None
     
+    if entry["archived"]:
+        return entry["filename"], document_path(assistant_dir, prefix, entry)
+    
+    # The registry lists an active document under this number; an archived copy
+    # with the same number can only be found by looking
     for filename in os.listdir(archive_dir):
-        if pattern.match(filename) and os.path.isfile(os.path.join(archive_dir, filename)):
+        if document_number(filename) == number and filename.startswith(f"{prefix}_") and os.path.isfile(os.path.join(archive_dir, filename)):
             return filename, os.path.join(archive_dir, filename)
     
     return None
@@ -327,13 +766,14 @@ def move_from_archive(source_path: str, destination_dir: str, filename: str) ->
     return destination_path
 
 
-def fix_references_from_archived_file(assistant_dir: str, filename: str) -> dict[str, int]:
+def fix_references_from_archived_file(assistant_dir: str, filename: str, file_paths: list[str] | None = None) -> dict[str, int]:
     """
-    Update all references from 'archived/filename' back to just 'filename' in all files.
+    Update all references from 'archived/filename' back to just 'filename' in the files that mention it.
     
     Args:
         assistant_dir: Path to the .assistant directory.
         filename: The filename that is being unarchived.
+        file_paths: Files to update. Default: find_reference_candidates() for the filename.
     
     Returns:
         Dictionary mapping file paths to number of replacements made.
@@ -341,34 +781,27 @@ def fix_references_from_archived_file(assistant_dir: str, filename: str) -> dict
     replacements = {}
     archived_reference = f"archived/{filename}"
     
-    for dir_name in ["design_logs", "operations", "artifacts"]:
-        dir_path = os.path.join(assistant_dir, dir_name)
-        
-        if not os.path.exists(dir_path):
-            continue
-        
-        for root, dirs, files in os.walk(dir_path):
-            for file in files:
-                file_path = os.path.join(root, file)
+    if file_paths is None:
+        file_paths = find_reference_candidates(assistant_dir, [filename])
+    
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            # Replace archived/filename with just filename
+            count = content.count(archived_reference)
+            
+            if count > 0:
+                new_content = content.replace(archived_reference, filename)
                 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Replace archived/filename with just filename
-                    count = content.count(archived_reference)
-                    
-                    if count > 0:
-                        new_content = content.replace(archived_reference, filename)
-                        
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(new_content)
-                        
-                        replacements[file_path] = count
-                        
-                except Exception:
-                    # Silently skip files that can't be read/written
-                    pass
+                write_document(file_path, new_content)
+                
+                replacements[file_path] = count
+                
+        except Exception:
+            # Silently skip files that can't be read/written
+            pass
     
     return replacements
 
@@ -388,35 +821,7 @@ def fix_references_within_unarchived_file(file_path: str) -> int:
     Returns:
         Number of replacements made.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Patterns to reverse the archiving changes
-        # Match patterns like: ../dl_1_*, ../op_2_*, ../art_3_*
-        patterns = [
-            (r'\.\.\/(dl_\d+_[^\s\)]+\.md)', r'\1'),  # design logs
-            (r'\.\.\/(op_\d+_[^\s\)]+\.md)', r'\1'),  # operations
-            (r'\.\.\/(art_\d+_[^\s\)]+)', r'\1'),  # artifacts
-        ]
-        
-        new_content = content
-        total_replacements = 0
-        
-        for pattern, replacement in patterns:
-            matches = re.findall(pattern, new_content)
-            if matches:
-                new_content = re.sub(pattern, replacement, new_content)
-                total_replacements += len(matches)
-        
-        if total_replacements > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-        
-        return total_replacements
-        
-    except Exception:
-        return 0
+    return rewrite_sibling_references(file_path, _UNARCHIVED_SIBLING_PATTERN, r'\1')
 
 
 @mcp.tool()
@@ -424,13 +829,14 @@ def unarchive_document(
     abs_path: str,
     doc_type: Literal["operation", "artifact", "design_log"],
     number: int,
-    short_desc: Optional[str] = None
+    short_desc: Optional[str] = None,
+    verify_references: bool = False
 ) -> GlyphMCPResponse[None]:
     """
     Unarchive a document by moving it back from the archived subdirectory and updating all references.
     
     This tool:
-    1. Finds the archived document by type and number
+    1. Finds the archived document by type and number, extracting it if it is in the archive pack
     2. Moves it from the 'archived' subdirectory back to the main folder
     3. Updates all references TO the file (from 'archived/filename' to 'filename')
     4. Updates references WITHIN the file (removes '../' prefixes)
@@ -442,6 +848,8 @@ def unarchive_document(
         doc_type: Type of document to unarchive - "operation", "artifact", or "design_log".
         number: The document number to unarchive (e.g., 1 for dl_1_*, 2 for op_2_*).
         short_desc: Optional short description to add back to the _summary.md file. If not provided, the entry is not added to the summary.
+        verify_references: If True, also scan every document to check that the reference index found all files
+                           referencing the document; any it missed are reported and updated as well.
     
     Returns:
         GlyphMCPResponse indicating success or failure with detailed context.
@@ -473,53 +881,65 @@ def unarchive_document(
             response.add_context(f"Archived directory not found: {archive_dir}")
             return response
         
-        # Find the archived document
-        result = find_archived_document_by_number(archive_dir, prefix, number)
-        if result is None:
-            response.add_context(f"Archived document not found: {prefix}_{number}_* in {archive_dir}")
-            return response
-        
-        filename, filepath = result
-        response.add_context(f"Found archived document: {filename}")
-        
-        # Move from archive back to main directory
-        new_path = move_from_archive(filepath, doc_dir, filename)
-        response.add_context(f"Moved from archive: {new_path}")
-        
-        # Update references TO this file from other documents
-        replacements = fix_references_from_archived_file(assistant_dir, filename)
-        
-        if replacements:
-            response.add_context(f"Updated references from 'archived/{filename}' -> '{filename}':")
-            for ref_file, count in replacements.items():
-                rel_path = os.path.relpath(ref_file, abs_path)
-                response.add_context(f"  - {rel_path}: {count} replacement(s)")
-        else:
-            response.add_context(f"No references to 'archived/{filename}' found in other documents")
-        
-        # Update references WITHIN the unarchived file
-        internal_replacements = fix_references_within_unarchived_file(new_path)
-        if internal_replacements > 0:
-            response.add_context(f"Updated {internal_replacements} internal reference(s) within the unarchived file")
-        
-        # Add back to summary if description provided
-        if short_desc:
-            summary_path = os.path.join(doc_dir, "_summary.md")
-            success, message = append_to_summary(summary_path, filename, short_desc)
-            if success:
-                response.add_context(f"Added entry back to {dir_name}/_summary.md")
+        # Other sessions do not change documents while this one is moved and its references rewritten
+        with project_lock(assistant_dir):
+            # Find the archived document
+            result = find_archived_document_by_number(archive_dir, prefix, number)
+            if result is None:
+                # Not loose; extract it if it is in the archive pack
+                result = extract_packed_document(archive_dir, number)
+                if result is None:
+                    response.add_context(f"Archived document not found: {prefix}_{number}_* in {archive_dir}")
+                    return response
+                response.add_context(f"Extracted from {dir_name}/archived/{PACK_FILENAME}")
+            
+            filename, filepath = result
+            response.add_context(f"Found archived document: {filename}")
+            
+            # Move from archive back to main directory
+            new_path = move_from_archive(filepath, doc_dir, filename)
+            response.add_context(f"Moved from archive: {new_path}")
+            
+            # Update references TO this file from other documents
+            file_paths = gather_referencing_files(
+                assistant_dir, [filename], [f"archived/{filename}"], verify_references, response
+            )
+            replacements = fix_references_from_archived_file(assistant_dir, filename, file_paths)
+            
+            if replacements:
+                response.add_context(f"Updated references from 'archived/{filename}' -> '{filename}':")
+                for ref_file, count in replacements.items():
+                    rel_path = os.path.relpath(ref_file, abs_path)
+                    response.add_context(f"  - {rel_path}: {count} replacement(s)")
             else:
-                response.add_context(f"Warning: {message}")
-        else:
-            response.add_context("No description provided, skipping summary update")
+                response.add_context(f"No references to 'archived/{filename}' found in other documents")
+            
+            # Update references WITHIN the unarchived file
+            internal_replacements = fix_references_within_unarchived_file(new_path)
+            if internal_replacements > 0:
+                response.add_context(f"Updated {internal_replacements} internal reference(s) within the unarchived file")
+            
+            # Add back to summary if description provided
+            if short_desc:
+                summary_path = os.path.join(doc_dir, "_summary.md")
+                success, message = append_to_summary(summary_path, filename, short_desc)
+                if success:
+                    response.add_context(f"Added entry back to {dir_name}/_summary.md")
+                else:
+                    response.add_context(f"Warning: {message}")
+            else:
+                response.add_context("No description provided, skipping summary update")
+            
+            description = summary_descriptions(os.path.join(doc_dir, "_summary.md")).get(filename)
+            record_documents(assistant_dir, prefix, {number: make_entry(filename, description=description)})
         
         # Update reference graph
-        update_response = update_reference_graph(abs_path)
+        update_response = request_reference_graph_update(abs_path)
         if not update_response.success:
             response.add_context("Warning: Failed to update reference graph after unarchiving")
             response.add_context(update_response.context)
         else:
-            response.add_context("Reference graph updated successfully")
+            response.add_context(update_response.context[0])
         
         response.success = True
         response.add_context(f"Successfully unarchived {doc_type} #{number}")
@@ -0,0 +1,237 @@
+"""
+Policy-driven archival of finished documents.
+
+Every scan in Glyph walks the active document directories, so archiving documents that
+are done with keeps them small. A policy selects completed operations, artifacts that
+have not been modified for a number of days and design logs below a given number; the
+selected documents are archived in one batched pass (see archive_documents).
+"""
+import os
+import re
+import sys
+import time
+import threading
+from mcp_object import mcp
+from config import BASE_NAME, AUTO_ARCHIVE_POLICY, AUTO_ARCHIVE_PROJECTS
+from response import GlyphMCPResponse
+from ._utils import validate_absolute_path
+from .archive_doc import ArchiveSelection, list_documents_by_number, archive_documents
+from typing import List, Literal, NotRequired, Optional, TypedDict
+
+
+class ArchivePolicy(TypedDict):
+    completed_operations: NotRequired[bool]
+    artifacts_unused_days: NotRequired[int]
+    design_logs_below: NotRequired[int]
+
+
+class ArchiveCandidate(TypedDict):
+    doc_type: Literal["operation", "artifact", "design_log"]
+    number: int
+    filename: str
+    reason: str
+
+
+_CHECKBOX = re.compile(r'^[ \t]*[-*+][ \t]+\[([ xX])\]', re.MULTILINE)
+_FENCE = re.compile(r'^[ ]{0,3}(`{3,}|~{3,}).*?(?:^[ ]{0,3}\1[ \t]*$|\Z)', re.MULTILINE | re.DOTALL)
+
+
+def checklist_progress(file_path: str) -> tuple[int, int]:
+    """
+    Count the checked and total checklist items of a Markdown document, outside code blocks.
+
+    Args:
+        file_path: Path to the document.
+
+    Returns:
+        Tuple of (checked, total). (0, 0) if the file cannot be read.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception:
+        return 0, 0
+
+    boxes = _CHECKBOX.findall(_FENCE.sub('', content))
+    return sum(1 for box in boxes if box != ' '), len(boxes)
+
+
+def find_archive_candidates(assistant_dir: str, policy: ArchivePolicy, now: float | None = None) -> list[ArchiveCandidate]:
+    """
+    Select the active documents that a policy would archive.
+
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        policy: Which documents to select. Criteria that are missing (or False/None) select nothing.
+        now: Current time as a Unix timestamp. Default: time.time().
+
+    Returns:
+        List of candidates, design logs first, then operations and artifacts, each by number.
+    """
+    now = time.time() if now is None else now
+    candidates: list[ArchiveCandidate] = []
+
+    design_logs_below = policy.get("design_logs_below")
+    if design_logs_below is not None:
+        documents = list_documents_by_number(os.path.join(assistant_dir, "design_logs"), "dl")
+        for number, (filename, _) in sorted(documents.items()):
+            if number < design_logs_below:
+                candidates.append({
+                    "doc_type": "design_log",
+                    "number": number,
+                    "filename": filename,
+                    "reason": f"design log number below {design_logs_below}",
+                })
+
+    if policy.get("completed_operations"):
+        documents = list_documents_by_number(os.path.join(assistant_dir, "operations"), "op")
+        for number, (filename, filepath) in sorted(documents.items()):
+            checked, total = checklist_progress(filepath)
+            if total and checked == total:
+                candidates.append({
+                    "doc_type": "operation",
+                    "number": number,
+                    "filename": filename,
+                    "reason": f"all {total} checklist item(s) checked",
+                })
+
+    artifacts_unused_days = policy.get("artifacts_unused_days")
+    if artifacts_unused_days is not None:
+        documents = list_documents_by_number(os.path.join(assistant_dir, "artifacts"), "art")
+        for number, (filename, filepath) in sorted(documents.items()):
+            try:
+                idle_days = (now - os.stat(filepath).st_mtime) / 86400
+            except OSError:
+                continue
+            if idle_days >= artifacts_unused_days:
+                candidates.append({
+                    "doc_type": "artifact",
+                    "number": number,
+                    "filename": filename,
+                    "reason": f"not modified for {int(idle_days)} day(s)",
+                })
+
+    return candidates
+
+
+def selections_from_candidates(candidates: list[ArchiveCandidate]) -> list[ArchiveSelection]:
+    """Group candidates into one archive_documents() selection per document type."""
+    numbers: dict[str, list[int]] = {}
+    for candidate in candidates:
+        numbers.setdefault(candidate["doc_type"], []).append(candidate["number"])
+    return [{"doc_type": doc_type, "numbers": type_numbers} for doc_type, type_numbers in numbers.items()]
+
+
+@mcp.tool()
+def auto_archive_documents(
+    abs_path: str,
+    completed_operations: bool = False,
+    artifacts_unused_days: Optional[int] = None,
+    design_logs_below: Optional[int] = None,
+    dry_run: bool = True
+) -> GlyphMCPResponse[List[ArchiveCandidate]]:
+    """
+    Archive every active document matching a policy, in one batched pass.
+
+    Keeps the active design_logs, operations and artifacts directories small, so that
+    listing and scanning them only deals with live documents. Selected documents are
+    archived with archive_documents: references are updated, summary entries removed
+    and the reference graph updated once.
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        completed_operations: Archive operations that have checklist items and all of them are checked.
+        artifacts_unused_days: Archive artifacts not modified for at least this many days.
+        design_logs_below: Archive design logs numbered below this number.
+        dry_run: If True (the default), only report what would be archived.
+
+    Returns:
+        GlyphMCPResponse with the selected documents and why each was selected.
+    """
+    response = GlyphMCPResponse[List[ArchiveCandidate]]()
+
+    if not validate_absolute_path(abs_path, response):
+        return response
+
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+
+        if not os.path.exists(assistant_dir):
+            response.add_context(f"Directory not found: {assistant_dir}. Please initialize the assistant directory first.")
+            return response
+
+        policy: ArchivePolicy = {"completed_operations": completed_operations}
+        if artifacts_unused_days is not None:
+            policy["artifacts_unused_days"] = artifacts_unused_days
+        if design_logs_below is not None:
+            policy["design_logs_below"] = design_logs_below
+
+        if not completed_operations and artifacts_unused_days is None and design_logs_below is None:
+            response.add_context("No policy criteria given: set completed_operations, artifacts_unused_days or design_logs_below.")
+            return response
+
+        candidates = find_archive_candidates(assistant_dir, policy)
+        response.result = candidates
+
+        if not candidates:
+            response.success = True
+            response.add_context("No documents match the archive policy")
+            return response
+
+        response.add_context(f"{len(candidates)} document(s) match the archive policy:")
+        for candidate in candidates:
+            response.add_context(f"  - {candidate['filename']}: {candidate['reason']}")
+
+        if dry_run:
+            response.success = True
+            response.add_context("Dry run: nothing was archived")
+            return response
+
+        archive_response = archive_documents(abs_path, selections_from_candidates(candidates))
+        for message in archive_response.context:
+            response.add_context(message)
+        response.success = archive_response.success
+
+    except Exception as e:
+        response.add_context(f"Failed to auto-archive documents: {str(e)}")
+
+    return response
+
+
+def start_auto_archive_job(
+    projects: list[str] | None = None,
+    policy: ArchivePolicy | None = None
+) -> threading.Thread | None:
+    """
+    Apply an archive policy to a list of projects on a background thread, e.g. at server startup.
+
+    Progress is reported on stderr, which does not interfere with the MCP stdio transport.
+
+    Args:
+        projects: Absolute project paths. Default: AUTO_ARCHIVE_PROJECTS.
+        policy: The policy to apply. Default: AUTO_ARCHIVE_POLICY.
+
+    Returns:
+        The started thread, or None if there is nothing to do.
+    """
+    projects = AUTO_ARCHIVE_PROJECTS if projects is None else projects
+    policy = AUTO_ARCHIVE_POLICY if policy is None else policy
+
+    if not projects or not policy:
+        return None
+
+    def run() -> None:
+        for abs_path in projects:
+            response = auto_archive_documents(
+                abs_path,
+                completed_operations=policy.get("completed_operations", False),
+                artifacts_unused_days=policy.get("artifacts_unused_days"),
+                design_logs_below=policy.get("design_logs_below"),
+                dry_run=False
+            )
+            status = "done" if response.success else "failed"
+            print(f"Auto-archive {status} for {abs_path}: {response.context[-1] if response.context else ''}", file=sys.stderr)
+
+    thread = threading.Thread(target=run, name="glyph-auto-archive", daemon=True)
+    thread.start()
+    return thread
@@ -1,12 +1,34 @@
 import os
-import shutil
 import re
+import threading
+import anyio
+import anyio.lowlevel
+import anyio.from_thread
+import anyio.to_thread
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from mcp.server.fastmcp import Context
 from mcp_object import mcp
-from config import BASE_NAME
+from config import BASE_NAME, ARTIFACT_CHECKSUM, ARTIFACT_STORAGE, ARTIFACT_COPY_WORKERS
 from response import GlyphMCPResponse
-from ._utils import get_next_number, validate_absolute_path, append_to_summary
-from .reference_graph import update_reference_graph
-from typing import List, Dict, TypedDict
+from ._utils import validate_absolute_path, append_entries_to_summary, write_document
+from .reference_graph import request_reference_graph_update
+from ._fast_copy import CopyStats, copy_file, format_copy_stats
+from ._object_store import OBJECT_HASH, StoreStats, GarbageCollectionResult, store_file, collect_garbage
+from ._document_registry import allocate_document_numbers, document_number, make_entry, record_documents
+from ._project_lock import project_lock, private_tmp_path
+from ._artifact_manifest import MANIFEST_HASH, VerificationResult, record_artifacts, verify_manifest
+from typing import Callable, List, Dict, TypedDict
+
+
+# Progress callback: (completed, total, message)
+ProgressCallback = Callable[[int, int, str], None]
+
+# How often a running batch checks whether it was cancelled
+_CANCEL_POLL_SECONDS = 0.1
+
+# Directory under .assistant where artifacts are copied before they are numbered
+STAGING_DIRNAME = "staging"
 
 
 class ArtifactDescription(TypedDict):
@@ -92,34 +114,145 @@ def get_and_validate_dirs(abs_path: str, response: GlyphMCPResponse[None]) -> tu
     return ad_hoc_dir, artifacts_dir
 
 
-def copy_artifact(source_file_path: str, artifacts_dir: str) -> tuple[str, str]:
+def artifact_filename(number: int, source_file_path: str) -> str:
     """
-    Copy the source file to the artifacts directory with proper naming.
+    Build the artifact filename of a source file: art_{number}_{original_file_name}.
     
     Args:
+        number: The artifact number.
         source_file_path: Path to the source file.
-        artifacts_dir: Path to the artifacts directory.
     
     Returns:
-        A tuple of (new_filename, new_filepath).
+        The artifact filename, with spaces in the original filename replaced by underscores.
     """
-    # Get the next artifact number (using 'art' prefix, accepting any extension)
-    next_number = get_next_number(artifacts_dir, "art", extension="")
+    return f"art_{number}_{os.path.basename(source_file_path).replace(' ', '_')}"
+
+
+def copy_artifact(source_file_path: str, destination_path: str) -> CopyStats | StoreStats:
+    """
+    Copy the source file to a path in the .assistant directory.
     
-    # Extract the original filename
-    original_filename = os.path.basename(source_file_path)
+    The copy uses a reflink or an in-kernel copy where possible, and computes the
+    ARTIFACT_CHECKSUM of the content in the same pass. With ARTIFACT_STORAGE set to
+    "objects", the destination is instead a hardlink to the content's stored object.
     
-    # Replace spaces with underscores in the filename
-    sanitized_filename = original_filename.replace(' ', '_')
+    Args:
+        source_file_path: Path to the source file.
+        destination_path: Path of the file to create, in a directory directly under .assistant.
     
-    # Create the new artifact filename
-    new_filename = f"art_{next_number}_{sanitized_filename}"
-    new_filepath = os.path.join(artifacts_dir, new_filename)
+    Returns:
+        The copy statistics.
+    """
+    try:
+        if ARTIFACT_STORAGE == "objects":
+            return store_file(os.path.dirname(os.path.dirname(destination_path)), source_file_path, destination_path)
+        return copy_file(source_file_path, destination_path, checksum=ARTIFACT_CHECKSUM)
+    except BaseException:
+        # Never leave a partial file behind
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        raise
+
+
+def copy_artifacts(
+    source_file_paths: list[str],
+    staging_dir: str,
+    progress: ProgressCallback | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+    workers: int | None = None
+) -> list[tuple[str, CopyStats | StoreStats] | Exception | None]:
+    """
+    Copy files to private names in the staging directory on a bounded thread pool.
+    
+    The copies are not artifacts yet: they are numbered and moved to the artifacts directory
+    by publish_artifacts, so scans never see a partial copy and a failed or skipped copy does
+    not use up a number. Once is_cancelled() returns True, copies that have not started are
+    skipped and copies in progress run to completion.
     
-    # Copy the file to artifacts directory
-    shutil.copy2(source_file_path, new_filepath)
+    Args:
+        source_file_paths: Paths of the files to copy.
+        staging_dir: Path to the staging directory, directly under .assistant.
+        progress: Called after each copy (from the calling thread) with the copies completed, the total and a message.
+        is_cancelled: Polled while copies run (from the calling thread).
+        workers: Maximum number of concurrent copies. Default: ARTIFACT_COPY_WORKERS.
     
-    return new_filename, new_filepath
+    Returns:
+        For each file, in order: the path of its copy and the copy statistics, the exception
+        the copy raised (no file is left behind), or None if the copy was skipped after a
+        cancellation.
+    """
+    workers = ARTIFACT_COPY_WORKERS if workers is None else workers
+    results: list[tuple[str, CopyStats | StoreStats] | Exception | None] = [None] * len(source_file_paths)
+    stop = threading.Event()
+    completed = 0
+    
+    def copy(index: int) -> tuple[str, CopyStats | StoreStats] | Exception | None:
+        if stop.is_set():
+            return None
+        # The position keeps the names of files with the same basename apart within a batch
+        staged_path = private_tmp_path(os.path.join(staging_dir, f"{index}_{os.path.basename(source_file_paths[index])}"))
+        try:
+            return staged_path, copy_artifact(source_file_paths[index], staged_path)
+        except Exception as e:
+            return e
+    
+    if not source_file_paths:
+        return results
+    
+    os.makedirs(staging_dir, exist_ok=True)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(source_file_paths))), thread_name_prefix="glyph-persist") as executor:
+        pending = {executor.submit(copy, index): index for index in range(len(source_file_paths))}
+        
+        while pending:
+            done, _ = wait(pending, timeout=_CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index = pending.pop(future)
+                results[index] = result = future.result()
+                if result is None:
+                    continue
+                
+                completed += 1
+                if progress is not None:
+                    name = os.path.basename(source_file_paths[index])
+                    message = f"Failed to copy {name}" if isinstance(result, Exception) else f"Copied {name}"
+                    progress(completed, len(source_file_paths), message)
+            
+            if not stop.is_set() and is_cancelled is not None and is_cancelled():
+                stop.set()
+    
+    return results
+
+
+def publish_artifacts(assistant_dir: str, staged: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """
+    Number staged copies and move them into the artifacts directory.
+    
+    Must be called while holding the project lock, so that the artifacts appear together
+    with their summary entries and registry records.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        staged: List of (source_file_path, staged_path) tuples, in the order to number them.
+    
+    Returns:
+        List of (new_filename, new_filepath) tuples, in the same order.
+    """
+    if not staged:
+        return []
+    
+    first_number = allocate_document_numbers(assistant_dir, "art", len(staged))
+    published = []
+    
+    for offset, (source_file_path, staged_path) in enumerate(staged):
+        new_filename = artifact_filename(first_number + offset, source_file_path)
+        new_filepath = os.path.join(assistant_dir, "artifacts", new_filename)
+        # The rename keeps the mtime, so the manifest entry can be taken from the artifact
+        os.replace(staged_path, new_filepath)
+        published.append((new_filename, new_filepath))
+    
+    return published
 
 
 def fix_references_in_file(file_path: str, old_filename: str, new_filename: str) -> int:
@@ -145,8 +278,7 @@ def fix_references_in_file(file_path: str, old_filename: str, new_filename: str)
             # Replace all occurrences
             new_content = content.replace(old_filename, new_filename)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            write_document(file_path, new_content)
         
         return count
     except Exception:
@@ -166,7 +298,34 @@ def fix_references_in_directories(assistant_dir: str, old_filename: str, new_fil
     Returns:
         Dictionary mapping file paths to number of replacements made.
     """
-    replacements = {}
+    return fix_renamed_references_in_directories(assistant_dir, {old_filename: new_filename}).get(old_filename, {})
+
+
+def fix_renamed_references_in_directories(assistant_dir: str, renames: dict[str, str]) -> dict[str, dict[str, int]]:
+    """
+    Replace the references to several renamed files in one pass over the documents.
+    
+    Every file in design_logs, operations, and artifacts is read, matched against a single
+    pattern combining all old filenames, and written at most once.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        renames: Dictionary mapping old filenames to new filenames.
+    
+    Returns:
+        Dictionary mapping each old filename to a dictionary of file paths and the number
+        of replacements made in them. Old filenames that were not found are omitted.
+    """
+    replacements: dict[str, dict[str, int]] = {}
+    
+    if not renames:
+        return replacements
+    
+    # New names are matched too and kept as they are, so that a new name containing its old
+    # name (art_1_notes.txt contains notes.txt) is not renamed again. Longest names first, so a
+    # name contained in another never wins the alternation.
+    names = set(renames) | set(renames.values())
+    pattern = re.compile("|".join(re.escape(name) for name in sorted(names, key=len, reverse=True)))
     
     for dir_name in ["design_logs", "operations", "artifacts"]:
         dir_path = os.path.join(assistant_dir, dir_name)
@@ -177,21 +336,41 @@ def fix_references_in_directories(assistant_dir: str, old_filename: str, new_fil
         for root, dirs, files in os.walk(dir_path):
             for filename in files:
                 file_path = os.path.join(root, filename)
-                count = fix_references_in_file(file_path, old_filename, new_filename)
+                counts: dict[str, int] = {}
                 
-                if count > 0:
-                    replacements[file_path] = count
+                def replace(match: re.Match) -> str:
+                    name = match.group(0)
+                    if name not in renames:
+                        return name
+                    counts[name] = counts.get(name, 0) + 1
+                    return renames[name]
+                
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                    
+                    new_content = pattern.sub(replace, content)
+                    
+                    if counts:
+                        write_document(file_path, new_content)
+                        
+                        for old_filename, count in counts.items():
+                            replacements.setdefault(old_filename, {})[file_path] = count
+                except Exception:
+                    # Silently skip files that can't be read/written
+                    pass
     
     return replacements
 
 
-@mcp.tool()
 def persist_artifacts(
     abs_path: str, 
     files: List[str],
     descriptions: List[ArtifactDescription],
     delete_from_ad_hoc: bool,
-    fix_references: bool
+    fix_references: bool,
+    progress: ProgressCallback | None = None,
+    is_cancelled: Callable[[], bool] | None = None
 ) -> GlyphMCPResponse[None]:
     """
     Persist files from the ad_hoc directory or other locations to the artifacts directory.
@@ -199,6 +378,12 @@ def persist_artifacts(
     Copies each file to the .assistant/artifacts/ directory and renames it with the pattern:
     art_{serial_number}_{original_file_name}.{original_extension}
     
+    Files are copied on a pool of ARTIFACT_COPY_WORKERS threads to private names under
+    .assistant/staging/. Only completed copies are numbered, in the order of files, and moved
+    into the artifacts directory under the project lock; summary entries, reference fixing and
+    deletion follow in the same order. The MCP tool is
+    persist_artifacts_tool, which runs this on a worker thread.
+    
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
         files: List of filenames or full file paths to persist. If a filename without path is provided, 
@@ -208,6 +393,9 @@ def persist_artifacts(
         delete_from_ad_hoc: If True, delete the original files from their source location after persisting.
         fix_references: If True, automatically scan all files in design_logs, operations, and artifacts directories 
                        and update any references from the old filename to the new artifact filename.
+        progress: Called after each file is copied with the copies completed, the total and a message.
+        is_cancelled: Polled while files are copied. Once it returns True, files not yet copied are skipped
+                      and the artifacts already copied are completed (summary, references, deletion).
     
     Returns:
         GlyphMCPResponse indicating success or failure, with the new artifact filenames.
@@ -234,6 +422,9 @@ def persist_artifacts(
         
         artifacts_summary_path = os.path.join(artifacts_dir, "_summary.md")
         
+        # Validate every file first, so the copies can run on the worker pool
+        accepted = []
+        
         for file_name in files:
             # Determine if file_name is a full path or just a filename
             if os.path.isabs(file_name):
@@ -255,34 +446,115 @@ def persist_artifacts(
                 response.add_context(f"Warning: No description provided for {lookup_name}. Skipping.")
                 continue
             
-            # Copy the artifact
-            new_filename, new_filepath = copy_artifact(source_file_path, artifacts_dir)
-            
-            # Add to summary
-            short_desc = descriptions_map[lookup_name]
-            success, message = append_to_summary(artifacts_summary_path, new_filename, short_desc)
-            response.add_context(message)
+            accepted.append((file_name, source_file_path, lookup_name))
+        
+        # Copy on the worker pool to private names; nothing is numbered yet
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+        copies = copy_artifacts(
+            [source_file_path for _, source_file_path, _ in accepted],
+            os.path.join(assistant_dir, STAGING_DIRNAME),
+            progress=progress,
+            is_cancelled=is_cancelled
+        )
+        completed = []
+        failed = 0
+        
+        for (file_name, source_file_path, lookup_name), copy in zip(accepted, copies):
+            if copy is None:
+                continue
             
-            # Add success context
-            response.add_context(f"Persisted artifact: {new_filename}")
-            response.add_context(f"Source: {source_file_path}")
-            response.add_context(f"Destination: {new_filepath}")
+            if isinstance(copy, Exception):
+                failed += 1
+                response.add_context(f"Failed to persist {file_name}: {str(copy)}")
+                continue
             
-            # Fix references if requested
-            if fix_references:
-                assistant_dir = os.path.join(abs_path, BASE_NAME)
-                replacements = fix_references_in_directories(assistant_dir, file_name, new_filename)
+            completed.append((file_name, source_file_path, lookup_name, copy))
+        
+        skipped = sum(1 for copy in copies if copy is None)
+        persisted = []
+        
+        try:
+            # Number and publish the completed copies while holding the project lock, so scans never see
+            # a partial artifact and other sessions do not update the summary or rewrite the same
+            # documents at the same time
+            with project_lock(assistant_dir):
+                published = publish_artifacts(
+                    assistant_dir,
+                    [(source_file_path, staged_path) for _, source_file_path, _, (staged_path, _) in completed]
+                )
+                manifest_paths, manifest_digests = [], []
                 
-                if replacements:
-                    response.add_context(f"Fixed references to '{file_name}' -> '{new_filename}':")
-                    for ref_file, count in replacements.items():
-                        rel_path = os.path.relpath(ref_file, abs_path)
-                        response.add_context(f"  - {rel_path}: {count} replacement(s)")
-                else:
-                    response.add_context(f"No references to '{file_name}' found to fix")
-            
-            # Delete original file if requested
-            if delete_from_ad_hoc:
+                for (file_name, source_file_path, lookup_name, (_, copy_stats)), (new_filename, new_filepath) in zip(completed, published):
+                    persisted.append((file_name, source_file_path, new_filename, descriptions_map[lookup_name]))
+                    manifest_paths.append(new_filepath)
+                    if "digest" in copy_stats:
+                        manifest_digests.append(copy_stats["digest"])
+                    else:
+                        manifest_digests.append(copy_stats["checksum"] if ARTIFACT_CHECKSUM == MANIFEST_HASH else None)
+                    
+                    # Add success context
+                    response.add_context(f"Persisted artifact: {new_filename}")
+                    response.add_context(f"Source: {source_file_path}")
+                    response.add_context(f"Destination: {new_filepath}")
+                    if "digest" not in copy_stats:
+                        response.add_context(f"Copied: {format_copy_stats(copy_stats)}")
+                        if copy_stats["checksum"]:
+                            response.add_context(f"{ARTIFACT_CHECKSUM}: {copy_stats['checksum']}")
+                    else:
+                        if copy_stats["method"] == "deduplicated":
+                            response.add_context(f"Deduplicated: identical content is already stored ({copy_stats['seconds']:.2f}s)")
+                        else:
+                            response.add_context(f"Stored: {format_copy_stats(copy_stats)}")
+                        response.add_context(f"{OBJECT_HASH}: {copy_stats['digest']}")
+                        if not copy_stats["linked"]:
+                            response.add_context("Warning: The filesystem does not support hardlinks; the artifact is a full copy")
+                
+                if skipped:
+                    response.add_context(f"Cancelled: {skipped} file(s) were not persisted; the {len(persisted)} artifact(s) persisted before the cancellation are complete")
+                
+                # Record the new artifacts for integrity verification, reusing the checksums computed while copying
+                if persisted:
+                    record_artifacts(assistant_dir, manifest_paths, manifest_digests)
+                
+                # Add to summary, in one write
+                if persisted:
+                    success, message = append_entries_to_summary(
+                        artifacts_summary_path,
+                        [(new_filename, short_desc) for _, _, new_filename, short_desc in persisted]
+                    )
+                    response.add_context(message)
+                
+                # Fix references if requested, in one pass for all artifacts
+                if fix_references and persisted:
+                    renames: dict[str, str] = {}
+                    for file_name, _, new_filename, _ in persisted:
+                        renames.setdefault(file_name, new_filename)
+                    
+                    replacements = fix_renamed_references_in_directories(assistant_dir, renames)
+                    
+                    for file_name, new_filename in renames.items():
+                        if file_name in replacements:
+                            response.add_context(f"Fixed references to '{file_name}' -> '{new_filename}':")
+                            for ref_file, count in replacements[file_name].items():
+                                rel_path = os.path.relpath(ref_file, abs_path)
+                                response.add_context(f"  - {rel_path}: {count} replacement(s)")
+                        else:
+                            response.add_context(f"No references to '{file_name}' found to fix")
+                
+                if persisted:
+                    record_documents(assistant_dir, "art", {
+                        document_number(new_filename): make_entry(new_filename, description=short_desc)
+                        for _, _, new_filename, short_desc in persisted
+                    })
+        finally:
+            # Copies that were not published (the lock timed out, a rename failed) are discarded
+            for _, _, _, (staged_path, _) in completed:
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+        
+        # Delete original files if requested
+        if delete_from_ad_hoc:
+            for file_name, source_file_path, _, _ in persisted:
                 try:
                     os.remove(source_file_path)
                     response.add_context(f"Deleted original file from ad_hoc: {file_name}")
@@ -290,16 +562,184 @@ def persist_artifacts(
                     response.add_context(f"Warning: Failed to delete original file {file_name}: {str(e)}")
         
         # Update reference graph after persisting artifacts
-        update_response = update_reference_graph(abs_path)
+        update_response = request_reference_graph_update(abs_path)
         if not update_response.success:
             response.add_context("Warning: Failed to update reference graph after persisting artifacts")
             response.add_context(update_response.context)
         else:
-            response.add_context("Reference graph updated successfully")
+            response.add_context(update_response.context[0])
         
-        response.success = True
+        response.success = not failed and not skipped
         
     except Exception as e:
         response.add_context(f"Failed to persist artifacts: {str(e)}")
     
     return response
+
+
+@mcp.tool(name="persist_artifacts")
+async def persist_artifacts_tool(
+    abs_path: str, 
+    files: List[str],
+    descriptions: List[ArtifactDescription],
+    delete_from_ad_hoc: bool,
+    fix_references: bool,
+    ctx: Context
+) -> GlyphMCPResponse[None]:
+    """
+    Persist files from the ad_hoc directory or other locations to the artifacts directory.
+    
+    Copies each file to the .assistant/artifacts/ directory and renames it with the pattern:
+    art_{serial_number}_{original_file_name}.{original_extension}
+    
+    Files are copied in parallel, and a progress notification is sent after each one. If the
+    request is cancelled, files not yet copied are skipped; every artifact created is complete.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        files: List of filenames or full file paths to persist. If a filename without path is provided, 
+               it's assumed to be in `.assistant/ad_hoc` dir. Full absolute paths are also supported.
+         descriptions: List of objects with `filename` and `description` fields.
+                Each description will be added to the artifacts summary.
+        delete_from_ad_hoc: If True, delete the original files from their source location after persisting.
+        fix_references: If True, automatically scan all files in design_logs, operations, and artifacts directories 
+                       and update any references from the old filename to the new artifact filename.
+    
+    Returns:
+        GlyphMCPResponse indicating success or failure, with the new artifact filenames.
+    """
+    # Looked up here: worker threads have no event loop to ask
+    cancelled_error = anyio.get_cancelled_exc_class()
+    
+    def progress(completed: int, total: int, message: str) -> None:
+        try:
+            anyio.from_thread.run(partial(ctx.report_progress, completed, total, message))
+        except (Exception, cancelled_error):
+            # Progress is best effort: a closed session or a cancelled request must not interrupt a copy
+            pass
+    
+    def is_cancelled() -> bool:
+        try:
+            anyio.from_thread.check_cancelled()
+        except cancelled_error:
+            return True
+        return False
+    
+    # The blocking work runs off the event loop, which stays free to deliver notifications and cancellations
+    response = await anyio.to_thread.run_sync(partial(
+        persist_artifacts,
+        abs_path,
+        files,
+        descriptions,
+        delete_from_ad_hoc,
+        fix_references,
+        progress=progress,
+        is_cancelled=is_cancelled
+    ))
+    
+    # A cancelled request has already been answered: raise instead of returning a second response
+    await anyio.lowlevel.checkpoint_if_cancelled()
+    return response
+
+
+@mcp.tool()
+def collect_artifact_garbage(abs_path: str, dry_run: bool = False) -> GlyphMCPResponse[GarbageCollectionResult]:
+    """
+    Reclaim the space of stored artifact content that no artifact uses any more.
+    
+    Only relevant when artifacts are stored as content-addressed objects (ARTIFACT_STORAGE = "objects"):
+    an object is removed once every artifact linking to it was deleted, rewritten or packed into an archive.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        dry_run: If True, only report what would be removed.
+    
+    Returns:
+        GlyphMCPResponse with the number of objects removed and kept, and the bytes reclaimed.
+    """
+    response = GlyphMCPResponse[GarbageCollectionResult]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+        
+        if not os.path.exists(assistant_dir):
+            response.add_context(f"Directory not found: {assistant_dir}. Please initialize the assistant directory first.")
+            return response
+        
+        with project_lock(assistant_dir):
+            result = collect_garbage(assistant_dir, dry_run=dry_run)
+        response.result = result
+        response.success = True
+        
+        verb = "Would remove" if dry_run else "Removed"
+        response.add_context(
+            f"{verb} {result['objects_removed']} unused object(s), reclaiming {result['bytes_reclaimed']} bytes; "
+            f"{result['objects_kept']} object(s) still in use"
+        )
+        
+    except Exception as e:
+        response.add_context(f"Failed to collect artifact garbage: {str(e)}")
+    
+    return response
+
+
+@mcp.tool()
+def verify_artifacts(
+    abs_path: str,
+    full: bool = False,
+    accept_changes: bool = False
+) -> GlyphMCPResponse[VerificationResult]:
+    """
+    Check that persisted artifacts have not been modified or corrupted since they were recorded.
+    
+    Sizes, mtimes and SHA-256 checksums are recorded in .assistant/artifact_manifest.json when
+    artifacts are persisted. Only artifacts whose size or mtime changed are read and re-hashed,
+    so checking a large, unchanged artifact store takes little I/O. Artifacts persisted before
+    the manifest existed are hashed and recorded on the first run.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        full: If True, re-hash every artifact, not only those whose stat data changed.
+        accept_changes: If True, record the current content of modified artifacts and forget deleted ones.
+    
+    Returns:
+        GlyphMCPResponse with the counts and the modified, missing and newly recorded artifacts.
+        success is False if any artifact was modified or is missing.
+    """
+    response = GlyphMCPResponse[VerificationResult]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+        
+        if not os.path.exists(assistant_dir):
+            response.add_context(f"Directory not found: {assistant_dir}. Please initialize the assistant directory first.")
+            return response
+        
+        # Verifications may run side by side; persisting and rewriting artifacts waits for them
+        with project_lock(assistant_dir, "read"):
+            result = verify_manifest(assistant_dir, full=full, accept_changes=accept_changes)
+        response.result = result
+        
+        response.add_context(
+            f"Checked {result['checked']} artifact(s) in {result['seconds']:.2f}s; "
+            f"re-hashed {result['rehashed']} ({result['bytes_hashed']} bytes)"
+        )
+        for filename in result["modified"]:
+            response.add_context(f"Modified: {filename}" + (" (change accepted)" if accept_changes else ""))
+        for filename in result["missing"]:
+            response.add_context(f"Missing: {filename}" + (" (removed from manifest)" if accept_changes else ""))
+        if result["untracked"]:
+            response.add_context(f"Recorded {len(result['untracked'])} artifact(s) that were not in the manifest")
+        
+        response.success = accept_changes or not (result["modified"] or result["missing"])
+        
+    except Exception as e:
+        response.add_context(f"Failed to verify artifacts: {str(e)}")
+    
+    return response
@@ -0,0 +1,357 @@
+"""
+Tools for transitive and structural analysis of the reference graph.
+
+All queries run over the cached in-memory reference graph, so a full impact report,
+path lookup or health report is a single call that does not rescan unchanged documents.
+With the "sqlite" backend, impact reports and path lookups on a cold cache run as
+indexed queries on the graph store instead.
+"""
+import os
+from contextlib import contextmanager
+from typing import Iterator, Literal, Optional, TypedDict
+from mcp_object import mcp
+from config import BASE_NAME
+from response import GlyphMCPResponse
+from ._utils import validate_absolute_path
+from ._graph import GraphQueries, ReferenceGraph
+from ._graph_cache import get_reference_graph, query_reference_graph
+from ._project_lock import project_lock
+
+
+class ImpactEntry(TypedDict):
+    file: str
+    depth: int
+    via: str
+
+
+class DegreeEntry(TypedDict):
+    file: str
+    dir: str
+    in_degree: int
+    out_degree: int
+
+
+class ComponentEntry(TypedDict):
+    size: int
+    files: list[str]
+    cycle: list[str]
+
+
+class AnalyticsPage(TypedDict):
+    section: str
+    total: int
+    offset: int
+    next_offset: int | None
+    items: list[DegreeEntry] | list[ComponentEntry]
+
+
+def project_assistant_dir(abs_path: str, response: GlyphMCPResponse) -> str | None:
+    """
+    Validate the project path and return its .assistant directory.
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located.
+        response: Response object to add context messages to.
+
+    Returns:
+        Path to the .assistant directory, or None if the project is invalid.
+    """
+    if not validate_absolute_path(abs_path, response):
+        return None
+
+    assistant_dir = os.path.join(abs_path, BASE_NAME)
+
+    if not os.path.exists(assistant_dir):
+        response.add_context(
+            f"Assistant directory not found at {assistant_dir}. "
+            "Please initialize the assistant directory first."
+        )
+        return None
+
+    return assistant_dir
+
+
+def load_project_graph(abs_path: str, response: GlyphMCPResponse) -> ReferenceGraph | None:
+    """
+    Validate the project path and return its cached reference graph.
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located.
+        response: Response object to add context messages to.
+
+    Returns:
+        The project's reference graph, or None if the project is invalid.
+    """
+    assistant_dir = project_assistant_dir(abs_path, response)
+    if assistant_dir is None:
+        return None
+
+    with project_lock(assistant_dir, "read"):
+        return get_reference_graph(assistant_dir)
+
+
+@contextmanager
+def open_project_graph(abs_path: str, response: GlyphMCPResponse) -> Iterator[GraphQueries | None]:
+    """
+    Validate the project path and provide its reference graph for lookups and traversals.
+
+    The project stays read-locked until the block exits. With the "sqlite" backend and a
+    cold cache, the queries run on the graph store (see query_reference_graph).
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located.
+        response: Response object to add context messages to.
+
+    Yields:
+        The graph to query, or None if the project is invalid.
+    """
+    assistant_dir = project_assistant_dir(abs_path, response)
+    if assistant_dir is None:
+        yield None
+        return
+
+    with project_lock(assistant_dir, "read"), query_reference_graph(assistant_dir) as graph:
+        yield graph
+
+
+def check_node_exists(graph: GraphQueries, file_name: str, response: GlyphMCPResponse) -> bool:
+    """
+    Check that a file is part of the reference graph, explaining the failure if not.
+
+    Args:
+        graph: The project's reference graph.
+        file_name: The file name to look for.
+        response: Response object to add context messages to.
+
+    Returns:
+        True if the file exists in the graph, False otherwise.
+    """
+    if graph.has_node(file_name):
+        return True
+
+    response.add_context(f"File '{file_name}' does not exist in the project")
+    response.add_context("The file was not found in design_logs, operations, or artifacts directories")
+    return False
+
+
+@mcp.tool()
+def get_reference_impact(
+    abs_path: str,
+    file_name: str,
+    direction: Literal["upstream", "downstream", "both"] = "downstream",
+    max_depth: Optional[int] = None
+) -> GlyphMCPResponse[dict[str, list[ImpactEntry]]]:
+    """
+    Get the transitive closure of a document in the reference graph.
+
+    Use this tool instead of chaining find_references_to / get_references_from calls when you need
+    to know everything a change affects, or everything a document depends on.
+
+    - downstream: every file that references the document, directly or through other files
+      (what is affected if the document changes).
+    - upstream: every file the document references, directly or through other files
+      (what the document depends on).
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        file_name: The name of the file to analyse (e.g., 'art_3_results.csv').
+        direction: "downstream", "upstream", or "both". Default: "downstream".
+        max_depth: Maximum number of reference hops to follow (1 = direct neighbours only). Default: unlimited.
+
+    Returns:
+        GlyphMCPResponse mapping each requested direction to a list of entries with the reached file,
+        its depth (number of hops) and the file it was reached via, in breadth-first order.
+    """
+    response = GlyphMCPResponse[dict[str, list[ImpactEntry]]]()
+
+    if max_depth is not None and max_depth < 1:
+        response.add_context(f"Invalid max_depth: {max_depth}. Must be at least 1, or omitted for unlimited depth.")
+        return response
+
+    try:
+        with open_project_graph(abs_path, response) as graph:
+            if graph is None or not check_node_exists(graph, file_name, response):
+                return response
+
+            directions = ["upstream", "downstream"] if direction == "both" else [direction]
+            result: dict[str, list[ImpactEntry]] = {}
+
+            for current_direction in directions:
+                reached = graph.traverse(file_name, current_direction, max_depth)
+                result[current_direction] = [
+                    {"file": reached_file, "depth": depth, "via": via}
+                    for reached_file, depth, via in reached
+                ]
+
+                deepest = max((depth for _, depth, _ in reached), default=0)
+                response.add_context(
+                    f"{current_direction.capitalize()} of {file_name}: {len(reached)} file(s), up to {deepest} hop(s) away"
+                )
+
+        response.success = True
+        response.result = result
+
+    except Exception as e:
+        response.add_context(f"Failed to compute reference impact for {file_name}: {str(e)}")
+
+    return response
+
+
+@mcp.tool()
+def find_reference_path(
+    abs_path: str,
+    source_file: str,
+    target_file: str,
+    undirected: bool = False
+) -> GlyphMCPResponse[list[str]]:
+    """
+    Find the shortest chain of references from one document to another.
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        source_file: The name of the file to start from.
+        target_file: The name of the file to reach.
+        undirected: If True, references may be followed in either direction. Default: False
+                    (only follow references made by each file).
+
+    Returns:
+        GlyphMCPResponse containing the list of filenames from source_file to target_file (inclusive).
+        Succeeds with an empty list if no path exists.
+    """
+    response = GlyphMCPResponse[list[str]]()
+
+    try:
+        with open_project_graph(abs_path, response) as graph:
+            if graph is None:
+                return response
+
+            if not check_node_exists(graph, source_file, response) or not check_node_exists(graph, target_file, response):
+                return response
+
+            path = graph.shortest_path(source_file, target_file, undirected)
+
+        response.success = True
+        if path is None:
+            response.result = []
+            response.add_context(f"No reference path from {source_file} to {target_file}")
+        else:
+            response.result = path
+            response.add_context(f"Found a path of {len(path) - 1} hop(s) from {source_file} to {target_file}")
+
+    except Exception as e:
+        response.add_context(f"Failed to find reference path from {source_file} to {target_file}: {str(e)}")
+
+    return response
+
+
+def degree_entry(graph: ReferenceGraph, file_name: str) -> DegreeEntry:
+    """Build the degree entry of a file."""
+    return {
+        "file": file_name,
+        "dir": graph.file_to_dir.get(file_name, ""),
+        "in_degree": len(graph.reverse.get(file_name, [])),
+        "out_degree": len(graph.forward.get(file_name, [])),
+    }
+
+
+@mcp.tool()
+def analyze_reference_graph(
+    abs_path: str,
+    section: Literal["in_degree", "out_degree", "orphans", "cycles", "components"] = "in_degree",
+    directory: Optional[Literal["design_logs", "operations", "artifacts"]] = None,
+    offset: int = 0,
+    limit: int = 50
+) -> GlyphMCPResponse[AnalyticsPage]:
+    """
+    Report on the health of the project's reference graph.
+
+    The context always holds an overview (documents, edges, orphans, cycles, components).
+    The result holds one page of the requested section:
+
+    - in_degree: files ranked by how many files reference them (hubs everything depends on).
+    - out_degree: files ranked by how many files they reference.
+    - orphans: documents that no other file references.
+    - cycles: groups of files that reference each other in a loop (strongly connected components
+      with more than one file), largest first, each with one example cycle.
+    - components: groups of files connected by references in either direction, largest first.
+
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        section: Which report to return. Default: "in_degree".
+        directory: Only list files from this directory (in_degree, out_degree and orphans only). Default: all.
+        offset: Number of items to skip, for pagination. Default: 0.
+        limit: Maximum number of items to return. Default: 50.
+
+    Returns:
+        GlyphMCPResponse containing the page of items, the total count and the offset of the next page
+        (None on the last page).
+    """
+    response = GlyphMCPResponse[AnalyticsPage]()
+
+    if offset < 0 or limit < 1:
+        response.add_context(f"Invalid pagination: offset must be >= 0 and limit >= 1 (got offset={offset}, limit={limit}).")
+        return response
+
+    try:
+        graph = load_project_graph(abs_path, response)
+        if graph is None:
+            return response
+
+        nodes = graph.nodes()
+        cycles = [component for component in graph.strongly_connected_components() if len(component) > 1]
+        components = graph.weakly_connected_components()
+        orphans = [file_name for file_name in graph.file_to_dir if not graph.reverse.get(file_name)]
+
+        response.add_context(
+            f"Reference graph: {len(graph.file_to_dir)} documents, {len(graph.edges)} reference edges, "
+            f"{len(components)} component(s)"
+        )
+        response.add_context(
+            f"{len(orphans)} orphan document(s), {len(cycles)} reference cycle group(s) "
+            f"covering {sum(len(component) for component in cycles)} file(s)"
+        )
+
+        if section in ("in_degree", "out_degree", "orphans"):
+            files = orphans if section == "orphans" else nodes
+            if directory:
+                files = [file_name for file_name in files if graph.file_to_dir.get(file_name) == directory]
+
+            items = [degree_entry(graph, file_name) for file_name in files]
+            if section != "orphans":
+                position = {file_name: number for number, file_name in enumerate(nodes)}
+                items.sort(key=lambda item: (-item[section], position[item["file"]]))
+
+            total = len(items)
+            page = items[offset:offset + limit]
+        else:
+            groups = sorted(cycles if section == "cycles" else components, key=len, reverse=True)
+
+            total = len(groups)
+            page = [
+                {
+                    "size": len(group),
+                    "files": group,
+                    "cycle": graph.find_cycle(group) if section == "cycles" else [],
+                }
+                for group in groups[offset:offset + limit]
+            ]
+
+        next_offset = offset + limit if offset + limit < total else None
+
+        response.result = {
+            "section": section,
+            "total": total,
+            "offset": offset,
+            "next_offset": next_offset,
+            "items": page,
+        }
+        if page:
+            response.add_context(f"Section '{section}': items {offset + 1}-{offset + len(page)} of {total}")
+        else:
+            response.add_context(f"Section '{section}': no items at offset {offset} (total {total})")
+        response.success = True
+
+    except Exception as e:
+        response.add_context(f"Failed to analyze reference graph: {str(e)}")
+
+    return response
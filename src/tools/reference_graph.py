@@ -1,9 +1,19 @@
 import os
+import io
 import csv
+import shutil
+from typing import Literal, Optional, TypedDict
 from mcp_object import mcp
-from config import BASE_NAME
+from config import BASE_NAME, MERMAID_LAYOUT, MERMAID_MAX_NODES, REFERENCE_GRAPH_BACKEND, REFERENCE_WATCHER_AUTOSTART
 from response import GlyphMCPResponse
-from ._utils import validate_absolute_path
+from ._utils import validate_absolute_path, write_file_if_changed
+from ._matcher import FilenameMatcher
+from ._reference_index import map_ordered, open_document, scan_document
+from ._archive_pack import is_pack_file
+from ._project_lock import outputs_lock, project_lock
+from ._graph_cache import ReferenceGraph, refresh_reference_graph, get_reference_graph, query_reference_graph
+from ._graph_store import STORE_FILENAME, sync_graph_store
+from ._watcher import WatcherStatus, start_watcher, stop_watcher, get_watcher
 
 
 def get_all_filenames(directory: str) -> list[str]:
@@ -14,34 +24,38 @@ def get_all_filenames(directory: str) -> list[str]:
         directory: Path to the directory to scan.
     
     Returns:
-        List of filenames in the directory and its subdirectories.
+        List of filenames in the directory and its subdirectories, except archive pack files.
     """
     filenames = []
     if os.path.exists(directory):
         for root, dirs, files in os.walk(directory):
-            filenames.extend(files)
+            filenames.extend(filename for filename in files if not is_pack_file(filename))
     return filenames
 
 
-def find_file_references(file_path: str, target_filenames: list[str]) -> list[str]:
+def find_file_references(file_path: str, target_filenames: list[str] | FilenameMatcher) -> list[str]:
     """
     Find which target filenames are mentioned in a file.
     
+    Binary files are skipped after their first block and large files are scanned through
+    a memory map, up to the configured size cap.
+    
     Args:
         file_path: Path to the file to scan.
-        target_filenames: List of filenames to search for.
+        target_filenames: List of filenames to search for, or a FilenameMatcher built once
+                          for the whole scan (preferred when scanning many files).
     
     Returns:
         List of filenames that were found mentioned in the file.
     """
+    if not isinstance(target_filenames, FilenameMatcher):
+        target_filenames = FilenameMatcher(target_filenames)
+    
     references = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            for filename in target_filenames:
-                if filename in content:
-                    references.append(filename)
+        with open_document(file_path) as (content, _, truncated):
+            references = scan_document(content, target_filenames, truncated)
     except Exception as e:
         # Silently skip files that can't be read
         pass
@@ -68,13 +82,21 @@ def collect_all_filenames(assistant_dir: str) -> list[str]:
     return all_filenames
 
 
-def build_reference_edges(assistant_dir: str, all_filenames: list[str]) -> tuple[list[tuple[str, str]], dict[str, str]]:
+def build_reference_edges(
+    assistant_dir: str,
+    all_filenames: list[str],
+    workers: int | None = None
+) -> tuple[list[tuple[str, str]], dict[str, str]]:
     """
     Scan all files and build reference edges.
     
+    Files are read and scanned on a bounded thread pool; edges are merged in os.walk order,
+    so the result is the same for any number of workers.
+    
     Args:
         assistant_dir: Path to the .assistant directory.
         all_filenames: List of all filenames to check for references.
+        workers: Number of scanning threads. Default: REFERENCE_SCAN_WORKERS.
     
     Returns:
         Tuple of (edges, file_to_dir_mapping) where:
@@ -85,6 +107,8 @@ def build_reference_edges(assistant_dir: str, all_filenames: list[str]) -> tuple
     
     edges = []
     file_to_dir = {}
+    matcher = FilenameMatcher(all_filenames)
+    sources = []
     
     for dir_name in dirs_names:
         directory = os.path.join(assistant_dir, dir_name)
@@ -94,67 +118,181 @@ def build_reference_edges(assistant_dir: str, all_filenames: list[str]) -> tuple
         for root, dirs, files in os.walk(directory):
             for filename in files:
                 # Skip _summary.md files as they trivially contain many filenames
-                if filename == "_summary.md":
+                if filename == "_summary.md" or is_pack_file(filename):
                     continue
-                    
-                file_path = os.path.join(root, filename)
                 
                 # Track which directory this file belongs to
                 file_to_dir[filename] = dir_name
-                
-                referenced_files = find_file_references(file_path, all_filenames)
-                
-                # Add edges (excluding self-references)
-                for referenced_file in referenced_files:
-                    if referenced_file != filename:
-                        edges.append((filename, referenced_file))
+                sources.append((filename, os.path.join(root, filename)))
+    
+    results = map_ordered(lambda source: find_file_references(source[1], matcher), sources, workers)
+    
+    for (filename, _), referenced_files in zip(sources, results):
+        # Add edges (excluding self-references)
+        for referenced_file in referenced_files:
+            if referenced_file != filename:
+                edges.append((filename, referenced_file))
     
     return edges, file_to_dir
 
 
-def write_reference_csv(csv_path: str, edges: list[tuple[str, str]]) -> None:
+def render_reference_csv(edges: list[tuple[str, str]]) -> str:
+    """
+    Render reference edges as CSV text with a start_point,end_point header.
+    
+    Args:
+        edges: List of edge tuples to render.
+    
+    Returns:
+        The CSV content.
+    """
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    writer.writerow(['start_point', 'end_point'])
+    writer.writerows(edges)
+    return buffer.getvalue()
+
+
+def write_reference_csv(csv_path: str, edges: list[tuple[str, str]]) -> bool:
     """
-    Write reference edges to CSV file.
+    Write reference edges to CSV file, atomically and only if its content changes.
     
     Args:
         csv_path: Path to the CSV file to create/update.
         edges: List of edge tuples to write.
+    
+    Returns:
+        True if the file was written, False if it was already up to date.
     """
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(['start_point', 'end_point'])
-        writer.writerows(edges)
+    return write_file_if_changed(csv_path, render_reference_csv(edges))
 
 
-def write_reference_mermaid(md_path: str, edges: list[tuple[str, str]], file_to_dir: dict[str, str]) -> None:
+def read_reference_csv(csv_path: str) -> list[tuple[str, str]]:
     """
-    Write reference edges as a Mermaid graph in a Markdown file.
+    Read the edges of a previously written reference_graph.csv.
     
     Args:
-        md_path: Path to the Markdown file to create/update.
-        edges: List of edge tuples to write.
-        file_to_dir: Dict mapping filename to its directory type.
+        csv_path: Path to the CSV file.
+    
+    Returns:
+        List of (source_file, referenced_file) tuples. Empty if the file is missing or unreadable.
+    """
+    try:
+        with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+            return [(row['start_point'], row['end_point']) for row in csv.DictReader(csvfile)]
+    except (OSError, KeyError, csv.Error, UnicodeDecodeError):
+        return []
+
+
+def diff_edges(
+    previous: list[tuple[str, str]],
+    current: list[tuple[str, str]]
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """
+    Compare two edge lists.
+    
+    Args:
+        previous: The edges before the change.
+        current: The edges after the change.
+    
+    Returns:
+        Tuple of (added, removed) edges, in the order of current and previous respectively.
+    """
+    previous_set = set(previous)
+    current_set = set(current)
+    added = [edge for edge in current if edge not in previous_set]
+    removed = [edge for edge in previous if edge not in current_set]
+    return added, removed
+
+
+# Maximum number of added/removed edges listed in an update_reference_graph result
+EDGE_CHANGES_LIMIT = 200
+# Maximum number of added/removed edges spelled out in the response context
+EDGE_CHANGES_CONTEXT_LIMIT = 20
+
+
+class ReferenceGraphChanges(TypedDict):
+    added: list[tuple[str, str]]
+    removed: list[tuple[str, str]]
+    added_count: int
+    removed_count: int
+    truncated: bool
+
+
+MERMAID_NODE_CLASSES = {
+    "design_logs": "designLog",
+    "operations": "operation",
+    "artifacts": "artifact",
+}
+
+MERMAID_PARTS_DIR = "reference_graph_parts"
+
+
+def consolidate_edges(edges: list[tuple[str, str]]) -> list[tuple[str, str, bool]]:
+    """
+    Merge each pair of opposite edges into a single bidirectional edge, in O(E).
+    
+    Args:
+        edges: List of edge tuples.
+    
+    Returns:
+        List of (source, target, is_bidirectional) tuples, without duplicates,
+        in the order the edges first appear.
     """
-    # Detect and consolidate bidirectional links
     edges_set = set(edges)
-    bidirectional_pairs = set()
+    emitted = set()
     consolidated_edges = []
     
     for source, target in edges:
-        # Check if reverse edge exists
-        reverse = (target, source)
         edge_pair = (min(source, target), max(source, target))
         
-        if reverse in edges_set and edge_pair not in bidirectional_pairs:
-            # This is a bidirectional link - mark it and add only once
-            bidirectional_pairs.add(edge_pair)
-            consolidated_edges.append((source, target, True))  # True = bidirectional
-        elif (source, target) not in [(s, t) for s, t, _ in consolidated_edges]:
-            # Check if we haven't already added this as part of a bidirectional pair
-            reverse_pair = (min(target, source), max(target, source))
-            if reverse_pair not in bidirectional_pairs:
-                consolidated_edges.append((source, target, False))  # False = directional
+        if (target, source) in edges_set:
+            # Bidirectional link - add the pair only once
+            if edge_pair not in emitted:
+                emitted.add(edge_pair)
+                consolidated_edges.append((source, target, True))
+        elif (source, target) not in emitted:
+            emitted.add((source, target))
+            consolidated_edges.append((source, target, False))
+    
+    return consolidated_edges
+
+
+def _mermaid_id(node: str) -> str:
+    """Sanitize a node name for use as a Mermaid node id."""
+    return node.replace(".", "_").replace("-", "_").replace(" ", "_")
+
+
+def _mermaid_node_lines(node: str, file_to_dir: dict[str, str], indent: str) -> list[str]:
+    """Node definition with label and style class, or nothing for files outside the three directories."""
+    dir_type = file_to_dir.get(node)
+    if not dir_type:
+        return []
+    
+    safe_node = _mermaid_id(node)
+    lines = [f"{indent}{safe_node}[\"{node}\"]"]
+    node_class = MERMAID_NODE_CLASSES.get(dir_type, "")
+    if node_class:
+        lines.append(f"{indent}class {safe_node} {node_class}")
+    return lines
+
+
+def render_mermaid(
+    consolidated_edges: list[tuple[str, str, bool]],
+    file_to_dir: dict[str, str],
+    layout: Literal["flat", "by_directory"] = "flat"
+) -> str:
+    """
+    Render consolidated edges as a Mermaid code block.
+    
+    Args:
+        consolidated_edges: List of (source, target, is_bidirectional) tuples.
+        file_to_dir: Dict mapping filename to its directory type.
+        layout: "flat" for a single graph, "by_directory" for one subgraph per directory.
     
+    Returns:
+        The Mermaid code block as a string.
+    """
     # Collect all unique nodes from consolidated edges
     nodes = set()
     for source, target, _ in consolidated_edges:
@@ -170,63 +308,337 @@ def write_reference_mermaid(md_path: str, edges: list[tuple[str, str]], file_to_
     lines.append("    classDef artifact fill:#FF8C00,stroke:#000,color:#fff")
     lines.append("")
     
-    # Group nodes by directory and add them with styling
-    for node in sorted(nodes):
-        dir_type = file_to_dir.get(node)
-        if dir_type:
-            # Sanitize node name for Mermaid (replace special chars)
-            safe_node = node.replace(".", "_").replace("-", "_").replace(" ", "_")
-            
-            # Determine class
-            if dir_type == "design_logs":
-                node_class = "designLog"
-            elif dir_type == "operations":
-                node_class = "operation"
-            elif dir_type == "artifacts":
-                node_class = "artifact"
-            else:
-                node_class = ""
-            
-            # Add node definition with label
-            lines.append(f"    {safe_node}[\"{node}\"]")
-            if node_class:
-                lines.append(f"    class {safe_node} {node_class}")
+    if layout == "by_directory":
+        nodes_by_dir: dict[str, list[str]] = {}
+        for node in sorted(nodes):
+            dir_type = file_to_dir.get(node)
+            if dir_type:
+                nodes_by_dir.setdefault(dir_type, []).append(node)
+        
+        for dir_type in sorted(nodes_by_dir):
+            lines.append(f"    subgraph {dir_type}")
+            for node in nodes_by_dir[dir_type]:
+                lines.extend(_mermaid_node_lines(node, file_to_dir, "        "))
+            lines.append("    end")
+    else:
+        for node in sorted(nodes):
+            lines.extend(_mermaid_node_lines(node, file_to_dir, "    "))
     
     lines.append("")
     
     # Add edges (using --- for bidirectional, --> for directional)
     for source, target, is_bidirectional in consolidated_edges:
-        safe_source = source.replace(".", "_").replace("-", "_").replace(" ", "_")
-        safe_target = target.replace(".", "_").replace("-", "_").replace(" ", "_")
         arrow = " --- " if is_bidirectional else " --> "
-        lines.append(f"    {safe_source}{arrow}{safe_target}")
+        lines.append(f"    {_mermaid_id(source)}{arrow}{_mermaid_id(target)}")
     
     lines.append("```")
+    return "\n".join(lines)
+
+
+def _connected_components(consolidated_edges: list[tuple[str, str, bool]]) -> list[list[tuple[str, str, bool]]]:
+    """Group consolidated edges by weakly connected component (union-find), largest component first."""
+    parent: dict[str, str] = {}
+    
+    def find(node: str) -> str:
+        root = node
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+    
+    for source, target, _ in consolidated_edges:
+        root_source, root_target = find(source), find(target)
+        if root_source != root_target:
+            parent[root_source] = root_target
+    
+    components: dict[str, list[tuple[str, str, bool]]] = {}
+    for edge in consolidated_edges:
+        components.setdefault(find(edge[0]), []).append(edge)
+    
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def _edge_nodes(edges: list[tuple[str, str, bool]]) -> set[str]:
+    nodes = set()
+    for source, target, _ in edges:
+        nodes.add(source)
+        nodes.add(target)
+    return nodes
+
+
+def split_mermaid_parts(
+    consolidated_edges: list[tuple[str, str, bool]],
+    file_to_dir: dict[str, str],
+    max_nodes: int
+) -> list[tuple[str, list[tuple[str, str, bool]]]]:
+    """
+    Split a large graph into parts of at most roughly max_nodes nodes.
+    
+    Small connected components are packed together. A component larger than max_nodes
+    is split by the document type of each edge's source, then into chunks of sources,
+    so every edge appears in exactly one part.
+    
+    Args:
+        consolidated_edges: List of (source, target, is_bidirectional) tuples.
+        file_to_dir: Dict mapping filename to its directory type.
+        max_nodes: Target maximum number of nodes per part.
+    
+    Returns:
+        List of (title, edges) tuples, one per part.
+    """
+    parts = []
+    packed: list[tuple[str, str, bool]] = []
+    packed_nodes: set[str] = set()
+    packed_count = 0
+    
+    def flush_packed():
+        nonlocal packed, packed_nodes, packed_count
+        if packed:
+            title = "Connected component" if packed_count == 1 else f"{packed_count} connected components"
+            parts.append((title, packed))
+        packed, packed_nodes, packed_count = [], set(), 0
+    
+    for component in _connected_components(consolidated_edges):
+        component_nodes = _edge_nodes(component)
+        
+        if len(component_nodes) <= max_nodes:
+            if len(packed_nodes) + len(component_nodes) > max_nodes:
+                flush_packed()
+            packed.extend(component)
+            packed_nodes |= component_nodes
+            packed_count += 1
+            continue
+        
+        # Oversized component: split by source type, then into chunks of sources
+        by_type: dict[str, dict[str, list[tuple[str, str, bool]]]] = {}
+        for edge in component:
+            dir_type = file_to_dir.get(edge[0], "other")
+            by_type.setdefault(dir_type, {}).setdefault(edge[0], []).append(edge)
+        
+        for dir_type in sorted(by_type):
+            chunk: list[tuple[str, str, bool]] = []
+            chunk_nodes: set[str] = set()
+            chunk_number = 1
+            
+            for source_edges in by_type[dir_type].values():
+                source_nodes = _edge_nodes(source_edges)
+                if chunk and len(chunk_nodes | source_nodes) > max_nodes:
+                    parts.append((f"Large component - {dir_type} (part {chunk_number})", chunk))
+                    chunk, chunk_nodes = [], set()
+                    chunk_number += 1
+                chunk.extend(source_edges)
+                chunk_nodes |= source_nodes
+            
+            if chunk:
+                title = f"Large component - {dir_type}" if chunk_number == 1 else f"Large component - {dir_type} (part {chunk_number})"
+                parts.append((title, chunk))
+    
+    flush_packed()
+    return parts
+
+
+def write_reference_mermaid(
+    md_path: str,
+    edges: list[tuple[str, str]],
+    file_to_dir: dict[str, str],
+    layout: Literal["flat", "by_directory"] = "flat",
+    max_nodes: int = 0
+) -> tuple[list[str], bool]:
+    """
+    Write reference edges as a Mermaid graph in a Markdown file.
+    
+    If the graph has more than max_nodes nodes, md_path instead becomes an index linking
+    to one Markdown file per part, written to a 'reference_graph_parts' directory next to it.
+    
+    Args:
+        md_path: Path to the Markdown file to create/update.
+        edges: List of edge tuples to write.
+        file_to_dir: Dict mapping filename to its directory type.
+        layout: "flat" for a single graph, "by_directory" for one subgraph per directory.
+        max_nodes: Maximum number of nodes in a single diagram. 0 disables splitting.
+    
+    Returns:
+        Tuple of (files, changed) where files lists the paths of the Markdown files making up
+        the diagram and changed tells whether any of them was written or removed. Files whose
+        content is unchanged are not rewritten.
+    """
+    # Detect and consolidate bidirectional links
+    consolidated_edges = consolidate_edges(edges)
+    parts_dir = os.path.join(os.path.dirname(md_path), MERMAID_PARTS_DIR)
+    node_count = len(_edge_nodes(consolidated_edges))
+    
+    if not max_nodes or node_count <= max_nodes:
+        changed = write_file_if_changed(md_path, render_mermaid(consolidated_edges, file_to_dir, layout))
+        if os.path.isdir(parts_dir):
+            shutil.rmtree(parts_dir, ignore_errors=True)
+            changed = True
+        return [md_path], changed
+    
+    parts = split_mermaid_parts(consolidated_edges, file_to_dir, max_nodes)
+    os.makedirs(parts_dir, exist_ok=True)
+    
+    changed = False
+    part_paths = []
+    index_lines = [
+        "# Reference graph",
+        "",
+        f"The graph has {node_count} nodes, more than a single diagram can render well ({max_nodes}), "
+        f"so it is split into {len(parts)} parts.",
+        "",
+    ]
+    
+    for number, (title, part_edges) in enumerate(parts, start=1):
+        part_filename = f"part_{number}.md"
+        part_path = os.path.join(parts_dir, part_filename)
+        
+        part_content = f"# {title}\n\n" + render_mermaid(part_edges, file_to_dir, layout)
+        changed |= write_file_if_changed(part_path, part_content)
+        part_paths.append(part_path)
+        
+        part_nodes = len(_edge_nodes(part_edges))
+        index_lines.append(f"- [{title}]({MERMAID_PARTS_DIR}/{part_filename}) - {part_nodes} nodes, {len(part_edges)} edges")
+    
+    # Remove parts left over from a previous, larger split (another session may be removing them too)
+    for filename in os.listdir(parts_dir):
+        if filename.endswith(".md") and os.path.join(parts_dir, filename) not in part_paths:
+            try:
+                os.remove(os.path.join(parts_dir, filename))
+            except FileNotFoundError:
+                continue
+            changed = True
+    
+    changed |= write_file_if_changed(md_path, "\n".join(index_lines) + "\n")
+    
+    return [md_path] + part_paths, changed
+
+
+def write_reference_graph_outputs(
+    assistant_dir: str,
+    graph: ReferenceGraph,
+    outputs: Literal["csv", "mermaid", "both"] = "both",
+    mermaid_layout: Optional[Literal["flat", "by_directory"]] = None
+) -> list[str]:
+    """
+    Write the CSV and/or Mermaid renderings of a reference graph.
     
-    # Write to file
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write("\n".join(lines))
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        graph: The reference graph to write.
+        outputs: Which renderings to write.
+        mermaid_layout: Mermaid layout override. Default: the configured layout.
+    
+    Returns:
+        Context messages describing the files, marking those that were already up to date.
+    """
+    messages = []
+    
+    if outputs in ("csv", "both"):
+        csv_path = os.path.join(assistant_dir, "reference_graph.csv")
+        written = write_reference_csv(csv_path, graph.edges)
+        messages.append(f"CSV: {csv_path}" + ("" if written else " (unchanged)"))
+    
+    if outputs in ("mermaid", "both"):
+        md_path = os.path.join(assistant_dir, "reference_graph.md")
+        mermaid_files, written = write_reference_mermaid(
+            md_path,
+            graph.edges,
+            graph.file_to_dir,
+            layout=mermaid_layout or MERMAID_LAYOUT,
+            max_nodes=MERMAID_MAX_NODES
+        )
+        messages.append(f"Mermaid: {md_path}" + ("" if written else " (unchanged)"))
+        if len(mermaid_files) > 1:
+            messages.append(f"Graph split into {len(mermaid_files) - 1} diagrams under {MERMAID_PARTS_DIR}/")
+    
+    return messages
+
+
+def publish_reference_graph(
+    assistant_dir: str,
+    graph: ReferenceGraph,
+    mermaid_layout: Optional[Literal["flat", "by_directory"]] = None
+) -> tuple[list[str], list[tuple[str, str]], list[tuple[str, str]]]:
+    """
+    Persist a refreshed reference graph to the configured backend.
+    
+    The "csv" backend rewrites reference_graph.csv and the Mermaid diagram when their content
+    changes. The "sqlite" backend applies only the changed edges to reference_graph.db;
+    CSV and Mermaid are then exported on demand. Outputs are written under the outputs lock,
+    so sessions publishing at the same time do not interleave their files.
+    
+    Args:
+        assistant_dir: Path to the .assistant directory.
+        graph: The refreshed reference graph.
+        mermaid_layout: Mermaid layout override. Default: the configured layout.
+    
+    Returns:
+        Tuple of (messages, added, removed): context messages describing what was written,
+        and the edges added and removed since the graph was last published.
+    """
+    with outputs_lock(assistant_dir):
+        if REFERENCE_GRAPH_BACKEND == "sqlite":
+            added, removed = sync_graph_store(assistant_dir, graph)
+            messages = [
+                f"SQLite store: {os.path.join(assistant_dir, STORE_FILENAME)}",
+                "Use export_reference_graph to produce the CSV or Mermaid files",
+            ]
+            return messages, added, removed
+        
+        previous_edges = read_reference_csv(os.path.join(assistant_dir, "reference_graph.csv"))
+        added, removed = diff_edges(previous_edges, graph.edges)
+        messages = write_reference_graph_outputs(assistant_dir, graph, "both", mermaid_layout)
+        return messages, added, removed
+
+
+def _start_project_watcher(assistant_dir: str, backend: Literal["auto", "inotify", "polling"] = "auto", poll_interval: float = 2.0):
+    """Start the background watcher of a project, publishing the graph after every refresh."""
+    return start_watcher(
+        assistant_dir,
+        on_refresh=lambda graph: publish_reference_graph(assistant_dir, graph)[0],
+        backend=backend,
+        poll_interval=poll_interval
+    )
+
+
+def _autostart_watcher(assistant_dir: str) -> None:
+    """Start a watcher for the project if configured to do so and none is running."""
+    if REFERENCE_WATCHER_AUTOSTART and get_watcher(assistant_dir) is None:
+        _start_project_watcher(assistant_dir)
 
 
 @mcp.tool()
-def update_reference_graph(abs_path: str) -> GlyphMCPResponse[None]:
+def update_reference_graph(
+    abs_path: str,
+    mermaid_layout: Optional[Literal["flat", "by_directory"]] = None
+) -> GlyphMCPResponse[ReferenceGraphChanges]:
     """
     Scan all design logs, operations, and artifacts for references and update reference_graph.csv.
     
     This tool will:
     1. Get all filenames from design_logs, operations, and artifacts directories
-    2. For each file in these directories, find which other filenames are mentioned in it
+    2. For each new or modified file in these directories, find which other filenames are mentioned in it
+       (unchanged files are served from the persistent reference index in .assistant/reference_index.json)
     3. Create or update the reference_graph.csv file in the .assistant directory
+    4. Create or update the reference_graph.md Mermaid diagram. Large graphs are split into
+       per-component diagrams under .assistant/reference_graph_parts/, indexed by reference_graph.md
     
     The CSV has two columns: start_point and end_point, representing directed edges in the reference graph.
+    Files whose content would not change are not rewritten; changed files are replaced atomically.
+    
+    When the server is configured with the "sqlite" backend, steps 3 and 4 are replaced by applying
+    the changed edges to .assistant/reference_graph.db; use export_reference_graph for the CSV and Mermaid files.
     
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        mermaid_layout: "flat" draws one graph, "by_directory" groups nodes into one subgraph per directory.
+                        Default: the server's configured layout.
     
     Returns:
-        GlyphMCPResponse indicating success or failure with statistics.
+        GlyphMCPResponse with statistics, containing the edges added and removed since the last update
+        (lists are capped at 200 edges each; the counts are exact).
     """
-    response = GlyphMCPResponse[None]()
+    response = GlyphMCPResponse[ReferenceGraphChanges]()
     
     if not validate_absolute_path(abs_path, response):
         return response
@@ -241,24 +653,46 @@ def update_reference_graph(abs_path: str) -> GlyphMCPResponse[None]:
             )
             return response
         
-        # Collect all filenames, build edges, and write both CSV and Mermaid MD
-        all_filenames = collect_all_filenames(assistant_dir)
-        edges, file_to_dir = build_reference_edges(assistant_dir, all_filenames)
-        
-        csv_path = os.path.join(assistant_dir, "reference_graph.csv")
-        md_path = os.path.join(assistant_dir, "reference_graph.md")
-        
-        write_reference_csv(csv_path, edges)
-        write_reference_mermaid(md_path, edges, file_to_dir)
+        # Refresh the incremental index, derive edges, and write both CSV and Mermaid MD.
+        # Other sessions may scan at the same time, but not change documents meanwhile;
+        # publishing takes the outputs lock
+        with project_lock(assistant_dir, "read"):
+            graph, index_stats = refresh_reference_graph(assistant_dir)
+            edges = graph.edges
+            
+            output_messages, added, removed = publish_reference_graph(assistant_dir, graph, mermaid_layout)
+        _autostart_watcher(assistant_dir)
         
         # Statistics
         unique_sources = len(set(edge[0] for edge in edges))
         total_edges = len(edges)
         
         response.add_context(f"Reference graph updated successfully")
-        response.add_context(f"CSV: {csv_path}")
-        response.add_context(f"Mermaid: {md_path}")
+        for message in output_messages:
+            response.add_context(message)
         response.add_context(f"Statistics: {unique_sources} files with references, {total_edges} reference edges")
+        response.add_context(
+            f"Index: {index_stats['scanned']} file(s) rescanned, {index_stats['reused']} unchanged, "
+            f"{index_stats['removed']} removed"
+        )
+        
+        if not added and not removed:
+            response.add_context("No reference edges changed")
+        else:
+            response.add_context(f"Edges changed: {len(added)} added, {len(removed)} removed")
+            for sign, changed_edges in (("+", added), ("-", removed)):
+                for source, target in changed_edges[:EDGE_CHANGES_CONTEXT_LIMIT]:
+                    response.add_context(f"  {sign} {source} -> {target}")
+                if len(changed_edges) > EDGE_CHANGES_CONTEXT_LIMIT:
+                    response.add_context(f"  {sign} ... and {len(changed_edges) - EDGE_CHANGES_CONTEXT_LIMIT} more")
+        
+        response.result = {
+            "added": added[:EDGE_CHANGES_LIMIT],
+            "removed": removed[:EDGE_CHANGES_LIMIT],
+            "added_count": len(added),
+            "removed_count": len(removed),
+            "truncated": len(added) > EDGE_CHANGES_LIMIT or len(removed) > EDGE_CHANGES_LIMIT,
+        }
         response.success = True
         
     except Exception as e:
@@ -267,15 +701,95 @@ def update_reference_graph(abs_path: str) -> GlyphMCPResponse[None]:
     return response
 
 
-def _query_reference_graph(abs_path: str, file_name: str, match_column: str, return_column: str, context_msg: str) -> GlyphMCPResponse[list[str]]:
+@mcp.tool()
+def export_reference_graph(
+    abs_path: str,
+    outputs: Literal["csv", "mermaid", "both"] = "both",
+    mermaid_layout: Optional[Literal["flat", "by_directory"]] = None
+) -> GlyphMCPResponse[None]:
+    """
+    Export the current reference graph as reference_graph.csv and/or the reference_graph.md Mermaid diagram.
+    
+    update_reference_graph already writes both files with the default "csv" backend; use this tool
+    when the server keeps the graph in SQLite (the graph is then read from the store if it is up to
+    date), or to re-render the Mermaid diagram with another layout.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        outputs: "csv", "mermaid", or "both". Default: "both".
+        mermaid_layout: "flat" or "by_directory". Default: the server's configured layout.
+    
+    Returns:
+        GlyphMCPResponse indicating success or failure, with the paths written.
+    """
+    response = GlyphMCPResponse[None]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+        
+        if not os.path.exists(assistant_dir):
+            response.add_context(
+                f"Assistant directory not found at {assistant_dir}. "
+                "Please initialize the assistant directory first."
+            )
+            return response
+        
+        with project_lock(assistant_dir, "read"):
+            graph = get_reference_graph(assistant_dir)
+            with outputs_lock(assistant_dir):
+                messages = write_reference_graph_outputs(assistant_dir, graph, outputs, mermaid_layout)
+        
+        response.add_context("Reference graph exported successfully")
+        for message in messages:
+            response.add_context(message)
+        response.success = True
+        
+    except Exception as e:
+        response.add_context(f"Failed to export reference graph: {str(e)}")
+    
+    return response
+
+
+def request_reference_graph_update(abs_path: str) -> GlyphMCPResponse[Optional[ReferenceGraphChanges]]:
+    """
+    Bring the reference graph up to date after a tool changed documents.
+    
+    If a background watcher runs for the project, the refresh is handed to it and this
+    returns immediately. Otherwise the graph is updated synchronously.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located.
+    
+    Returns:
+        GlyphMCPResponse whose first context message describes what happened.
+    """
+    watcher = get_watcher(os.path.join(abs_path, BASE_NAME))
+    if watcher is None:
+        return update_reference_graph(abs_path)
+    
+    watcher.request_refresh()
+    response = GlyphMCPResponse[Optional[ReferenceGraphChanges]]()
+    response.add_context("Reference graph update scheduled on the background watcher")
+    response.success = True
+    return response
+
+
+def _query_reference_graph(abs_path: str, file_name: str, direction: Literal["from", "to"], context_msg: str) -> GlyphMCPResponse[list[str]]:
     """
-    Helper function to query the reference graph CSV.
+    Helper function to query the in-memory reference graph.
+    
+    The project's graph is cached with forward and reverse adjacency maps, so a lookup
+    costs O(degree). The cache is refreshed only when a document changed; no CSV or
+    Mermaid file is read or rewritten. With the "sqlite" backend and a cold cache, the
+    lookup is an indexed query on the graph store.
     
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located.
         file_name: The name of the file to search for.
-        match_column: The column name to match against (e.g., 'start_point' or 'end_point').
-        return_column: The column name to return values from.
+        direction: 'from' to return files referenced by file_name, 'to' to return files referencing it.
         context_msg: The success message template (should contain {count} and {file_name}).
     
     Returns:
@@ -283,40 +797,31 @@ def _query_reference_graph(abs_path: str, file_name: str, match_column: str, ret
     """
     response = GlyphMCPResponse[list[str]]()
     
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
     try:
-        # First update the reference graph to ensure it's current
-        update_response = update_reference_graph(abs_path)
-        if not update_response.success:
-            response.add_context("Failed to update reference graph")
-            response.add_context(update_response.context)
-            return response
-        
         assistant_dir = os.path.join(abs_path, BASE_NAME)
-        csv_path = os.path.join(assistant_dir, "reference_graph.csv")
         
-        if not os.path.exists(csv_path):
-            response.add_context(f"Reference graph CSV not found at {csv_path}")
+        if not os.path.exists(assistant_dir):
+            response.add_context(
+                f"Assistant directory not found at {assistant_dir}. "
+                "Please initialize the assistant directory first."
+            )
             return response
         
-        matching_files = []
-        file_exists_in_graph = False
-        
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Check if file exists anywhere in the graph
-                if row['start_point'] == file_name or row['end_point'] == file_name:
-                    file_exists_in_graph = True
-                
-                # Check for matching references
-                if row[match_column] == file_name:
-                    matching_files.append(row[return_column])
-        
-        # If file doesn't exist in the graph at all, fail with explanation
-        if not file_exists_in_graph:
-            response.add_context(f"File '{file_name}' does not exist in the project")
-            response.add_context("The file was not found in design_logs, operations, or artifacts directories")
-            return response
+        _autostart_watcher(assistant_dir)
+        with project_lock(assistant_dir, "read"), query_reference_graph(assistant_dir) as graph:
+            # If file doesn't exist in the graph at all, fail with explanation
+            if not graph.has_node(file_name):
+                response.add_context(f"File '{file_name}' does not exist in the project")
+                response.add_context("The file was not found in design_logs, operations, or artifacts directories")
+                return response
+            
+            if direction == "from":
+                matching_files = graph.references_from(file_name)
+            else:
+                matching_files = graph.references_to(file_name)
         
         response.success = True
         response.result = matching_files
@@ -334,9 +839,8 @@ def get_references_from(abs_path: str, file_name: str) -> GlyphMCPResponse[list[
     Get all files that are referenced by the specified file.
     
     This tool will:
-    1. Update the reference graph to ensure it's current
-    2. Read the reference_graph.csv file
-    3. Return all files that the specified file references
+    1. Refresh the cached reference graph if any document changed since the last query
+    2. Return all files that the specified file references
     
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
@@ -348,8 +852,7 @@ def get_references_from(abs_path: str, file_name: str) -> GlyphMCPResponse[list[
     return _query_reference_graph(
         abs_path, 
         file_name, 
-        match_column='start_point',
-        return_column='end_point',
+        direction="from",
         context_msg="Found {count} files referenced by {file_name}"
     )
 
@@ -360,9 +863,8 @@ def find_references_to(abs_path: str, file_name: str) -> GlyphMCPResponse[list[s
     Find all files that reference the specified file.
     
     This tool will:
-    1. Update the reference graph to ensure it's current
-    2. Read the reference_graph.csv file
-    3. Return all files that reference the specified file
+    1. Refresh the cached reference graph if any document changed since the last query
+    2. Return all files that reference the specified file
     
     Args:
         abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
@@ -374,7 +876,116 @@ def find_references_to(abs_path: str, file_name: str) -> GlyphMCPResponse[list[s
     return _query_reference_graph(
         abs_path, 
         file_name, 
-        match_column='end_point',
-        return_column='start_point',
+        direction="to",
         context_msg="Found {count} files that reference {file_name}"
     )
+
+
+@mcp.tool()
+def start_reference_watcher(
+    abs_path: str,
+    backend: Literal["auto", "inotify", "polling"] = "auto",
+    poll_interval: float = 2.0
+) -> GlyphMCPResponse[WatcherStatus]:
+    """
+    Start a background watcher that keeps the reference graph fresh as documents are edited.
+    
+    While the watcher runs, reference queries are answered from memory and archive/persist tools
+    no longer rebuild the graph before returning; the watcher applies changes shortly after files
+    are written (see the lag reported by get_reference_watcher_status).
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+        backend: "inotify" (Linux), "polling" (stat-based, any platform), or "auto" to prefer inotify. Default: "auto".
+        poll_interval: Seconds between scans when polling. Default: 2.0.
+    
+    Returns:
+        GlyphMCPResponse containing the watcher status.
+    """
+    response = GlyphMCPResponse[WatcherStatus]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    if poll_interval <= 0:
+        response.add_context(f"Invalid poll_interval: {poll_interval}. Must be positive.")
+        return response
+    
+    try:
+        assistant_dir = os.path.join(abs_path, BASE_NAME)
+        
+        if not os.path.exists(assistant_dir):
+            response.add_context(
+                f"Assistant directory not found at {assistant_dir}. "
+                "Please initialize the assistant directory first."
+            )
+            return response
+        
+        watcher, started = _start_project_watcher(assistant_dir, backend, poll_interval)
+        
+        if started:
+            response.add_context(f"Started reference graph watcher ({watcher.status()['backend']})")
+        else:
+            response.add_context("A reference graph watcher is already running for this project")
+        
+        response.result = watcher.status()
+        response.success = True
+        
+    except Exception as e:
+        response.add_context(f"Failed to start reference graph watcher: {str(e)}")
+    
+    return response
+
+
+@mcp.tool()
+def stop_reference_watcher(abs_path: str) -> GlyphMCPResponse[None]:
+    """
+    Stop the background reference graph watcher of a project.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+    
+    Returns:
+        GlyphMCPResponse indicating success or failure.
+    """
+    response = GlyphMCPResponse[None]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    if stop_watcher(os.path.join(abs_path, BASE_NAME)):
+        response.add_context("Stopped reference graph watcher")
+        response.success = True
+    else:
+        response.add_context("No reference graph watcher is running for this project")
+    
+    return response
+
+
+@mcp.tool()
+def get_reference_watcher_status(abs_path: str) -> GlyphMCPResponse[WatcherStatus]:
+    """
+    Get the status of the background reference graph watcher of a project.
+    
+    Reports the backend in use, how many file events were seen and refreshes performed,
+    how many events are still pending, and the lag between a change and the refresh applying it.
+    
+    Args:
+        abs_path: The absolute path of the project's root where the .assistant folder is located. Absolute path is required.
+    
+    Returns:
+        GlyphMCPResponse containing the watcher status.
+    """
+    response = GlyphMCPResponse[WatcherStatus]()
+    
+    if not validate_absolute_path(abs_path, response):
+        return response
+    
+    watcher = get_watcher(os.path.join(abs_path, BASE_NAME))
+    if watcher is None:
+        response.add_context("No reference graph watcher is running for this project")
+        return response
+    
+    response.result = watcher.status()
+    response.success = True
+    return response
@@ -33,6 +33,8 @@ class TestRunner:
         print("  9. Add design log (success)")
         print(" 10. Add design log - not initialized")
         print(" 20. Multiple design logs - sequential numbering")
+        print(" 50. Concurrent design logs - atomic numbering")
+        print(" 51. Bulk document creation")
         print("\n--- Operations ---")
         print(" 11. Add operation document (success)")
         print("\n--- Artifact Persistence ---")
@@ -41,6 +43,10 @@ class TestRunner:
         print(" 21. Persist artifacts with delete option")
         print(" 22. Persist artifacts with reference fixing")
         print(" 23. Persist artifacts with both options")
+        print(" 44. Persist artifacts in a batch")
+        print(" 46. Content-addressed artifact store")
+        print(" 47. Persist artifacts with progress and cancellation")
+        print(" 48. Verify artifacts against the manifest")
         # print("\n--- Markdown Processing ---")
         # print(" 14. Parse markdown to dictionary (success)")  # Disabled - md_to_dict not implemented
         # print(" 15. Parse markdown - file not found")  # Disabled - md_to_dict not implemented
@@ -48,16 +54,33 @@ class TestRunner:
         print(" 16. Update reference graph")
         print(" 17. Get references from a file")
         print(" 18. Find references to a file")
+        print(" 31. Reference impact and path")
+        print(" 32. Reference graph watcher")
+        print(" 37. Reference graph changes")
+        print(" 38. Reference graph analytics")
         print("\n--- Archive Documents ---")
         print(" 24. Archive design log")
         print(" 25. Archive operation")
         print(" 26. Archive artifact")
+        print(" 39. Bulk archive")
+        print(" 40. Archive with reference verification")
+        print(" 42. Policy-driven auto-archive")
+        print(" 43. Packed archive storage")
+        print(" 49. Document registry")
         print("\n--- Unarchive Documents ---")
         print(" 27. Unarchive design log")
         print(" 28. Unarchive without description")
         print(" 29. Unarchive nonexistent document")
         print("\n--- Input Validation ---")
         print(" 19. Invalid path validation")
+        print("\n--- Benchmarks ---")
+        print(" 30. Filename matcher scaling")
+        print(" 33. Reference graph store")
+        print(" 34. Parallel reference scan")
+        print(" 35. Large artifact scanning")
+        print(" 36. Reference extraction modes")
+        print(" 41. Archive link rewriting")
+        print(" 45. Large artifact copy")
         print("\n--- Special Commands ---")
         print("  a. Run all scenarios")
         print("  q. Quit")
@@ -20,6 +20,8 @@ from test_runner.scenarios.design_logs import (
     AddDesignLogSuccessScenario,
     AddDesignLogNotInitializedScenario,
     MultipleDesignLogsNumberingScenario,
+    ConcurrentDesignLogsScenario,
+    BulkAddDocumentsScenario,
 )
 from test_runner.scenarios.operations import AddOperationSuccessScenario
 from test_runner.scenarios.artifacts import (
@@ -28,6 +30,10 @@ from test_runner.scenarios.artifacts import (
     PersistArtifactsWithDeleteScenario,
     PersistArtifactsWithReferenceFixingScenario,
     PersistArtifactsWithBothOptionsScenario,
+    PersistArtifactsBatchScenario,
+    PersistArtifactsDeduplicatedScenario,
+    PersistArtifactsProgressScenario,
+    VerifyArtifactsScenario,
 )
 # from test_runner.scenarios.markdown import (
 #     MdToDictSuccessScenario,
@@ -37,16 +43,34 @@ from test_runner.scenarios.reference_graph import (
     UpdateReferenceGraphScenario,
     GetReferencesFromScenario,
     FindReferencesToScenario,
+    ReferenceImpactScenario,
+    ReferenceWatcherScenario,
+    ReferenceGraphChangesScenario,
+    ReferenceGraphAnalyticsScenario,
 )
 from test_runner.scenarios.archive import (
     ArchiveDesignLogScenario,
     ArchiveOperationScenario,
     ArchiveArtifactScenario,
+    BulkArchiveScenario,
+    ArchiveVerifyReferencesScenario,
+    AutoArchiveScenario,
+    PackedArchiveScenario,
+    DocumentRegistryScenario,
     UnarchiveDesignLogScenario,
     UnarchiveWithoutDescriptionScenario,
     UnarchiveNonexistentDocumentScenario,
 )
 from test_runner.scenarios.validation import InvalidAbsolutePathScenario
+from test_runner.scenarios.benchmarks import (
+    FilenameMatcherBenchmarkScenario,
+    GraphStoreBenchmarkScenario,
+    ParallelScanBenchmarkScenario,
+    LargeArtifactScanBenchmarkScenario,
+    ExtractionModeBenchmarkScenario,
+    ArchiveRewriteBenchmarkScenario,
+    ArtifactCopyBenchmarkScenario,
+)
 
 
 # Scenario registry: maps scenario number to scenario class
@@ -80,6 +104,28 @@ SCENARIO_REGISTRY = {
     '27': UnarchiveDesignLogScenario,
     '28': UnarchiveWithoutDescriptionScenario,
     '29': UnarchiveNonexistentDocumentScenario,
+    '30': FilenameMatcherBenchmarkScenario,
+    '31': ReferenceImpactScenario,
+    '32': ReferenceWatcherScenario,
+    '33': GraphStoreBenchmarkScenario,
+    '34': ParallelScanBenchmarkScenario,
+    '35': LargeArtifactScanBenchmarkScenario,
+    '36': ExtractionModeBenchmarkScenario,
+    '37': ReferenceGraphChangesScenario,
+    '38': ReferenceGraphAnalyticsScenario,
+    '39': BulkArchiveScenario,
+    '40': ArchiveVerifyReferencesScenario,
+    '41': ArchiveRewriteBenchmarkScenario,
+    '42': AutoArchiveScenario,
+    '43': PackedArchiveScenario,
+    '44': PersistArtifactsBatchScenario,
+    '45': ArtifactCopyBenchmarkScenario,
+    '46': PersistArtifactsDeduplicatedScenario,
+    '47': PersistArtifactsProgressScenario,
+    '48': VerifyArtifactsScenario,
+    '49': DocumentRegistryScenario,
+    '50': ConcurrentDesignLogsScenario,
+    '51': BulkAddDocumentsScenario,
 }
 
 
@@ -6,11 +6,17 @@ This module contains scenarios for testing document archiving functionality.
 
 import os
 import sys
+import time
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from tools.archive_doc import archive_document, unarchive_document
+from tools.archive_doc import archive_document, archive_documents, unarchive_document
+from tools.auto_archive import auto_archive_documents
+from tools import archive_doc
+from tools._archive_pack import load_pack_index
+from tools._document_registry import get_registry, lookup_document, next_document_number
+from tools._reference_index import walk_document_files
 from tools.add_design_log import add_design_log
 from tools.add_operation import add_operation
 from tools.persist_artifact import persist_artifacts
@@ -204,6 +210,302 @@ class ArchiveArtifactScenario(BaseScenario):
             print(f.read())
 
 
+class BulkArchiveScenario(BaseScenario):
+    """Scenario: Archive a range of design logs and a list of operations in one call."""
+    
+    def run(self):
+        self.print_header(
+            "Archive-4",
+            "Bulk Archive",
+            "Archive several documents of mixed types at once and verify that all references are updated."
+        )
+        
+        # Create a project
+        archive_project = os.path.join(self.env.temp_dir, "bulk_archive_project")
+        os.makedirs(archive_project)
+        init_assistant_dir(archive_project, False)
+        
+        add_design_log(archive_project, "Authentication", "Auth system design")
+        add_design_log(archive_project, "Database Schema", "DB design")
+        add_design_log(archive_project, "API Design", "API endpoints")
+        add_operation(archive_project, "Implement Auth", "Implementation steps for auth")
+        add_operation(archive_project, "Release", "Release checklist")
+        
+        dl_dir = os.path.join(archive_project, ".assistant", "design_logs")
+        op_dir = os.path.join(archive_project, ".assistant", "operations")
+        
+        # dl_3 stays and references everything that will be archived
+        dl3_path = os.path.join(dl_dir, "dl_3_API_Design.md")
+        with open(dl3_path, 'a') as f:
+            f.write("\n\nBuilds on dl_1_Authentication.md and dl_2_Database_Schema.md.")
+            f.write("\nImplemented by op_1_Implement_Auth.md")
+        
+        # dl_1 references a document archived in the same call
+        dl1_path = os.path.join(dl_dir, "dl_1_Authentication.md")
+        with open(dl1_path, 'a') as f:
+            f.write("\n\nImplementation details are in op_1_Implement_Auth.md")
+        
+        print(f"\nProject directory: {archive_project}")
+        print("\nCalling: archive_documents(abs_path=project_path, selections=[")
+        print("    {'doc_type': 'design_log', 'first': 1, 'last': 2},")
+        print("    {'doc_type': 'operation', 'numbers': [1, 7]}])")
+        print("Note: op_7 does not exist and should be reported and skipped")
+        
+        response = archive_documents(archive_project, [
+            {"doc_type": "design_log", "first": 1, "last": 2},
+            {"doc_type": "operation", "numbers": [1, 7]},
+        ])
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\n--- Verification ---")
+        for dir_path, filename in [
+            (dl_dir, "dl_1_Authentication.md"),
+            (dl_dir, "dl_2_Database_Schema.md"),
+            (op_dir, "op_1_Implement_Auth.md"),
+        ]:
+            print(f"{filename} archived: {os.path.exists(os.path.join(dir_path, 'archived', filename))}")
+        
+        print("\nAfter archiving - dl_3_API_Design.md content:")
+        with open(dl3_path, 'r') as f:
+            print(f.read())
+        
+        print("\nArchived dl_1_Authentication.md content:")
+        with open(os.path.join(dl_dir, "archived", "dl_1_Authentication.md"), 'r') as f:
+            print(f.read())
+        
+        print("\ndesign_logs/_summary.md content (only dl_3 should remain):")
+        with open(os.path.join(dl_dir, "_summary.md"), 'r') as f:
+            print(f.read())
+
+
+class ArchiveVerifyReferencesScenario(BaseScenario):
+    """Scenario: Archive with the reference index checked against a full scan."""
+    
+    def run(self):
+        self.print_header(
+            "Archive-5",
+            "Archive With Reference Verification",
+            "Archive a design log with verify_references=True; a file the reference index skips "
+            "(it looks binary) should be reported and still updated."
+        )
+        
+        # Create a project
+        archive_project = os.path.join(self.env.temp_dir, "archive_verify_project")
+        os.makedirs(archive_project)
+        init_assistant_dir(archive_project, False)
+        
+        add_design_log(archive_project, "Authentication", "Auth system design")
+        add_design_log(archive_project, "Database Schema", "DB design")
+        
+        dl_dir = os.path.join(archive_project, ".assistant", "design_logs")
+        art_dir = os.path.join(archive_project, ".assistant", "artifacts")
+        
+        dl2_path = os.path.join(dl_dir, "dl_2_Database_Schema.md")
+        with open(dl2_path, 'a') as f:
+            f.write("\n\nThis design should align with dl_1_Authentication.md requirements.")
+        
+        # A NUL byte makes the reference scanner treat this file as binary
+        notes_path = os.path.join(art_dir, "art_1_notes.txt")
+        with open(notes_path, 'w') as f:
+            f.write("\0 Notes about dl_1_Authentication.md\n")
+        
+        print(f"\nProject directory: {archive_project}")
+        print("\nCalling: archive_document(abs_path=project_path, doc_type='design_log', number=1, verify_references=True)")
+        
+        response = archive_document(archive_project, "design_log", 1, verify_references=True)
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\nAfter archiving - dl_2_Database_Schema.md content:")
+        with open(dl2_path, 'r') as f:
+            print(f.read())
+        
+        print("\nAfter archiving - art_1_notes.txt content (should reference archived/dl_1_Authentication.md):")
+        with open(notes_path, 'r') as f:
+            print(f.read().replace("\0", "\\0"))
+
+
+class AutoArchiveScenario(BaseScenario):
+    """Scenario: Preview and apply an archive policy."""
+    
+    def run(self):
+        self.print_header(
+            "Archive-6",
+            "Policy-Driven Auto-Archive",
+            "Select completed operations, stale artifacts and old design logs with a dry run, then archive them."
+        )
+        
+        # Create a project
+        archive_project = os.path.join(self.env.temp_dir, "auto_archive_project")
+        os.makedirs(archive_project)
+        init_assistant_dir(archive_project, False)
+        
+        add_design_log(archive_project, "Authentication", "Auth system design")
+        add_design_log(archive_project, "Database Schema", "DB design")
+        add_design_log(archive_project, "API Design", "API endpoints")
+        add_operation(archive_project, "Setup Environment", "Initial setup")
+        add_operation(archive_project, "Deploy Application", "Deployment steps")
+        
+        op_dir = os.path.join(archive_project, ".assistant", "operations")
+        art_dir = os.path.join(archive_project, ".assistant", "artifacts")
+        
+        # op_1 is done, op_2 still has an open item
+        with open(os.path.join(op_dir, "op_1_Setup_Environment.md"), 'w') as f:
+            f.write("# Setup Environment\n\n- [x] Install tools\n- [X] Configure CI\n\nNext: op_2_Deploy_Application.md\n")
+        with open(os.path.join(op_dir, "op_2_Deploy_Application.md"), 'w') as f:
+            f.write("# Deploy Application\n\n- [x] Build image\n- [ ] Roll out\n\nAfter op_1_Setup_Environment.md\n")
+        
+        # art_1 was last modified 60 days ago, art_2 just now
+        for name in ["art_1_old_report.txt", "art_2_new_report.txt"]:
+            with open(os.path.join(art_dir, name), 'w') as f:
+                f.write("report data\n")
+        sixty_days_ago = time.time() - 60 * 86400
+        os.utime(os.path.join(art_dir, "art_1_old_report.txt"), (sixty_days_ago, sixty_days_ago))
+        
+        print(f"\nProject directory: {archive_project}")
+        print("\nCalling: auto_archive_documents(abs_path=project_path, completed_operations=True,")
+        print("                                  artifacts_unused_days=30, design_logs_below=3)  # dry run")
+        
+        response = auto_archive_documents(
+            archive_project, completed_operations=True, artifacts_unused_days=30, design_logs_below=3
+        )
+        
+        self.print_result("Dry Run Response", str(response.model_dump()))
+        print("\nExpected candidates: dl_1, dl_2, op_1, art_1")
+        print(f"op_1 still active after dry run: {os.path.exists(os.path.join(op_dir, 'op_1_Setup_Environment.md'))}")
+        
+        print("\nCalling the same policy with dry_run=False")
+        
+        response = auto_archive_documents(
+            archive_project, completed_operations=True, artifacts_unused_days=30, design_logs_below=3, dry_run=False
+        )
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\n--- Verification ---")
+        for dir_name in ["design_logs", "operations", "artifacts"]:
+            directory = os.path.join(archive_project, ".assistant", dir_name)
+            active = sorted(name for name in os.listdir(directory) if os.path.isfile(os.path.join(directory, name)))
+            print(f"{dir_name} active: {active}")
+        
+        print("\nAfter archiving - op_2_Deploy_Application.md content:")
+        with open(os.path.join(op_dir, "op_2_Deploy_Application.md"), 'r') as f:
+            print(f.read())
+
+
+class PackedArchiveScenario(BaseScenario):
+    """Scenario: Archive into and unarchive from the packed archive storage."""
+    
+    def run(self):
+        self.print_header(
+            "Archive-7",
+            "Packed Archive Storage",
+            "With ARCHIVE_STORAGE = 'packed', archived documents go into archived/_archive.zip and are "
+            "extracted through its index; the reference scanner does not see them."
+        )
+        
+        # Create a project
+        archive_project = os.path.join(self.env.temp_dir, "packed_archive_project")
+        os.makedirs(archive_project)
+        init_assistant_dir(archive_project, False)
+        
+        add_design_log(archive_project, "Authentication", "Auth system design")
+        add_design_log(archive_project, "Database Schema", "DB design")
+        add_design_log(archive_project, "API Design", "API endpoints")
+        
+        assistant_dir = os.path.join(archive_project, ".assistant")
+        dl_dir = os.path.join(assistant_dir, "design_logs")
+        archive_dir = os.path.join(dl_dir, "archived")
+        
+        dl3_path = os.path.join(dl_dir, "dl_3_API_Design.md")
+        with open(dl3_path, 'a') as f:
+            f.write("\n\nBuilds on dl_1_Authentication.md and dl_2_Database_Schema.md.")
+        
+        storage = archive_doc.ARCHIVE_STORAGE
+        archive_doc.ARCHIVE_STORAGE = "packed"
+        try:
+            print(f"\nProject directory: {archive_project}")
+            print("\nCalling: archive_documents(abs_path=project_path, selections=[{'doc_type': 'design_log', 'numbers': [1, 2]}])")
+            
+            response = archive_documents(archive_project, [{"doc_type": "design_log", "numbers": [1, 2]}])
+            
+            self.print_result("Response Object", str(response.model_dump()))
+            
+            print("\n--- Verification ---")
+            print(f"archived/ contents: {sorted(os.listdir(archive_dir))}")
+            print(f"Pack index: {load_pack_index(archive_dir)['documents']}")
+            print(f"Documents seen by the reference scanner: {[rel_path for rel_path, _, _ in walk_document_files(assistant_dir)]}")
+            
+            print("\nCalling: unarchive_document(abs_path=project_path, doc_type='design_log', number=1, short_desc='Auth system design')")
+            
+            response = unarchive_document(archive_project, "design_log", 1, "Auth system design")
+            
+            self.print_result("Response Object", str(response.model_dump()))
+            
+            print(f"\narchived/ contents: {sorted(os.listdir(archive_dir))}")
+            print(f"Pack index: {load_pack_index(archive_dir)['documents']}")
+            
+            print("\nAfter unarchiving - dl_3_API_Design.md content:")
+            with open(dl3_path, 'r') as f:
+                print(f.read())
+        finally:
+            archive_doc.ARCHIVE_STORAGE = storage
+
+
+class DocumentRegistryScenario(BaseScenario):
+    """Scenario: Number and find documents through the document registry."""
+    
+    def run(self):
+        self.print_header(
+            "Archive-8",
+            "Document Registry",
+            "Documents are numbered and found through .assistant/document_registry.json; numbers are not "
+            "reused after archiving, and documents added by hand are picked up by a rebuild."
+        )
+        
+        # Create a project
+        registry_project = os.path.join(self.env.temp_dir, "registry_project")
+        os.makedirs(registry_project)
+        init_assistant_dir(registry_project, False)
+        
+        add_design_log(registry_project, "Authentication", "Auth system design")
+        add_design_log(registry_project, "Database Schema", "DB design")
+        
+        assistant_dir = os.path.join(registry_project, ".assistant")
+        dl_dir = os.path.join(assistant_dir, "design_logs")
+        
+        print(f"\nProject directory: {registry_project}")
+        print("\nCalling: archive_document(abs_path=project_path, doc_type='design_log', number=2)")
+        
+        response = archive_document(registry_project, "design_log", 2)
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\nCalling: add_design_log(abs_path=project_path, title='API Design', short_desc='API endpoints')")
+        
+        response = add_design_log(registry_project, "API Design", "API endpoints")
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\n--- Verification ---")
+        print(f"design_logs/ contents: {sorted(os.listdir(dl_dir))}")
+        print(f"Registered dl_2: {lookup_document(assistant_dir, 'dl', 2)}")
+        
+        # A document added outside Glyph's tools changes the directory's mtime
+        with open(os.path.join(dl_dir, "dl_7_Hand_Written.md"), 'w') as f:
+            f.write("# Hand written\n")
+        
+        print("\nAdded dl_7_Hand_Written.md by hand")
+        print(f"Registered dl_7: {lookup_document(assistant_dir, 'dl', 7)}")
+        print(f"Next design log number: {next_document_number(assistant_dir, 'dl')}")
+        
+        print("\nRegistered design logs:")
+        for number, entry in sorted(get_registry(assistant_dir)["types"]["dl"]["documents"].items(), key=lambda item: int(item[0])):
+            state = "archived" if entry["archived"] else "active"
+            print(f"  {number}: {entry['filename']} ({state}) - {entry['description']}")
+
+
 class UnarchiveDesignLogScenario(BaseScenario):
     """Scenario: Unarchive a design log and verify that all references are restored."""
     
@@ -283,3 +283,303 @@ class PersistArtifactsWithBothOptionsScenario(BaseScenario):
         # Cleanup
         import shutil
         shutil.rmtree(project_dir)
+
+
+class PersistArtifactsBatchScenario(BaseScenario):
+    """Scenario 44: Persist several artifacts in one batch, with reference fixing."""
+    
+    def run(self):
+        self.print_header(
+            44,
+            "Persist Artifacts - Batch",
+            "Persisting several artifacts at once: consecutive numbers, one summary write and one reference fixing pass."
+        )
+        
+        # Create a fresh project directory for this test
+        import tempfile
+        project_dir = tempfile.mkdtemp(prefix="glyph_batch_test_")
+        print(f"\nProject directory: {project_dir}")
+        
+        # Initialize assistant directory
+        from tools.init_assistant_dir import init_assistant_dir
+        init_response = init_assistant_dir(project_dir, overwrite=False)
+        print(f"Assistant directory initialized: {init_response.success}")
+        
+        # Create test files in ad_hoc, the second referencing the first
+        ad_hoc_dir = os.path.join(project_dir, ".assistant", "ad_hoc")
+        names = ['notes.txt', 'more_notes.txt', 'plot.py']
+        for name in names:
+            with open(os.path.join(ad_hoc_dir, name), 'w') as f:
+                f.write(f"Content of {name}.\n")
+        with open(os.path.join(ad_hoc_dir, 'plot.py'), 'a') as f:
+            f.write("# Reads notes.txt and more_notes.txt\n")
+        
+        # Create a design log that references all of them
+        dl_file = os.path.join(project_dir, ".assistant", "design_logs", "dl_1_batch.md")
+        with open(dl_file, 'w') as f:
+            f.write("# Batch\n\nSee notes.txt, more_notes.txt and plot.py.\n")
+        
+        print(f"\nCalling: persist_artifacts(abs_path=project_path, files={names}, ..., delete_from_ad_hoc=True, fix_references=True)")
+        
+        response = persist_artifacts(
+            project_dir,
+            names,
+            descriptions=[{'filename': name, 'description': f"Batch file {name}"} for name in names],
+            delete_from_ad_hoc=True,
+            fix_references=True
+        )
+        
+        artifacts_dir = os.path.join(project_dir, ".assistant", "artifacts")
+        persisted = sorted(f for f in os.listdir(artifacts_dir) if f.startswith("art_"))
+        print(f"\nArtifacts: {persisted}")
+        
+        with open(dl_file, 'r') as f:
+            print("\nDesign log content AFTER:")
+            print(f.read())
+        
+        plot_artifact = next(f for f in persisted if f.endswith("plot.py"))
+        with open(os.path.join(artifacts_dir, plot_artifact), 'r') as f:
+            print(f"{plot_artifact} content AFTER:")
+            print(f.read())
+        
+        with open(os.path.join(artifacts_dir, "_summary.md"), 'r') as f:
+            print("Artifacts summary:")
+            print(f.read())
+        
+        print(f"ad_hoc after: {os.listdir(ad_hoc_dir)}")
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        # Cleanup
+        import shutil
+        shutil.rmtree(project_dir)
+
+
+class PersistArtifactsDeduplicatedScenario(BaseScenario):
+    """Scenario 46: Persist artifacts into the content-addressed store and collect garbage."""
+    
+    def run(self):
+        self.print_header(
+            46,
+            "Persist Artifacts - Content-Addressed Store",
+            "With ARTIFACT_STORAGE = 'objects', identical content is stored once and artifacts are hardlinks to it."
+        )
+        
+        import shutil
+        import tempfile
+        from tools import persist_artifact
+        from tools.persist_artifact import collect_artifact_garbage
+        from tools._utils import write_document
+        from tools.init_assistant_dir import init_assistant_dir
+        
+        project_dir = tempfile.mkdtemp(prefix="glyph_objects_test_")
+        print(f"\nProject directory: {project_dir}")
+        init_assistant_dir(project_dir, overwrite=False)
+        
+        assistant_dir = os.path.join(project_dir, ".assistant")
+        ad_hoc_dir = os.path.join(assistant_dir, "ad_hoc")
+        artifacts_dir = os.path.join(assistant_dir, "artifacts")
+        objects_dir = os.path.join(assistant_dir, "objects")
+        
+        def write(name, content):
+            with open(os.path.join(ad_hoc_dir, name), 'w') as f:
+                f.write(content)
+        
+        def count_objects():
+            return sum(len(files) for root, dirs, files in os.walk(objects_dir) if os.path.basename(root) != "tmp")
+        
+        def persist(names):
+            return persist_artifact.persist_artifacts(
+                project_dir,
+                names,
+                descriptions=[{'filename': name, 'description': f"Copy of {name}"} for name in names],
+                delete_from_ad_hoc=False,
+                fix_references=False
+            )
+        
+        storage = persist_artifact.ARTIFACT_STORAGE
+        persist_artifact.ARTIFACT_STORAGE = "objects"
+        try:
+            write("build.log", "compile ok\n" * 1000)
+            write("build_again.log", "compile ok\n" * 1000)
+            write("profile.txt", "hot path: parse()\n")
+            
+            print("\nCalling: persist_artifacts(files=['build.log', 'build_again.log', 'profile.txt'], ...)")
+            response = persist(['build.log', 'build_again.log', 'profile.txt'])
+            self.print_result("Response Object", str(response.model_dump()))
+            
+            print(f"\nObjects stored: {count_objects()}")
+            for name in sorted(os.listdir(artifacts_dir)):
+                if name.startswith("art_"):
+                    print(f"  - {name}: {os.stat(os.path.join(artifacts_dir, name)).st_nlink} link(s)")
+            
+            print("\nPersisting build.log again:")
+            response = persist(['build.log'])
+            print([line for line in response.context if line.startswith(("Persisted", "Deduplicated"))])
+            print(f"Objects stored: {count_objects()}")
+            
+            # Tools rewriting a linked artifact detach it instead of changing the shared content
+            art_1 = os.path.join(artifacts_dir, "art_1_build.log")
+            write_document(art_1, "compile OK\n")
+            with open(os.path.join(artifacts_dir, "art_4_build.log")) as f:
+                print(f"\nAfter rewriting art_1_build.log: art_1 links={os.stat(art_1).st_nlink}, "
+                      f"art_4 unchanged={f.read(10) == 'compile ok'}")
+            
+            os.chmod(os.path.join(artifacts_dir, "art_3_profile.txt"), 0o644)
+            os.remove(os.path.join(artifacts_dir, "art_3_profile.txt"))
+            print("\nDeleted art_3_profile.txt")
+            
+            print("\nCalling: collect_artifact_garbage(abs_path=project_path, dry_run=True)")
+            response = collect_artifact_garbage(project_dir, dry_run=True)
+            self.print_result("Response Object", str(response.model_dump()))
+            
+            print("\nCalling: collect_artifact_garbage(abs_path=project_path)")
+            response = collect_artifact_garbage(project_dir)
+            self.print_result("Response Object", str(response.model_dump()))
+            print(f"Objects stored: {count_objects()}")
+        finally:
+            persist_artifact.ARTIFACT_STORAGE = storage
+            for root, dirs, files in os.walk(project_dir):
+                for name in files:
+                    os.chmod(os.path.join(root, name), 0o644)
+            shutil.rmtree(project_dir)
+
+
+class PersistArtifactsProgressScenario(BaseScenario):
+    """Scenario 47: Persist a large batch on the worker pool, with progress reports and a cancellation."""
+    
+    def run(self):
+        self.print_header(
+            47,
+            "Persist Artifacts - Progress and Cancellation",
+            "Copies run on a worker pool and report progress; a cancellation leaves only complete artifacts."
+        )
+        
+        import re
+        import shutil
+        import tempfile
+        from tools.init_assistant_dir import init_assistant_dir
+        
+        project_dir = tempfile.mkdtemp(prefix="glyph_progress_test_")
+        print(f"\nProject directory: {project_dir}")
+        init_assistant_dir(project_dir, overwrite=False)
+        
+        ad_hoc_dir = os.path.join(project_dir, ".assistant", "ad_hoc")
+        artifacts_dir = os.path.join(project_dir, ".assistant", "artifacts")
+        names = [f"run_{i:02d}.csv" for i in range(24)]
+        block = os.urandom(1024 * 1024)
+        for name in names:
+            with open(os.path.join(ad_hoc_dir, name), 'wb') as f:
+                for _ in range(4):
+                    f.write(block)
+        descriptions = [{'filename': name, 'description': f"Benchmark output {name}"} for name in names]
+        
+        reports = []
+        
+        def progress(completed, total, message):
+            reports.append((completed, total, message))
+        
+        print(f"\nCalling: persist_artifacts(files=<{len(names) // 2} files>, ..., delete_from_ad_hoc=True, progress=...)")
+        response = persist_artifacts(
+            project_dir,
+            names[:len(names) // 2],
+            descriptions=descriptions,
+            delete_from_ad_hoc=True,
+            fix_references=False,
+            progress=progress
+        )
+        print(f"Success: {response.success}")
+        print(f"Progress reports: {len(reports)}, last: {reports[-1]}")
+        print(f"Reported counts increase by one: {[completed for completed, _, _ in reports] == list(range(1, len(reports) + 1))}")
+        
+        print(f"\nCalling: persist_artifacts(files=<{len(names) // 2} files>, ..., is_cancelled=<cancelled after the first copy>)")
+        reports.clear()
+        response = persist_artifacts(
+            project_dir,
+            names[len(names) // 2:],
+            descriptions=descriptions,
+            delete_from_ad_hoc=True,
+            fix_references=False,
+            progress=progress,
+            is_cancelled=lambda: bool(reports)
+        )
+        print(f"Success: {response.success}")
+        print(f"Context: {[line for line in response.context if line.startswith('Cancelled')]}")
+        
+        artifacts = [f for f in os.listdir(artifacts_dir) if f.startswith("art_")]
+        with open(os.path.join(artifacts_dir, "_summary.md"), 'r') as f:
+            summarized = re.findall(r'^- `(art_[^`]+)`', f.read(), re.MULTILINE)
+        left = os.listdir(ad_hoc_dir)
+        
+        print(f"\nArtifacts: {len(artifacts)}, left in ad_hoc: {len(left)}, total: {len(artifacts) + len(left)} of {len(names)}")
+        print(f"Every artifact is complete: {all(os.path.getsize(os.path.join(artifacts_dir, f)) == 4 * 1024 * 1024 for f in artifacts)}")
+        print(f"Every artifact has a summary entry: {sorted(summarized) == sorted(artifacts)}")
+        
+        # Cleanup
+        shutil.rmtree(project_dir)
+
+
+class VerifyArtifactsScenario(BaseScenario):
+    """Scenario 48: Verify artifacts against the manifest recorded when they were persisted."""
+    
+    def run(self):
+        self.print_header(
+            48,
+            "Verify Artifacts",
+            "Only artifacts whose size or mtime changed are re-hashed; changes made by Glyph tools are recorded."
+        )
+        
+        import shutil
+        import tempfile
+        from tools.persist_artifact import verify_artifacts
+        from tools.archive_doc import archive_document
+        from tools.init_assistant_dir import init_assistant_dir
+        
+        project_dir = tempfile.mkdtemp(prefix="glyph_verify_test_")
+        print(f"\nProject directory: {project_dir}")
+        init_assistant_dir(project_dir, overwrite=False)
+        
+        ad_hoc_dir = os.path.join(project_dir, ".assistant", "ad_hoc")
+        artifacts_dir = os.path.join(project_dir, ".assistant", "artifacts")
+        names = [f"profile_{i:03d}.bin" for i in range(200)]
+        for name in names:
+            with open(os.path.join(ad_hoc_dir, name), 'wb') as f:
+                f.write(os.urandom(256 * 1024))
+        with open(os.path.join(ad_hoc_dir, "notes.md"), 'w') as f:
+            f.write("Compare with profile_000.bin.\n")
+        
+        persist_artifacts(
+            project_dir,
+            names + ["notes.md"],
+            descriptions=[{'filename': name, 'description': name} for name in names + ["notes.md"]],
+            delete_from_ad_hoc=True,
+            fix_references=True
+        )
+        
+        def verify(label, **kwargs):
+            response = verify_artifacts(project_dir, **kwargs)
+            result = response.result
+            print(f"\n{label}:")
+            print(f"  success={response.success}, rehashed={result['rehashed']}, seconds={result['seconds']:.3f}, "
+                  f"modified={result['modified']}, missing={result['missing']}, untracked={len(result['untracked'])}")
+        
+        verify("Verify after persisting")
+        verify("Full verification", full=True)
+        
+        art_1 = os.path.join(artifacts_dir, "art_1_profile_000.bin")
+        os.utime(art_1)
+        verify("After touching art_1 (content unchanged)")
+        
+        with open(os.path.join(artifacts_dir, "art_2_profile_001.bin"), 'r+b') as f:
+            f.write(b"corrupted")
+        os.remove(os.path.join(artifacts_dir, "art_3_profile_002.bin"))
+        verify("After corrupting art_2 and deleting art_3")
+        
+        archive_document(project_dir, "artifact", 201)
+        verify("After archiving art_201_notes.md (its references are rewritten by the tool)")
+        
+        verify("Accepting the changes", accept_changes=True)
+        verify("Verify again")
+        
+        # Cleanup
+        shutil.rmtree(project_dir)
@@ -6,11 +6,13 @@ This module contains scenarios for testing design log functionality.
 
 import os
 import sys
+import threading
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from tools.add_design_log import add_design_log
+from tools.add_documents import add_documents
 from tools.init_assistant_dir import init_assistant_dir
 from test_runner.scenarios.base import BaseScenario
 from test_runner.utils import print_observation
@@ -116,3 +118,88 @@ class MultipleDesignLogsNumberingScenario(BaseScenario):
                 print(f"  - {file}")
         
         print_observation("Files are automatically numbered sequentially (dl_1, dl_2, dl_3)")
+
+
+class ConcurrentDesignLogsScenario(BaseScenario):
+    """Scenario 50: Concurrent sessions creating design logs in one project."""
+    
+    def run(self):
+        self.print_header(
+            50,
+            "Concurrent Design Logs - Atomic Numbering",
+            "Eight sessions add design logs to the same project at once; the project lock and "
+            "number reservation give every log its own number and summary entry."
+        )
+        
+        concurrent_project = os.path.join(self.env.temp_dir, "concurrent_project")
+        os.makedirs(concurrent_project)
+        init_assistant_dir(concurrent_project, False)
+        
+        print(f"\nProject directory: {concurrent_project}")
+        
+        sessions, logs_per_session = 8, 5
+        failures = []
+        
+        def session(index: int) -> None:
+            for number in range(logs_per_session):
+                response = add_design_log(concurrent_project, f"Session {index} Log {number}", f"Written by session {index}")
+                if not response.success:
+                    failures.append(response.context)
+        
+        print(f"\nStarting {sessions} sessions adding {logs_per_session} design logs each...")
+        threads = [threading.Thread(target=session, args=(index,)) for index in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        dl_dir = os.path.join(concurrent_project, ".assistant", "design_logs")
+        numbers = [int(file.split('_')[1]) for file in os.listdir(dl_dir) if file.startswith('dl_')]
+        with open(os.path.join(dl_dir, "_summary.md"), 'r') as f:
+            summary_entries = sum(1 for line in f if line.startswith("- `dl_"))
+        
+        print(f"\nFailed calls: {len(failures)}")
+        print(f"Design logs created: {len(numbers)} (expected {sessions * logs_per_session})")
+        print(f"Distinct numbers: {len(set(numbers))}, range {min(numbers)}-{max(numbers)}")
+        print(f"Summary entries: {summary_entries}")
+        
+        print_observation("Each design log got a distinct number and its own summary entry")
+
+
+class BulkAddDocumentsScenario(BaseScenario):
+    """Scenario 51: Create design logs and operations in one call."""
+    
+    def run(self):
+        self.print_header(
+            51,
+            "Bulk Document Creation",
+            "Scaffolding a plan with add_documents: numbers follow the list order and each summary gets one append."
+        )
+        
+        bulk_project = os.path.join(self.env.temp_dir, "bulk_documents_project")
+        os.makedirs(bulk_project)
+        init_assistant_dir(bulk_project, False)
+        add_design_log(bulk_project, "Initial Architecture", "System architecture overview")
+        
+        documents = [
+            {"doc_type": "design_log", "title": "Migration Plan", "short_desc": "Plan for the storage migration"},
+            {"doc_type": "operation", "title": "Migrate Schema", "short_desc": "Phase 1: schema changes"},
+            {"doc_type": "operation", "title": "Backfill Data", "short_desc": "Phase 2: data backfill"},
+            {"doc_type": "operation", "title": "Switch Reads", "short_desc": "Phase 3: read path cutover"},
+        ]
+        
+        print(f"\nProject directory: {bulk_project}")
+        print(f"\nCalling: add_documents(abs_path=project_path, documents=[{len(documents)} entries])")
+        
+        response = add_documents(bulk_project, documents)
+        
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        for dir_name in ("design_logs", "operations"):
+            print(f"\n{dir_name}/_summary.md entries:")
+            with open(os.path.join(bulk_project, ".assistant", dir_name, "_summary.md"), 'r') as f:
+                for line in f:
+                    if line.startswith("- `"):
+                        print(f"  {line.rstrip()}")
+        
+        print_observation("dl_2 continues after the existing dl_1; operations are numbered op_1-op_3 in list order")
@@ -6,11 +6,20 @@ This module contains scenarios for testing reference graph functionality.
 
 import os
 import sys
+import time
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
-from tools.reference_graph import update_reference_graph, get_references_from, find_references_to
+from tools.reference_graph import (
+    update_reference_graph,
+    get_references_from,
+    find_references_to,
+    start_reference_watcher,
+    stop_reference_watcher,
+    get_reference_watcher_status,
+)
+from tools.reference_analysis import get_reference_impact, find_reference_path, analyze_reference_graph
 from tools.add_design_log import add_design_log
 from tools.add_operation import add_operation
 from tools.init_assistant_dir import init_assistant_dir
@@ -126,4 +135,185 @@ class FindReferencesToScenario(BaseScenario):
         
         response = find_references_to(ref_project, "dl_1_Core_Design.md")
         
-        self.print_result("Response Object", str(response.model_dump()))
\ No newline at end of file
+        self.print_result("Response Object", str(response.model_dump()))
+
+
+class ReferenceImpactScenario(BaseScenario):
+    """Scenario 31: Transitive impact analysis and shortest reference path."""
+    
+    def run(self):
+        self.print_header(
+            31,
+            "Reference Impact and Path",
+            "Finding everything affected by a design log, and the reference chain between two documents."
+        )
+        
+        ref_project = os.path.join(self.env.temp_dir, "ref_project_impact")
+        os.makedirs(ref_project)
+        init_assistant_dir(ref_project, False)
+        
+        add_design_log(ref_project, "Core Design", "Core design")
+        add_design_log(ref_project, "Feature A", "Feature A design")
+        add_operation(ref_project, "Build Feature A", "Feature A implementation")
+        add_operation(ref_project, "Release", "Release checklist")
+        
+        # Chain: op_2 -> op_1 -> dl_2 -> dl_1
+        dl_dir = os.path.join(ref_project, ".assistant", "design_logs")
+        op_dir = os.path.join(ref_project, ".assistant", "operations")
+        
+        with open(os.path.join(dl_dir, "dl_2_Feature_A.md"), 'a') as f:
+            f.write("\n\nBuilds upon dl_1_Core_Design.md")
+        with open(os.path.join(op_dir, "op_1_Build_Feature_A.md"), 'a') as f:
+            f.write("\n\nImplements dl_2_Feature_A.md")
+        with open(os.path.join(op_dir, "op_2_Release.md"), 'a') as f:
+            f.write("\n\nShips the work from op_1_Build_Feature_A.md")
+        
+        print(f"\nProject directory: {ref_project}")
+        print("Calling: get_reference_impact(abs_path=project_path, file_name='dl_1_Core_Design.md', direction='downstream')")
+        
+        response = get_reference_impact(ref_project, "dl_1_Core_Design.md", "downstream")
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\nCalling: get_reference_impact(abs_path=project_path, file_name='dl_1_Core_Design.md', direction='downstream', max_depth=1)")
+        
+        response = get_reference_impact(ref_project, "dl_1_Core_Design.md", "downstream", max_depth=1)
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\nCalling: find_reference_path(abs_path=project_path, source_file='op_2_Release.md', target_file='dl_1_Core_Design.md')")
+        
+        response = find_reference_path(ref_project, "op_2_Release.md", "dl_1_Core_Design.md")
+        self.print_result("Response Object", str(response.model_dump()))
+
+
+class ReferenceWatcherScenario(BaseScenario):
+    """Scenario 32: Background watcher keeps the reference graph fresh after edits."""
+    
+    def run(self):
+        self.print_header(
+            32,
+            "Reference Graph Watcher",
+            "Starting a watcher, editing a document, and querying the refreshed graph without an explicit update."
+        )
+        
+        ref_project = os.path.join(self.env.temp_dir, "ref_project_watcher")
+        os.makedirs(ref_project)
+        init_assistant_dir(ref_project, False)
+        
+        add_design_log(ref_project, "Core Design", "Core design")
+        add_operation(ref_project, "Build Core", "Core implementation")
+        
+        print(f"\nProject directory: {ref_project}")
+        print("Calling: start_reference_watcher(abs_path=project_path)")
+        
+        response = start_reference_watcher(ref_project)
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        try:
+            op_path = os.path.join(ref_project, ".assistant", "operations", "op_1_Build_Core.md")
+            print("\nAppending a reference to dl_1_Core_Design.md in op_1_Build_Core.md and waiting for the watcher...")
+            with open(op_path, 'a') as f:
+                f.write("\n\nImplements dl_1_Core_Design.md")
+            
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                status = get_reference_watcher_status(ref_project).result
+                if status and status["refreshes"] > 1 and status["pending_events"] == 0:
+                    break
+                time.sleep(0.1)
+            
+            print("\nCalling: find_references_to(abs_path=project_path, file_name='dl_1_Core_Design.md')")
+            response = find_references_to(ref_project, "dl_1_Core_Design.md")
+            self.print_result("Response Object", str(response.model_dump()))
+            
+            print("\nCalling: get_reference_watcher_status(abs_path=project_path)")
+            response = get_reference_watcher_status(ref_project)
+            self.print_result("Response Object", str(response.model_dump()))
+        finally:
+            print("\nCalling: stop_reference_watcher(abs_path=project_path)")
+            response = stop_reference_watcher(ref_project)
+            self.print_result("Response Object", str(response.model_dump()))
+
+
+class ReferenceGraphChangesScenario(BaseScenario):
+    """Scenario 37: Repeated updates report edge changes and skip unchanged outputs."""
+    
+    def run(self):
+        self.print_header(
+            37,
+            "Reference Graph Changes",
+            "Updating the graph after adding, then removing a reference, and once more with nothing changed."
+        )
+        
+        ref_project = os.path.join(self.env.temp_dir, "ref_project_changes")
+        os.makedirs(ref_project)
+        init_assistant_dir(ref_project, False)
+        
+        add_design_log(ref_project, "Authentication", "Auth system design")
+        add_design_log(ref_project, "Sessions", "Session handling")
+        update_reference_graph(ref_project)
+        
+        dl_path = os.path.join(ref_project, ".assistant", "design_logs", "dl_2_Sessions.md")
+        with open(dl_path, 'a') as f:
+            f.write("\n\nSessions are issued by dl_1_Authentication.md")
+        
+        print(f"\nProject directory: {ref_project}")
+        print("Added a reference from dl_2_Sessions.md to dl_1_Authentication.md")
+        print("Calling: update_reference_graph(abs_path=project_path)")
+        
+        response = update_reference_graph(ref_project)
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        with open(dl_path, 'r') as f:
+            content = f.read()
+        with open(dl_path, 'w') as f:
+            f.write(content.replace("dl_1_Authentication.md", "the authentication design"))
+        
+        print("\nRemoved the reference again")
+        print("Calling: update_reference_graph(abs_path=project_path)")
+        
+        response = update_reference_graph(ref_project)
+        self.print_result("Response Object", str(response.model_dump()))
+        
+        print("\nCalling: update_reference_graph(abs_path=project_path) with nothing changed")
+        
+        response = update_reference_graph(ref_project)
+        self.print_result("Response Object", str(response.model_dump()))
+
+
+class ReferenceGraphAnalyticsScenario(BaseScenario):
+    """Scenario 38: Graph health report - hubs, orphans, cycles and components."""
+    
+    def run(self):
+        self.print_header(
+            38,
+            "Reference Graph Analytics",
+            "Finding hubs, unreferenced design logs and reference cycles in a small project."
+        )
+        
+        ref_project = os.path.join(self.env.temp_dir, "ref_project_analytics")
+        os.makedirs(ref_project)
+        init_assistant_dir(ref_project, False)
+        
+        add_design_log(ref_project, "Core", "Core design")
+        add_design_log(ref_project, "Caching", "Caching design")
+        add_design_log(ref_project, "Abandoned Idea", "Never referenced")
+        add_operation(ref_project, "Build Core", "Core implementation")
+        add_operation(ref_project, "Build Cache", "Cache implementation")
+        
+        dl_dir = os.path.join(ref_project, ".assistant", "design_logs")
+        op_dir = os.path.join(ref_project, ".assistant", "operations")
+        
+        # dl_1 is the hub; dl_2 and op_2 reference each other (a cycle)
+        with open(os.path.join(dl_dir, "dl_2_Caching.md"), 'a') as f:
+            f.write("\n\nExtends dl_1_Core.md, implemented by op_2_Build_Cache.md")
+        with open(os.path.join(op_dir, "op_1_Build_Core.md"), 'a') as f:
+            f.write("\n\nImplements dl_1_Core.md")
+        with open(os.path.join(op_dir, "op_2_Build_Cache.md"), 'a') as f:
+            f.write("\n\nImplements dl_2_Caching.md on top of dl_1_Core.md")
+        
+        print(f"\nProject directory: {ref_project}")
+        
+        for section, directory in [("in_degree", None), ("orphans", "design_logs"), ("cycles", None)]:
+            print(f"\nCalling: analyze_reference_graph(abs_path=project_path, section='{section}', directory={directory!r}, limit=3)")
+            response = analyze_reference_graph(ref_project, section, directory, limit=3)
+            self.print_result("Response Object", str(response.model_dump()))